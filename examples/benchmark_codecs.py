@@ -0,0 +1,81 @@
+# BENCHMARK OF THE JSON CODECS AVAILABLE TO HTTPManager
+# IT DECODES (FROM BYTES) AND RE-ENCODES EVERY RECORDED PAYLOAD IN A FOLDER.
+#
+# Record a few production-shaped public payloads first (needs network):
+#     python benchmark_codecs.py --record payloads/
+# Then compare the codecs offline:
+#     python benchmark_codecs.py payloads/
+
+
+
+import argparse
+import os
+import time
+
+from pybit_ms._codec import available_codecs, get_codec
+from pybit_ms._http_manager import HTTPManager
+
+
+# Large public responses where parsing cost is noticeable
+RECORD_REQUESTS = {
+    "orderbook_linear_500.json": ("/v5/market/orderbook", {"category": "linear", "symbol": "BTCUSDT", "limit": 500}),
+    "instruments_linear.json": ("/v5/market/instruments-info", {"category": "linear", "limit": 1000}),
+    "instruments_spot.json": ("/v5/market/instruments-info", {"category": "spot"}),
+    "kline_1000.json": ("/v5/market/kline", {"category": "linear", "symbol": "BTCUSDT", "interval": "1", "limit": 1000}),
+    "tickers_linear.json": ("/v5/market/tickers", {"category": "linear"}),
+}
+
+
+def record(folder):
+    os.makedirs(folder, exist_ok=True)
+    manager = HTTPManager(json_codec="json")
+    for filename, (path, query) in RECORD_REQUESTS.items():
+        response = manager.client.get(f"{manager.endpoint}{path}", params=query, timeout=manager.timeout)
+        with open(os.path.join(folder, filename), "wb") as f:
+            f.write(response.content)
+        print(f"Recorded {filename} ({len(response.content):,} bytes)")
+
+
+def bench(folder, repeat):
+    payloads = {}
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(".json"):
+            with open(os.path.join(folder, filename), "rb") as f:
+                payloads[filename] = f.read()
+
+    if not payloads:
+        print(f"No .json payloads found in {folder}")
+        return
+
+    codecs = [get_codec(name) for name in available_codecs()]
+    print(f"{'payload':<30}{'bytes':>12}" + "".join(f"{c.name + ' dec/enc (ms)':>26}" for c in codecs))
+
+    for filename, raw in payloads.items():
+        row = f"{filename:<30}{len(raw):>12,}"
+        for codec in codecs:
+            obj = codec.loads(raw)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                codec.loads(raw)
+            decode_ms = (time.perf_counter() - start) / repeat * 1e3
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                codec.dumps(obj)
+            encode_ms = (time.perf_counter() - start) / repeat * 1e3
+
+            row += f"{decode_ms:>16.3f} / {encode_ms:<7.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare JSON codecs on recorded Bybit payloads.")
+    parser.add_argument("folder", help="Folder containing recorded .json response bodies.")
+    parser.add_argument("--record", action="store_true", help="Fetch fresh public payloads into the folder first.")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per payload and codec.")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.folder)
+    bench(args.folder, args.repeat)
@@ -1,3 +1,5 @@
 from pybit_ms.bybit_client import BybitAPI      # This allows users to import BybitAPI directly from pybit_ms
+from pybit_ms.client_pool import BybitClientPool
+from pybit_ms._metrics import MetricsRegistry, MetricsSink
 
 __version__ = "0.1.8"
\ No newline at end of file
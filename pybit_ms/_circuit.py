@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Bybit retCodes that mean the exchange itself is failing (server timeout / internal error).
+SERVER_ERROR_CODES = frozenset({10000, 10016})
+
+
+def endpoint_group(path: str) -> str:
+    """Group endpoints by their first path segment after /v5, e.g. "order", "market", "account"."""
+    parts = urlsplit(path).path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 else parts[0]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint group.
+
+    Closed: requests flow; the outcome of each attempt is kept in a window of the
+    last `window_size` attempts. The circuit opens when `consecutive_failures`
+    attempts fail in a row, or when at least `min_requests` attempts are in the
+    window and the share of failures reaches `failure_ratio`. Attempts slower
+    than `slow_call_seconds` (if set) count as failures.
+
+    Open: every request fails immediately until `reset_timeout` seconds have passed.
+
+    Half-open: up to `half_open_probes` requests are let through; a success
+    closes the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        consecutive_failures: int = 5,
+        failure_ratio: float = 0.5,
+        min_requests: int = 10,
+        window_size: int = 50,
+        slow_call_seconds: float = None,
+        reset_timeout: float = 15.0,
+        half_open_probes: int = 1,
+    ):
+        self.name = name
+        self.consecutive_failures = consecutive_failures
+        self.failure_ratio = failure_ratio
+        self.min_requests = min_requests
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.opened_at = None
+        self._window = deque(maxlen=window_size)   # True = failure
+        self._streak = 0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now (reserving a probe slot when half-open)."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    return False
+                self._probes += 1
+            return True
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 if not open)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record(self, success: bool, latency: float = None):
+        """Record the outcome of one attempt that `allow` let through."""
+        failed = not success or (
+            self.slow_call_seconds is not None and latency is not None and latency > self.slow_call_seconds
+        )
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                    self._window.clear()
+                    self._streak = 0
+                return
+            if self.state == OPEN:
+                return
+
+            self._window.append(failed)
+            self._streak = self._streak + 1 if failed else 0
+            failures = sum(self._window)
+            if self._streak >= self.consecutive_failures or (
+                len(self._window) >= self.min_requests and failures / len(self._window) >= self.failure_ratio
+            ):
+                self._open()
+
+    def release(self):
+        """Give back the slot `allow` reserved when the attempt ended without an outcome to record."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._window.clear()
+        self._streak = 0
+
+    def reset(self):
+        """Force the circuit closed."""
+        with self._lock:
+            self.state = CLOSED
+            self._window.clear()
+            self._streak = 0
+            self._probes = 0
+
+    def __repr__(self):
+        return f"CircuitBreaker({self.name}, state={self.state})"
+
+
+class CircuitBreakers:
+    """
+    One CircuitBreaker per endpoint group, created on first use with the given settings.
+
+    Example:
+        api = BybitAPI(api_key=..., api_secret=..., circuit_breaker=CircuitBreakers(slow_call_seconds=2.0))
+        api.http_manager.circuit_breakers.states()   # {"order": "closed", "market": "open", ...}
+    """
+
+    def __init__(self, group=endpoint_group, **settings):
+        self.group = group
+        self.settings = settings
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def for_path(self, path: str) -> CircuitBreaker:
+        name = self.group(path)
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = self._breakers[name] = CircuitBreaker(name, **self.settings)
+        return breaker
+
+    def states(self) -> dict:
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+    def reset(self):
+        for breaker in list(self._breakers.values()):
+            breaker.reset()
@@ -0,0 +1,126 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional dependency
+    msgspec = None
+
+
+class JsonCodec:
+    """
+    Encodes request bodies and decodes response bodies for HTTPManager.
+
+    Subclasses implement:
+        - dumps(obj) -> str: the exact text that is signed and sent.
+        - loads(data) -> object: accepts the raw response bytes (or str).
+        - decode_errors: exception types raised by `loads` on malformed input.
+    """
+
+    name = "base"
+    decode_errors = (ValueError,)
+
+    def dumps(self, obj) -> str:
+        raise NotImplementedError
+
+    def loads(self, data):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class StdlibCodec(JsonCodec):
+    """The standard library `json` module. Always available."""
+
+    name = "json"
+    decode_errors = (json.JSONDecodeError, UnicodeDecodeError)
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson: parses straight from bytes, several times faster than `json`."""
+
+    name = "orjson"
+    decode_errors = (json.JSONDecodeError,)  # orjson.JSONDecodeError subclasses it
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed. Install it with `pip install orjson`.")
+
+    def dumps(self, obj):
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec: reusable encoder/decoder pair, decodes from bytes."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed. Install it with `pip install msgspec`.")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self.decode_errors = (msgspec.DecodeError,)
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj).decode("utf-8")
+
+    def loads(self, data):
+        return self._decoder.decode(data)
+
+
+CODECS = {
+    "json": StdlibCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def get_codec(codec="json") -> JsonCodec:
+    """
+    Resolve a codec name or instance.
+
+    Args:
+        codec (str | JsonCodec): "json" (the default), "auto" (orjson, then
+            msgspec, then json: opt in after installing the `fast-json` extra),
+            "orjson", "msgspec", or a JsonCodec instance.
+
+    Returns:
+        JsonCodec: The codec instance to use.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec == "auto":
+        if orjson is not None:
+            return OrjsonCodec()
+        if msgspec is not None:
+            return MsgspecCodec()
+        return StdlibCodec()
+    try:
+        return CODECS[codec]()
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec {codec!r}. Choose one of: auto, {', '.join(CODECS)}.")
+
+
+def available_codecs() -> list:
+    """Names of the codecs that can be used in this environment."""
+    names = ["json"]
+    if orjson is not None:
+        names.append("orjson")
+    if msgspec is not None:
+        names.append("msgspec")
+    return names
@@ -44,3 +44,20 @@ class InvalidRequestError(Exception):
             f"{message} (ErrCode: {status_code}) (ErrTime: {time})"
             f".\nRequest → {request}."
         )
+
+
+class CircuitOpenError(FailedRequestError):
+    """
+    Exception raised without sending anything, because the circuit breaker of
+    the endpoint group is open after repeated failures or slow responses.
+    Subclass of FailedRequestError, so existing handlers still catch it.
+
+    Attributes:
+        group -- The endpoint group whose circuit is open.
+        retry_after -- Seconds until the breaker lets a probe request through.
+    """
+
+    def __init__(self, request, message, status_code, time, resp_headers, group=None, retry_after=None):
+        self.group = group
+        self.retry_after = retry_after
+        super().__init__(request, message, status_code, time, resp_headers)
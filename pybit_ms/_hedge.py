@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
+
+# Public, idempotent reads where a duplicate request is harmless.
+HEDGED_PATHS = frozenset({"/v5/market/tickers", "/v5/market/orderbook"})
+
+
+class HedgePolicy:
+    """
+    Hedged requests for latency-critical public reads.
+
+    A request to one of `paths` that has not answered within the `percentile`
+    of that endpoint's recent latencies gets a duplicate, sent on another
+    pooled connection; whichever answers first is returned and the other is
+    left to finish in the background. Only unauthenticated GETs are hedged.
+
+    Extra load is capped by a budget: every hedgeable request earns
+    `max_extra_ratio` of a hedge (up to `burst` saved), and each duplicate
+    spends one, so over time at most `max_extra_ratio` of these requests are
+    sent twice.
+
+    Args:
+        paths (iterable, optional): URL paths to hedge. Defaults to tickers and orderbook.
+        percentile (float): Latency quantile (0-1) after which the duplicate is sent.
+        min_delay (float): Lower bound of the hedge delay, in seconds.
+        initial_delay (float): Delay used until `min_samples` latencies are known.
+        min_samples (int): Latencies needed before the percentile is trusted.
+        window_size (int): Recent latencies kept per endpoint.
+        max_extra_ratio (float): Long-run share of requests that may be duplicated.
+        burst (float): Hedges that may be saved up for a burst of slow responses.
+        max_workers (int): Threads sending hedgeable requests (two per request while hedging).
+
+    Example:
+        api = BybitAPI(hedge=HedgePolicy(percentile=0.9, max_extra_ratio=0.05))
+        api.market.get_orderbook(category="linear", symbol="BTCUSDT")
+    """
+
+    def __init__(
+        self,
+        paths=None,
+        percentile: float = 0.95,
+        min_delay: float = 0.02,
+        initial_delay: float = 0.25,
+        min_samples: int = 20,
+        window_size: int = 200,
+        max_extra_ratio: float = 0.05,
+        burst: float = 5.0,
+        max_workers: int = 16,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1.")
+        self.paths = frozenset(paths) if paths is not None else HEDGED_PATHS
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.max_extra_ratio = max_extra_ratio
+        self.burst = burst
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._budget = burst
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def applies(self, method: str, path: str, auth: bool) -> bool:
+        return not auth and method.upper() == "GET" and urlsplit(path).path in self.paths
+
+    def observe(self, endpoint: str, latency: float):
+        with self._lock:
+            window = self._latencies.get(endpoint)
+            if window is None:
+                window = self._latencies[endpoint] = deque(maxlen=self.window_size)
+            window.append(latency)
+
+    def delay(self, endpoint: str) -> float:
+        """Seconds to wait for the first response before hedging."""
+        with self._lock:
+            window = self._latencies.get(endpoint)
+            if window is None or len(window) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(window)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))])
+
+    def _earn(self):
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self.burst, self._budget + self.max_extra_ratio)
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self.hedges += 1
+            return True
+
+    def send(self, transport, method, url, data, headers, timeout, timer=None):
+        """Send through `transport`, hedging if the first response is slower than `delay`."""
+        endpoint = urlsplit(url).path
+        self._earn()
+
+        def primary_send():
+            started = time.perf_counter()
+            response = transport.send(method, url, data, headers, timeout)
+            # Only the primary's latency feeds the percentile, so hedging cannot bias it downwards
+            self.observe(endpoint, time.perf_counter() - started)
+            return response
+
+        primary = self._executor.submit(primary_send)
+        try:
+            return primary.result(timeout=self.delay(endpoint))
+        except FutureTimeout:
+            pass
+        if not self._spend():
+            return primary.result()
+
+        backup = self._executor.submit(transport.send, method, url, data, headers, timeout)
+        pending, error = {primary, backup}, None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    won = future is backup
+                    if won:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    if timer is not None:
+                        timer.hedge(won)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stats(self) -> dict:
+        """Counters and the current hedge delay of every endpoint seen."""
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "delays": {endpoint: self.delay(endpoint) for endpoint in list(self._latencies)},
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -2,18 +2,24 @@ import time
 import hmac
 import hashlib
 import base64
-import json
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 
 from datetime import datetime as dt, timezone
-from json.decoder import JSONDecodeError
+from urllib.parse import urlsplit
 
 from Crypto.Hash import SHA256
 from Crypto.PublicKey import RSA
 from Crypto.Signature import PKCS1_v1_5
 
-from pybit_ms._exceptions import FailedRequestError, InvalidRequestError
+from pybit_ms._exceptions import FailedRequestError, InvalidRequestError, CircuitOpenError
+from pybit_ms._metrics import MetricsSink, RequestTimer, NULL_TIMER
+from pybit_ms._codec import JsonCodec, get_codec
+from pybit_ms._transport import Transport, RequestsTransport, HTTP2Transport
+from pybit_ms._rate_limit import PriorityLanes
+from pybit_ms._circuit import CircuitBreakers, SERVER_ERROR_CODES
+from pybit_ms._hedge import HedgePolicy
 
 HTTP_URL = "https://{SUBDOMAIN}.bybit.com"
 SUBDOMAIN_TESTNET = "api-testnet"
@@ -45,6 +51,35 @@ class HTTPManager:
     - HMAC or RSA authentication.
     - Optional retry logic for known transient errors.
     - Logging and request/response inspection.
+    - Optional latency/retry/error instrumentation through a MetricsSink
+      (`metrics=MetricsRegistry()` keeps them in-process and exports them
+      in the Prometheus text format).
+    - Pluggable JSON codec (`json_codec`): the standard library by default;
+      "auto" opts into orjson or msgspec when installed (`pip install
+      pybit_ms[fast-json]`). Responses are decoded from raw bytes.
+    - Pluggable transport (`transport`): the pooled session by default,
+      "http2" for an HTTP/2 connection multiplexing concurrent requests (needs
+      httpx), or e.g. a RecordingTransport / ReplayTransport to capture and
+      replay real traffic.
+    - Optional priority lanes (`lanes=True` or a PriorityLanes): trade, history,
+      market and other requests get separate concurrency limits and rate
+      budgets, so order traffic never queues behind bulk data reads.
+    - Optional circuit breakers per endpoint group (`circuit_breaker=True` or a
+      CircuitBreakers): after repeated failures or slow responses, calls to the
+      group raise CircuitOpenError immediately instead of waiting out timeouts
+      and retries, until a half-open probe succeeds.
+    - Optional hedged requests (`hedge=True` or a HedgePolicy): a slow public
+      tickers/orderbook read gets a duplicate on another pooled connection
+      and the first answer wins, within a budget on the extra load.
+
+    Thread safety:
+        A single instance can be shared by many worker threads. Every call to
+        `_submit_request` works on its own copy of the query and keeps its
+        recv_window, timestamp and signature local, so concurrent calls never
+        see each other's state and the caller's `query` dict is left untouched.
+        All threads send through one pooled `requests.Session`; size
+        `pool_maxsize` to the number of workers so each thread can hold a
+        keep-alive connection instead of opening a new one.
     """
 
     def __init__(
@@ -60,6 +95,14 @@ class HTTPManager:
         force_retry: bool = False,
         max_retries: int = 3,
         retry_delay: float = 3.0,
+        pool_maxsize: int = 10,
+        session: requests.Session = None,
+        metrics: MetricsSink = None,
+        json_codec: str | JsonCodec = "json",
+        transport: str | Transport = None,
+        lanes: PriorityLanes | bool = None,
+        circuit_breaker: CircuitBreakers | bool = None,
+        hedge: HedgePolicy | bool = None,
     ):
         self.testnet = testnet
         self.rsa_authentication = rsa_authentication
@@ -71,6 +114,9 @@ class HTTPManager:
         self.force_retry = force_retry
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.metrics = metrics
+        self.codec = get_codec(json_codec)
+        self._response_hooks = []
 
         subdomain = SUBDOMAIN_TESTNET if self.testnet else SUBDOMAIN_MAINNET
         self.endpoint = HTTP_URL.format(SUBDOMAIN=subdomain)
@@ -78,8 +124,9 @@ class HTTPManager:
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging_level)
 
-        # If no handlers on the root, add one for this logger.
-        if not logging.root.handlers:
+        # If no handlers on the root, add one for this logger (once, since
+        # every manager shares the module logger).
+        if not logging.root.handlers and not self.logger.handlers:
             handler = logging.StreamHandler()
             handler.setFormatter(
                 logging.Formatter(
@@ -90,30 +137,67 @@ class HTTPManager:
             handler.setLevel(logging_level)
             self.logger.addHandler(handler)
 
-        self.logger.debug(f"Initialized HTTPManager for {'testnet' if testnet else 'mainnet'}.")
+        self.logger.debug(
+            f"Initialized HTTPManager for {'testnet' if testnet else 'mainnet'} "
+            f"(json codec: {self.codec.name})."
+        )
 
-        self.client = requests.Session()
+        # Shared, pooled transport. A session passed in by the caller is reused
+        # as-is so several managers can share the same connection pool.
+        own_session = session is None
+        if own_session:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_maxsize,
+                pool_maxsize=pool_maxsize,
+                pool_block=True,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.client = session
         self.client.headers.update(
             {
                 "Content-Type": "application/json",
                 "Accept": "application/json",
             }
         )
+        if transport is None or transport == "requests":
+            transport = RequestsTransport(self.client)
+        elif transport == "http2":
+            transport = HTTP2Transport(max_connections=pool_maxsize)
+        self.transport = transport
+
+        if lanes is True:
+            lanes = PriorityLanes.default()
+        self.lanes = lanes or None
+
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreakers()
+        self.circuit_breakers = circuit_breaker or None
+
+        if hedge is True:
+            hedge = HedgePolicy()
+        self.hedge = hedge or None
+        if self.lanes is not None and self.lanes.max_concurrency > pool_maxsize and own_session:
+            self.logger.warning(
+                f"Priority lanes allow {self.lanes.max_concurrency} concurrent requests but "
+                f"pool_maxsize is {pool_maxsize}; lanes may wait for each other's connections."
+            )
 
         # Common Bybit error codes that may warrant a retry
         self.retry_codes = {10002, 10006, 30034, 30035, 130035, 130150}
 
-    @staticmethod
-    def _prepare_payload(method, params):
+    def _prepare_payload(self, method, params):
         """
         Prepare payload for a Bybit request:
           - GET => query string
           - others => JSON-encoded string
-        Also casts certain fields to the expected types.
+        Also casts certain fields to the expected types. `params` is not modified.
         """
         string_params = ["qty", "price", "triggerPrice", "takeProfit", "stopLoss"]
         integer_params = ["positionIdx"]
 
+        params = dict(params)
         for k, v in params.items():
             if v is None:
                 continue
@@ -125,35 +209,72 @@ class HTTPManager:
         if method.upper() == "GET":
             return "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
         else:
-            return json.dumps(params)
+            return self.codec.dumps(params)
 
-    def _sign(self, payload, timestamp):
+    def _sign(self, payload, timestamp, recv_window=None):
         """
         Generate signature for authenticated endpoints using the Bybit formula.
+        `recv_window` defaults to the manager's configured value.
         """
         if not self.api_key or not self.api_secret:
             raise PermissionError("API key/secret needed for authenticated endpoints.")
 
-        param_str = f"{timestamp}{self.api_key}{self.recv_window}{payload}"
+        if recv_window is None:
+            recv_window = self.recv_window
+
+        param_str = f"{timestamp}{self.api_key}{recv_window}{payload}"
         return _generate_signature(self.rsa_authentication, self.api_secret, param_str)
 
     def _submit_request(self, method, path, query=None, auth=False):
         """
         Primary request submission function. Retries certain known errors if configured.
+
+        All per-request state (query copy, recv_window, signature) is local to
+        this call, so it is safe to call concurrently from several threads.
         """
         if query is None:
             query = {}
 
-        # Convert floats that are effectively ints (e.g., 1.0) to int to avoid signature mismatch
-        for k, v in query.items():
-            if isinstance(v, float) and v.is_integer():
-                query[k] = int(v)
+        # Convert floats that are effectively ints (e.g., 1.0) to int to avoid signature mismatch.
+        # Work on a copy so the caller's dict is never rewritten.
+        query = {
+            k: int(v) if isinstance(v, float) and v.is_integer() else v
+            for k, v in query.items()
+        }
+
+        timer = RequestTimer(self.metrics, urlsplit(path).path) if self.metrics is not None else NULL_TIMER
+        try:
+            data = self._send_with_retries(method, path, query, auth, timer)
+            timer.succeeded()
+        finally:
+            timer.finish()
+
+        for hook in self._response_hooks:
+            try:
+                hook(method, path, data)
+            except Exception:
+                self.logger.exception("Response hook failed.")
+        return data
+
+    def add_response_hook(self, callback):
+        """
+        Register `callback(method, path, response)`, called after every successful request
+        (e.g. to invalidate cached account state after our own order actions).
+        """
+        self._response_hooks.append(callback)
 
+    def _send_with_retries(self, method, path, query, auth, timer):
+        """
+        Sign, send and decode a request, retrying known transient errors.
+        Each phase is reported to `timer`.
+        """
+        recv_window = self.recv_window
         retries_attempted = 0
         req_params = None
 
         while True:
             if retries_attempted > self.max_retries:
+                timer.error("max_retries")
                 raise FailedRequestError(
                     request=f"{method} {path}: {req_params}",
                     message="Maximum retries exceeded.",
@@ -162,30 +283,32 @@ class HTTPManager:
                     resp_headers=None,
                 )
 
+            started = time.perf_counter()
             req_params = self._prepare_payload(method, query)
+            started = timer.phase("prepare", started)
 
             headers = {}
             if auth:
                 timestamp = int(time.time() * 1e3)  # ms
-                sig = self._sign(req_params, timestamp)
+                sig = self._sign(req_params, timestamp, recv_window)
                 headers.update(
                     {
                         "X-BAPI-API-KEY": self.api_key,
                         "X-BAPI-SIGN": sig,
                         "X-BAPI-SIGN-TYPE": "2",
                         "X-BAPI-TIMESTAMP": str(timestamp),
-                        "X-BAPI-RECV-WINDOW": str(self.recv_window),
+                        "X-BAPI-RECV-WINDOW": str(recv_window),
                     }
                 )
+                started = timer.phase("sign", started)
 
             # Build request
             if method.upper() == "GET":
                 url = f"{path}?{req_params}" if req_params else path
-                req_obj = requests.Request(method, url, headers=headers)
+                body = None
             else:
-                req_obj = requests.Request(method, path, data=req_params, headers=headers)
-
-            prepared = self.client.prepare_request(req_obj)
+                url = path
+                body = req_params
 
             if self.log_requests:
                 self.logger.debug(
@@ -194,69 +317,132 @@ class HTTPManager:
                     f"Headers={headers}, Attempt={retries_attempted+1}"
                 )
 
-            try:
-                resp = self.client.send(prepared, timeout=self.timeout)
-            except (
-                requests.exceptions.ReadTimeout,
-                requests.exceptions.SSLError,
-                requests.exceptions.ConnectionError,
-            ) as e:
-                if self.force_retry:
-                    self.logger.error(f"Network error: {e}; retrying in {self.retry_delay}s.")
-                    time.sleep(self.retry_delay)
-                    retries_attempted += 1
-                    continue
-                else:
-                    raise FailedRequestError(
-                        request=f"{method} {path}: {req_params}",
-                        message=str(e),
-                        status_code=None,
-                        time=dt.utcnow().strftime("%H:%M:%S"),
-                        resp_headers=None,
-                    )
-
-            if resp.status_code != 200:
-                err_msg = "HTTP status != 200"
-                if resp.status_code == 403:
-                    err_msg = "IP or region restricted, or IP rate limit breach."
-                self.logger.debug(f"Response text: {resp.text}")
-                raise FailedRequestError(
+            breaker = self.circuit_breakers.for_path(path) if self.circuit_breakers is not None else None
+            if breaker is not None and not breaker.allow():
+                timer.error("circuit_open")
+                raise CircuitOpenError(
                     request=f"{method} {path}: {req_params}",
-                    message=err_msg,
-                    status_code=resp.status_code,
+                    message=f"Circuit open for '{breaker.name}' endpoints; failing fast.",
+                    status_code=None,
                     time=dt.now(timezone.utc).strftime("%H:%M:%S"),
-                    resp_headers=resp.headers,
+                    resp_headers=None,
+                    group=breaker.name,
+                    retry_after=breaker.retry_after(),
                 )
 
+            # `breaker` holds the slot allow() reserved (a probe when half-open) until the
+            # attempt's outcome is recorded; give it back if anything else ends the attempt.
             try:
-                data = resp.json()
-            except JSONDecodeError:
-                if self.force_retry:
-                    self.logger.error(f"JSONDecodeError; retrying in {self.retry_delay}s.")
-                    time.sleep(self.retry_delay)
-                    retries_attempted += 1
-                    continue
-                else:
+                lane = self.lanes.lane_for(method, path) if self.lanes is not None else None
+                if lane is not None:
+                    started = time.perf_counter()
+                    lane.acquire()
+                    timer.phase("queue", started)
+
+                started = time.perf_counter()
+                try:
+                    try:
+                        if self.hedge is not None and self.hedge.applies(method, path, auth):
+                            resp = self.hedge.send(self.transport, method, url, body, headers, self.timeout, timer)
+                        else:
+                            resp = self.transport.send(method, url, body, headers, self.timeout)
+                    finally:
+                        if lane is not None:
+                            lane.release()
+                except (
+                    requests.exceptions.ReadTimeout,
+                    requests.exceptions.SSLError,
+                    requests.exceptions.ConnectionError,
+                ) as e:
+                    timer.phase("network", started)
+                    timer.error("network")
+                    if breaker is not None:
+                        breaker.record(False)
+                        breaker = None
+                    if self.force_retry:
+                        self.logger.error(f"Network error: {e}; retrying in {self.retry_delay}s.")
+                        time.sleep(self.retry_delay)
+                        retries_attempted += 1
+                        timer.retry()
+                        continue
+                    else:
+                        raise FailedRequestError(
+                            request=f"{method} {path}: {req_params}",
+                            message=str(e),
+                            status_code=None,
+                            time=dt.utcnow().strftime("%H:%M:%S"),
+                            resp_headers=None,
+                        )
+                except Exception:
+                    if breaker is not None:
+                        breaker.record(False)
+                        breaker = None
+                    raise
+                latency = time.perf_counter() - started
+                started = timer.phase("network", started)
+                # Bytes on the wire, not characters (non-ASCII orderLinkIds etc.)
+                timer.transfer(len(req_params.encode("utf-8")) if req_params else 0, len(resp.content), resp.headers)
+
+                if resp.status_code != 200:
+                    timer.error(resp.status_code)
+                    if breaker is not None:
+                        breaker.record(resp.status_code < 500 and resp.status_code not in (403, 429), latency)
+                        breaker = None
+                    err_msg = "HTTP status != 200"
+                    if resp.status_code == 403:
+                        err_msg = "IP or region restricted, or IP rate limit breach."
+                    self.logger.debug(f"Response text: {resp.text}")
                     raise FailedRequestError(
                         request=f"{method} {path}: {req_params}",
-                        message="Could not decode JSON.",
-                        status_code=409,
+                        message=err_msg,
+                        status_code=resp.status_code,
                         time=dt.now(timezone.utc).strftime("%H:%M:%S"),
                         resp_headers=resp.headers,
                     )
 
-            ret_code = data.get("retCode", 0)
-            ret_msg = data.get("retMsg", "OK")
+                try:
+                    data = self.codec.loads(resp.content)
+                except self.codec.decode_errors:
+                    timer.error("decode")
+                    if breaker is not None:
+                        breaker.record(False)
+                        breaker = None
+                    if self.force_retry:
+                        self.logger.error(f"JSONDecodeError; retrying in {self.retry_delay}s.")
+                        time.sleep(self.retry_delay)
+                        retries_attempted += 1
+                        timer.retry()
+                        continue
+                    else:
+                        raise FailedRequestError(
+                            request=f"{method} {path}: {req_params}",
+                            message="Could not decode JSON.",
+                            status_code=409,
+                            time=dt.now(timezone.utc).strftime("%H:%M:%S"),
+                            resp_headers=resp.headers,
+                        )
+                timer.phase("decode", started)
+
+                ret_code = data.get("retCode", 0)
+                ret_msg = data.get("retMsg", "OK")
+                if breaker is not None:
+                    breaker.record(ret_code not in SERVER_ERROR_CODES, latency)
+                    breaker = None
+            finally:
+                if breaker is not None:
+                    breaker.release()
 
             if ret_code != 0:
+                timer.error(ret_code)
                 # Potentially fixable errors
                 if ret_code in self.retry_codes:
                     self.logger.error(f"Error code {ret_code}: {ret_msg}; retrying.")
                     if ret_code == 10002:
-                        self.recv_window += 2500
-                        self.logger.debug("Increased recv_window by 2500ms.")
+                        recv_window += 2500
+                        self.logger.debug("Increased recv_window by 2500ms for this request.")
                     time.sleep(self.retry_delay)
                     retries_attempted += 1
+                    timer.retry()
                     continue
                 else:
                     raise InvalidRequestError(
@@ -294,11 +480,30 @@ class HTTPManager:
 
         :return: a combined list of all items from 'result["list"]' across all pages
         """
-        if query is None:
-            query = {}
-
         all_records = []
-        current_cursor = None
+        for records, _ in self._iter_paginated_request(method, path, query, auth, max_pages):
+            all_records.extend(records)
+        return all_records
+
+    def _iter_paginated_request(
+        self,
+        method: str,
+        path: str,
+        query=None,
+        auth=False,
+        max_pages: int = None,
+        cursor: str = None,
+    ):
+        """
+        Generator version of `_submit_paginated_request`: yields each page as
+        (records, next_cursor) as soon as it arrives, so callers can process
+        any number of pages in constant memory. `next_cursor` is None on the
+        last page; passing a yielded cursor back as `cursor` resumes after that page.
+
+        :param cursor: start from this cursor instead of the first page
+        """
+        query = dict(query) if query else {}
+        current_cursor = cursor
         pages_fetched = 0
 
         while True:
@@ -309,11 +514,9 @@ class HTTPManager:
             # Single-page request using the existing logic
             single_response = self._submit_request(method, path, query=query, auth=auth)
             result = single_response.get("result", {})
-            records = result.get("list", [])
-            all_records.extend(records)
+            next_cursor = result.get("nextPageCursor") or None
+            yield result.get("list", []), next_cursor
 
-            # Check nextPageCursor
-            next_cursor = result.get("nextPageCursor")
             if not next_cursor:
                 # No more pages
                 break
@@ -325,5 +528,3 @@ class HTTPManager:
             # If max_pages was given and we've hit it, stop
             if max_pages is not None and pages_fetched >= max_pages:
                 break
-
-        return all_records
@@ -0,0 +1,291 @@
+import bisect
+import time
+import threading
+
+
+# Latency buckets (seconds) used by default for every histogram.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value):
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsSink:
+    """
+    Interface for receiving HTTPManager instrumentation.
+
+    Subclass it and pass an instance as `metrics=` to HTTPManager (or BybitAPI)
+    to forward measurements to any backend. Every method receives the metric
+    name, a numeric value and a dict of labels (always including "endpoint").
+    Implementations must be thread-safe: they are called from every thread
+    that submits requests.
+    """
+
+    def observe(self, name: str, value: float, labels: dict):
+        """Record one sample of a distribution (e.g. a latency)."""
+        raise NotImplementedError
+
+    def increment(self, name: str, value: float, labels: dict):
+        """Add `value` to a monotonically increasing counter."""
+        raise NotImplementedError
+
+    def set_gauge(self, name: str, value: float, labels: dict):
+        """Set a gauge to its latest value."""
+        raise NotImplementedError
+
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile (0..1) by linear interpolation inside the bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                upper = self.buckets[i] if i < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            if i < len(self.buckets):
+                lower = self.buckets[i]
+        return lower
+
+
+class MetricsRegistry(MetricsSink):
+    """
+    In-process metrics store with a Prometheus text exporter.
+
+    Example:
+        registry = MetricsRegistry()
+        api = BybitAPI(metrics=registry)
+        ...
+        print(registry.to_prometheus())
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace: str = "bybit"):
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name, value, labels):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(self.buckets)
+            hist.observe(value)
+
+    def increment(self, name, value, labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def reset(self):
+        """Drop every recorded metric."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Return a plain-dict copy of the current metrics.
+
+        Returns:
+            dict: {"histograms": {...}, "counters": {...}, "gauges": {...}} where
+                each inner dict is keyed by (name, labels) and histogram values
+                hold count, sum, p50, p90 and p99.
+        """
+        with self._lock:
+            histograms = {
+                key: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "p50": h.quantile(0.50),
+                    "p90": h.quantile(0.90),
+                    "p99": h.quantile(0.99),
+                }
+                for key, h in self._histograms.items()
+            }
+            return {
+                "histograms": histograms,
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+            }
+
+    def slowest_endpoints(self, n: int = 10, name: str = "request_seconds", q: float = 0.99) -> list:
+        """
+        Rank endpoints by a latency quantile.
+
+        Returns:
+            list[tuple]: (endpoint, quantile_seconds, count) sorted slowest first.
+        """
+        with self._lock:
+            rows = [
+                (dict(labels).get("endpoint", ""), h.quantile(q), h.count)
+                for (metric, labels), h in self._histograms.items()
+                if metric == name and h.count
+            ]
+        rows.sort(key=lambda r: r[1], reverse=True)
+        return rows[:n]
+
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        items = list(labels) + list(extra)
+        if not items:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        ns = f"{self.namespace}_" if self.namespace else ""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+
+            lines = []
+            typed = set()
+            for (name, labels), h in histograms:
+                full = f"{ns}{name}"
+                if full not in typed:
+                    lines.append(f"# TYPE {full} histogram")
+                    typed.add(full)
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f"{full}_bucket{self._format_labels(labels, [('le', repr(bound))])} {cumulative}")
+                lines.append(f"{full}_bucket{self._format_labels(labels, [('le', '+Inf')])} {h.count}")
+                lines.append(f"{full}_sum{self._format_labels(labels)} {h.sum}")
+                lines.append(f"{full}_count{self._format_labels(labels)} {h.count}")
+
+            for kind, items in (("counter", counters), ("gauge", gauges)):
+                for (name, labels), value in items:
+                    full = f"{ns}{name}"
+                    if full not in typed:
+                        lines.append(f"# TYPE {full} {kind}")
+                        typed.add(full)
+                    lines.append(f"{full}{self._format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimer:
+    """
+    Collects the measurements of one `_submit_request` call and forwards them
+    to a MetricsSink.
+
+    Recorded metrics (all labelled with "endpoint"):
+        request_phase_seconds{phase}  histogram: prepare, sign, queue (priority lanes), network, decode
+        request_seconds               histogram: wall time of the whole call, retries included
+        requests_total{outcome}       counter: ok / error
+        request_retries_total         counter
+        request_hedges_total{winner}  counter: hedged requests (see HedgePolicy), won by "primary" or "hedge"
+        request_errors_total{code}    counter: Bybit retCode, HTTP status, "network" or "decode"
+        request_bytes_sent_total      counter
+        response_bytes_total          counter
+        rate_limit_remaining          gauge, from the X-Bapi-Limit-Status header
+    """
+
+    __slots__ = ("sink", "labels", "started", "outcome")
+
+    def __init__(self, sink: MetricsSink, endpoint: str):
+        self.sink = sink
+        self.labels = {"endpoint": endpoint}
+        self.started = time.perf_counter()
+        self.outcome = "error"
+
+    def phase(self, name, since):
+        """Record the time elapsed since `since` (a perf_counter value) as phase `name`."""
+        now = time.perf_counter()
+        self.sink.observe("request_phase_seconds", now - since, {**self.labels, "phase": name})
+        return now
+
+    def retry(self):
+        self.sink.increment("request_retries_total", 1, self.labels)
+
+    def error(self, code):
+        self.sink.increment("request_errors_total", 1, {**self.labels, "code": code})
+
+    def hedge(self, won):
+        self.sink.increment("request_hedges_total", 1, {**self.labels, "winner": "hedge" if won else "primary"})
+
+    def transfer(self, sent, received, headers=None):
+        self.sink.increment("request_bytes_sent_total", sent, self.labels)
+        self.sink.increment("response_bytes_total", received, self.labels)
+        if headers:
+            remaining = headers.get("X-Bapi-Limit-Status")
+            if remaining is not None:
+                try:
+                    self.sink.set_gauge("rate_limit_remaining", float(remaining), self.labels)
+                except ValueError:
+                    pass
+
+    def succeeded(self):
+        self.outcome = "ok"
+
+    def finish(self):
+        self.sink.observe("request_seconds", time.perf_counter() - self.started, self.labels)
+        self.sink.increment("requests_total", 1, {**self.labels, "outcome": self.outcome})
+
+
+class _NullTimer:
+    """Stand-in used when no sink is configured; every hook is a no-op."""
+
+    __slots__ = ()
+
+    def phase(self, name, since):
+        return time.perf_counter()
+
+    def retry(self):
+        pass
+
+    def error(self, code):
+        pass
+
+    def hedge(self, won):
+        pass
+
+    def transfer(self, sent, received, headers=None):
+        pass
+
+    def succeeded(self):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_TIMER = _NullTimer()
@@ -0,0 +1,144 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None, tokens: float = 1) -> bool:
+        """
+        Take `tokens` tokens (capped at the bucket's capacity), waiting for them if
+        needed. Returns False if `timeout` expires first.
+        """
+        tokens = min(float(tokens), self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class Lane:
+    """
+    One priority class: at most `max_concurrency` requests in flight and, if
+    `rate` is set, at most `rate` requests per second (bursts up to `burst`).
+    """
+
+    def __init__(self, name: str, max_concurrency: int, rate: float = None, burst: float = None):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def acquire(self):
+        # Rate first, so a request waiting for budget does not hold a concurrency slot
+        if self.bucket is not None:
+            self.bucket.acquire()
+        self._semaphore.acquire()
+
+    def release(self):
+        self._semaphore.release()
+
+    def __repr__(self):
+        rate = f", rate={self.bucket.rate:g}/s" if self.bucket else ""
+        return f"Lane({self.name}, max_concurrency={self.max_concurrency}{rate})"
+
+
+TRADE = "trade"
+MARKET = "market"
+HISTORY = "history"
+DEFAULT = "default"
+
+# (max_concurrency, requests per second) per class. The concurrency limits add
+# up to HTTPManager's default pool_maxsize, so no class can take every pooled
+# connection and leave order traffic waiting for one.
+DEFAULT_LANES = {
+    TRADE: (4, 20),
+    MARKET: (3, 50),
+    HISTORY: (2, 10),
+    DEFAULT: (1, 10),
+}
+
+_trade_paths = None
+_history_paths = None
+
+
+def _path_sets():
+    # Imported lazily: trade.py imports the HTTP manager, which imports this module.
+    global _trade_paths, _history_paths
+    if _trade_paths is None:
+        from pybit_ms.trade import Trade
+
+        history = {Trade.GET_ORDER_HISTORY.value, Trade.GET_EXECUTIONS.value, Trade.GET_CLOSED_PNL.value}
+        _history_paths = frozenset(history)
+        _trade_paths = frozenset(t.value for t in Trade) - _history_paths
+    return _trade_paths, _history_paths
+
+
+def classify(method: str, path: str) -> str:
+    """
+    Default request classification:
+        - "trade": order, position and other Trade-enum endpoints (including open orders);
+        - "history": order history, executions, closed PnL and other history/record/log reads;
+        - "market": public /v5/market endpoints;
+        - "default": everything else.
+    """
+    path = urlsplit(path).path
+    trade_paths, history_paths = _path_sets()
+    if path in trade_paths:
+        return TRADE
+    if path in history_paths or any(word in path for word in ("history", "record", "log")):
+        return HISTORY
+    if path.startswith("/v5/market/"):
+        return MARKET
+    return DEFAULT
+
+
+class PriorityLanes:
+    """
+    Route each request to a Lane by class, so a flood of one kind of request
+    (e.g. market-data pulls) cannot delay another (e.g. order cancels): every
+    class has its own concurrency limit and rate budget.
+
+    Keep the sum of the lanes' concurrency limits within the HTTPManager's
+    `pool_maxsize`, so every lane can always get a pooled connection.
+
+    Example:
+        lanes = PriorityLanes.default()
+        api = BybitAPI(api_key=..., api_secret=..., lanes=lanes)
+    """
+
+    def __init__(self, lanes: dict, classify=classify):
+        if DEFAULT not in lanes:
+            raise ValueError(f"PriorityLanes needs a '{DEFAULT}' lane.")
+        self.lanes = lanes
+        self.classify = classify
+
+    @classmethod
+    def default(cls, overrides: dict = None) -> "PriorityLanes":
+        """Lanes from DEFAULT_LANES, with optional {class: (max_concurrency, rate)} overrides."""
+        spec = {**DEFAULT_LANES, **(overrides or {})}
+        return cls({name: Lane(name, concurrency, rate) for name, (concurrency, rate) in spec.items()})
+
+    @property
+    def max_concurrency(self) -> int:
+        return sum(lane.max_concurrency for lane in self.lanes.values())
+
+    def lane_for(self, method: str, path: str) -> Lane:
+        return self.lanes.get(self.classify(method, path)) or self.lanes[DEFAULT]
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+
+class RingBuffer:
+    """
+    Fixed-capacity columnar buffer: one preallocated NumPy array per field.
+    Once full, new rows overwrite the oldest ones, so memory never grows.
+
+    `total` counts every row ever appended; `since(total)` returns the rows
+    appended after that point, which is how the sampler flushes incrementally.
+    """
+
+    def __init__(self, capacity: int, fields: dict):
+        """
+        Args:
+            capacity (int): Rows kept.
+            fields (dict): Field name -> NumPy dtype.
+        """
+        self.capacity = int(capacity)
+        self.arrays = {name: np.zeros(self.capacity, dtype=dtype) for name, dtype in fields.items()}
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, row: dict):
+        i = self.total % self.capacity
+        for name, array in self.arrays.items():
+            array[i] = row[name]
+        self.total += 1
+
+    def extend(self, columns: dict):
+        """Append several rows at once, given as equal-length columns."""
+        n = len(next(iter(columns.values()))) if columns else 0
+        if n == 0:
+            return
+        keep = min(n, self.capacity)
+        index = (self.total + np.arange(n - keep, n)) % self.capacity
+        for name, array in self.arrays.items():
+            array[index] = np.asarray(columns[name])[n - keep:]
+        self.total += n
+
+    def _order(self, start: int) -> np.ndarray:
+        return np.arange(start, self.total) % self.capacity
+
+    def since(self, total: int) -> dict:
+        """Columns (oldest first) of the rows appended after `total`, as far as still held."""
+        start = max(total, self.total - self.capacity)
+        index = self._order(start)
+        return {name: array[index] for name, array in self.arrays.items()}
+
+    def column(self, name: str, last: int = None) -> np.ndarray:
+        """One field, oldest first (optionally only the `last` rows)."""
+        start = self.total - len(self) if last is None else max(self.total - len(self), self.total - last)
+        return self.arrays[name][self._order(start)]
+
+    def latest(self, name: str):
+        if not self.total:
+            return None
+        return self.arrays[name][(self.total - 1) % self.capacity].item()
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.since(0))
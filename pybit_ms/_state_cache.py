@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+# Successful POSTs under these prefixes can change positions or balances.
+INVALIDATING_PATHS = ("/v5/order/", "/v5/position/", "/v5/asset/", "/v5/account/", "/v5/spot-margin-trade/")
+# Order POSTs are acknowledged before the fill; positions change some time later.
+ORDER_PATHS = ("/v5/order/",)
+# While an order may still be filling, entries older than this are reloaded.
+SETTLE_POLL = 0.25
+
+POSITIONS = "positions"
+WALLET = "wallet"
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "read_at", "loader", "lock", "stale")
+
+    def __init__(self, loader):
+        self.value = None
+        self.fetched_at = None
+        self.read_at = time.monotonic()
+        self.loader = loader
+        self.lock = threading.Lock()
+        self.stale = True
+
+
+class StateCache:
+    """
+    Shared cache for account state (positions, wallet balances).
+
+    Entries are keyed by tuples whose first item is the kind, e.g.
+    ("positions", "linear", "BTCUSDT", None) or ("wallet", "UNIFIED").
+    Each entry remembers its loader so it can be refreshed in the background.
+
+    Invalidation is event-driven:
+        - `attach(http_manager)` invalidates everything after any successful
+          POST to order/position/asset/account endpoints (our own actions).
+          An order POST is acknowledged before its fill, so for `settle_window`
+          seconds after it every entry older than SETTLE_POLL is reloaded on read;
+        - `on_order_update` can be registered as an OrderManager listener to
+          invalidate when one of our orders gets filled. The first update ends
+          the settle window, since later fills are reported the same way.
+
+    The background refresher (`start`) reloads at most `max_refreshes` entries
+    per round, oldest first, and only entries that were read within `idle_timeout`.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._settle_window = 2.0
+        self._settling_until = 0.0
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, key: tuple, loader, max_age: float = None):
+        """
+        Return the cached value for `key`, calling `loader()` if it is missing,
+        invalidated or older than `max_age` seconds (None means any age is fine).
+        Concurrent callers of the same stale key share a single load.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(loader)
+            entry.loader = loader
+            entry.read_at = time.monotonic()
+
+        if not self._is_fresh(entry, max_age):
+            with entry.lock:
+                if not self._is_fresh(entry, max_age):
+                    self._load(entry)
+        return entry.value
+
+    def _is_fresh(self, entry, max_age):
+        if entry.stale or entry.fetched_at is None:
+            return False
+        age = time.monotonic() - entry.fetched_at
+        if age > SETTLE_POLL and time.monotonic() < self._settling_until:
+            return False
+        return max_age is None or age <= max_age
+
+    @staticmethod
+    def _load(entry):
+        # Clear the flag first so an invalidation racing with the load wins
+        entry.stale = False
+        try:
+            value = entry.loader()
+        except Exception:
+            entry.stale = True
+            raise
+        entry.value = value
+        entry.fetched_at = time.monotonic()
+
+    def age(self, key: tuple) -> float | None:
+        """Seconds since `key` was last loaded, or None if it never was."""
+        entry = self._entries.get(key)
+        if entry is None or entry.fetched_at is None:
+            return None
+        return time.monotonic() - entry.fetched_at
+
+    def invalidate(self, kind: str = None):
+        """Mark every entry of `kind` ("positions", "wallet"), or every entry, as stale."""
+        with self._lock:
+            for key, entry in self._entries.items():
+                if kind is None or key[0] == kind:
+                    entry.stale = True
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    # -------------------------------------------------------------- events
+
+    def attach(self, http_manager, settle_window: float = 2.0):
+        """
+        Invalidate the cache after each successful state-changing request of `http_manager`.
+
+        Args:
+            http_manager: The HTTPManager whose responses to watch.
+            settle_window (float): Seconds after an order POST during which entries
+                keep being reloaded (at most every SETTLE_POLL seconds), because the
+                order may fill after the acknowledgement. Register `on_order_update`
+                with an OrderManager to end the window at the first order update.
+        """
+        self._settle_window = settle_window
+        http_manager.add_response_hook(self._on_response)
+
+    def _on_response(self, method, path, response):
+        if method.upper() != "POST":
+            return
+        path = urlsplit(path).path
+        if path.startswith(ORDER_PATHS):
+            self._settling_until = time.monotonic() + self._settle_window
+        if path.startswith(INVALIDATING_PATHS):
+            self.invalidate()
+
+    def on_order_update(self, order: dict, previous: dict | None):
+        """OrderManager listener: invalidate when an order's executed quantity changes."""
+        if previous is None or order.get("cumExecQty") != previous.get("cumExecQty"):
+            self._settling_until = 0.0
+            self.invalidate()
+
+    # ---------------------------------------------------------- background
+
+    def start(self, interval: float = 2.0, max_refreshes: int = 4, idle_timeout: float = 60.0):
+        """
+        Refresh entries in a background thread.
+
+        Args:
+            interval (float): Seconds between rounds; entries older than this are due.
+            max_refreshes (int): Upper bound of loads per round (bounds request usage).
+            idle_timeout (float): Entries not read for this long are not refreshed.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                now = time.monotonic()
+                with self._lock:
+                    due = [
+                        e for e in self._entries.values()
+                        if now - e.read_at <= idle_timeout
+                        and (e.stale or e.fetched_at is None or now - e.fetched_at >= interval)
+                    ]
+                due.sort(key=lambda e: -1 if e.fetched_at is None or e.stale else e.fetched_at)
+                for entry in due[:max_refreshes]:
+                    try:
+                        with entry.lock:
+                            self._load(entry)
+                    except Exception as e:
+                        self.logger.error(f"Background state refresh failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="StateCache-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the background refresher."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
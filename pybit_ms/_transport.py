@@ -0,0 +1,257 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:  # optional dependency
+    httpx = None
+
+
+DEFAULT_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+# Request headers never written to a cassette.
+SECRET_HEADERS = {"x-bapi-api-key", "x-bapi-sign", "x-bapi-sign-type", "x-bapi-timestamp", "x-bapi-recv-window"}
+
+
+class TransportResponse:
+    """Minimal response object (the attributes HTTPManager reads from requests.Response)."""
+
+    __slots__ = ("status_code", "content", "headers", "elapsed")
+
+    def __init__(self, status_code: int, content: bytes, headers: dict, elapsed: float = 0.0):
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.elapsed = elapsed
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class Transport:
+    """
+    How HTTPManager puts a signed request on the wire.
+
+    `send` receives the final URL (query string included for GET), the encoded
+    body (None for GET) and the request headers, and returns an object with
+    `status_code`, `content` (bytes), `headers` and `text`. Network failures are
+    raised as requests.exceptions.ConnectionError / ReadTimeout / SSLError so the
+    manager's retry handling applies to every transport.
+    """
+
+    def send(self, method: str, url: str, data: str | None, headers: dict, timeout: float):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """The default transport: a pooled requests.Session."""
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+    def send(self, method, url, data, headers, timeout):
+        request = requests.Request(method, url, data=data, headers=headers)
+        prepared = self.session.prepare_request(request)
+        return self.session.send(prepared, timeout=timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    HTTP/2 transport on httpx (`pip install "httpx[http2]"`).
+
+    Concurrent requests from many threads are multiplexed as separate streams
+    over one connection instead of needing one TCP/TLS connection per in-flight
+    request; further connections (up to `max_connections`) are only opened when
+    the server's stream limit is reached, or when it only speaks HTTP/1.1.
+    `send_async` sends through an httpx.AsyncClient with the same settings,
+    for use from asyncio code.
+
+    httpx errors are mapped onto the requests exceptions HTTPManager retries on.
+    """
+
+    def __init__(self, max_connections: int = 10, http2: bool = True, client=None, async_client=None):
+        if httpx is None:
+            raise ImportError('HTTP2Transport requires httpx: pip install "httpx[http2]"')
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.http2 = http2
+        self.client = client or httpx.Client(http2=http2, limits=self.limits, headers=DEFAULT_HEADERS)
+        self._async_client = async_client
+
+    @staticmethod
+    def _wrap(response):
+        return TransportResponse(
+            response.status_code,
+            response.content,
+            response.headers,
+            response.elapsed.total_seconds(),
+        )
+
+    @staticmethod
+    def _translate(error):
+        if isinstance(error, httpx.TimeoutException):
+            return requests.exceptions.ReadTimeout(str(error))
+        return requests.exceptions.ConnectionError(str(error))
+
+    def send(self, method, url, data, headers, timeout):
+        try:
+            response = self.client.request(method, url, content=data, headers=headers, timeout=timeout)
+        except httpx.TransportError as e:
+            raise self._translate(e) from e
+        return self._wrap(response)
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(http2=self.http2, limits=self.limits, headers=DEFAULT_HEADERS)
+        return self._async_client
+
+    async def send_async(self, method, url, data, headers, timeout):
+        """Coroutine version of `send`."""
+        try:
+            response = await self.async_client.request(method, url, content=data, headers=headers, timeout=timeout)
+        except httpx.TransportError as e:
+            raise self._translate(e) from e
+        return self._wrap(response)
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+
+    def close(self):
+        self.client.close()
+
+
+class RecordingTransport(Transport):
+    """
+    Wrap another transport and append every exchange to a gzip-compressed
+    JSON-lines cassette: method, url, body, status, response headers, body and
+    latency. Authentication headers are never written.
+
+    Example:
+        recorder = RecordingTransport(RequestsTransport(session), "prod.cassette.gz")
+        api = BybitAPI(api_key=..., api_secret=..., transport=recorder)
+        ...
+        recorder.close()
+    """
+
+    def __init__(self, inner: Transport, path: str):
+        self.inner = inner
+        self.path = path
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def send(self, method, url, data, headers, timeout):
+        started = time.time()
+        clock = time.perf_counter()
+        response = self.inner.send(method, url, data, headers, timeout)
+        latency = time.perf_counter() - clock
+        record = {
+            "t": round(started, 6),
+            "method": method.upper(),
+            "url": url,
+            "body": data,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in SECRET_HEADERS},
+            "status": response.status_code,
+            "resp_headers": dict(response.headers),
+            "content": response.content.decode("utf-8", errors="replace"),
+            "latency": round(latency, 6),
+        }
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+        return response
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.inner.close()
+
+
+def load_cassette(path: str) -> list[dict]:
+    """Read every record of a cassette, in recording order."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayTransport(Transport):
+    """
+    Serve responses from a cassette instead of the network.
+
+    Requests are matched on (method, url, body): repeated identical requests get
+    their recorded responses in order. With `strict=False`, a request with no
+    match gets the next unused record in recording order instead (useful when
+    bodies contain fresh ids); otherwise it raises ConnectionError, which the
+    manager reports as a FailedRequestError.
+
+    Args:
+        path (str): Cassette written by RecordingTransport.
+        speed (float, optional): None replays as fast as possible; 1.0 sleeps each
+            recorded latency, 2.0 half of it, and so on.
+        loop (bool): Start again from the first response once a key's responses
+            are used up (for benchmarks that run more requests than recorded).
+        strict (bool): See above.
+    """
+
+    def __init__(self, path: str, speed: float = None, loop: bool = False, strict: bool = True):
+        self.records = load_cassette(path)
+        self.speed = speed
+        self.loop = loop
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._by_key = defaultdict(deque)
+        self._order = deque(range(len(self.records)))
+        self._used = set()
+        for index, record in enumerate(self.records):
+            self._by_key[self._key(record["method"], record["url"], record["body"])].append(index)
+        self._initial = {k: tuple(v) for k, v in self._by_key.items()}
+
+    @staticmethod
+    def _key(method, url, body):
+        return method.upper(), url, body or None
+
+    def _next(self, method, url, data):
+        key = self._key(method, url, data)
+        with self._lock:
+            queue = self._by_key.get(key)
+            if queue is not None and not queue and self.loop:
+                queue.extend(self._initial[key])
+            if queue:
+                index = queue.popleft()
+                self._used.add(index)
+                return self.records[index]
+            if not self.strict:
+                while self._order:
+                    index = self._order.popleft()
+                    if index not in self._used:
+                        self._used.add(index)
+                        return self.records[index]
+        raise requests.exceptions.ConnectionError(f"No recorded response for {method} {url}")
+
+    def send(self, method, url, data, headers, timeout):
+        record = self._next(method, url, data)
+        if self.speed:
+            time.sleep(record["latency"] / self.speed)
+        return TransportResponse(
+            record["status"],
+            record["content"].encode("utf-8"),
+            record["resp_headers"],
+            record["latency"],
+        )
+
+    def remaining(self) -> int:
+        """Number of recorded responses not served yet."""
+        return len(self.records) - len(self._used)
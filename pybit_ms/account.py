@@ -1,6 +1,9 @@
 from pybit_ms._http_manager import HTTPManager
 from pybit_ms.data_layer.data_handler import DataHandler
+from pybit_ms._state_cache import StateCache, WALLET
 from enum import Enum
+import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib import colormaps
 
@@ -28,23 +31,150 @@ class Account(str, Enum):
 
     def __str__(self) -> str:
         return self.value
+
+
+def _float(value) -> float:
+    """Parse a numeric string field ("" and missing count as 0)."""
+    if value in (None, ""):
+        return 0.0
+    return float(value)
+
+
+class WalletBalance:
+    """
+    Wallet balance parsed once from a `get_wallet_balance` response.
+
+    Per-coin values are float64 arrays aligned with `coins`, so a polling loop
+    can read them without string parsing or formatting. Empty fields are 0.
+
+    Attributes:
+        account_type (str): e.g. "UNIFIED".
+        total_equity, total_wallet_balance, total_margin_balance, total_available_balance,
+        total_initial_margin, total_maintenance_margin, total_perp_upl (float):
+            Account-level totals in USD.
+        coins (tuple): Coin names.
+        wallet_balance, equity, usd_value, unrealised_pnl, cum_realised_pnl, locked,
+        borrow_amount (np.ndarray): Per-coin values.
+    """
+
+    TOTALS = {
+        "total_equity": "totalEquity",
+        "total_wallet_balance": "totalWalletBalance",
+        "total_margin_balance": "totalMarginBalance",
+        "total_available_balance": "totalAvailableBalance",
+        "total_initial_margin": "totalInitialMargin",
+        "total_maintenance_margin": "totalMaintenanceMargin",
+        "total_perp_upl": "totalPerpUPL",
+    }
+    COIN_FIELDS = {
+        "wallet_balance": "walletBalance",
+        "equity": "equity",
+        "usd_value": "usdValue",
+        "unrealised_pnl": "unrealisedPnl",
+        "cum_realised_pnl": "cumRealisedPnl",
+        "locked": "locked",
+        "borrow_amount": "borrowAmount",
+    }
+
+    __slots__ = ("account_type", "coins", "_index", *TOTALS, *COIN_FIELDS)
+
+    def __init__(self, account: dict):
+        """
+        Args:
+            account (dict): One entry of the response's `result.list`.
+        """
+        self.account_type = account.get("accountType", "")
+        for name, key in self.TOTALS.items():
+            setattr(self, name, _float(account.get(key)))
+        coin_data = account.get("coin", []) or []
+        self.coins = tuple(entry.get("coin", "") for entry in coin_data)
+        self._index = {coin: i for i, coin in enumerate(self.coins)}
+        for name, key in self.COIN_FIELDS.items():
+            setattr(self, name, np.fromiter((_float(entry.get(key)) for entry in coin_data),
+                                            dtype=np.float64, count=len(coin_data)))
+
+    @classmethod
+    def from_response(cls, response: dict) -> "WalletBalance":
+        """Parse the first account of a raw `get_wallet_balance` response."""
+        accounts = response.get("result", {}).get("list", []) or [{}]
+        return cls(accounts[0])
+
+    def coin(self, coin: str) -> dict:
+        """All per-coin values of `coin` (KeyError if the wallet does not hold it)."""
+        i = self._index[coin]
+        return {name: float(getattr(self, name)[i]) for name in self.COIN_FIELDS}
+
+    def get(self, coin: str, field: str = "wallet_balance", default: float = 0.0) -> float:
+        """One per-coin value, e.g. `wallet.get("USDT", "equity")`."""
+        i = self._index.get(coin)
+        return default if i is None else float(getattr(self, field)[i])
+
+    def __contains__(self, coin: str) -> bool:
+        return coin in self._index
+
+    def __len__(self):
+        return len(self.coins)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Per-coin values as a DataFrame indexed by coin."""
+        return pd.DataFrame(
+            {name: getattr(self, name) for name in self.COIN_FIELDS},
+            index=pd.Index(self.coins, name="coin"),
+        )
+
+    def format(self) -> str:
+        """Readable summary: total equity, then wallet balance and USD value per coin."""
+        lines = [f"Total equity: ${self.total_equity:,.2f}"]
+        lines.extend(
+            f"{coin}: Wallet Balance = {balance:.6f}, USD Value = ${usd:.2f}"
+            for coin, balance, usd in zip(self.coins, self.wallet_balance, self.usd_value)
+        )
+        return "\n".join(lines)
+
+    def plot(self):
+        """Pie chart of the USD value distribution across coins."""
+        n = len(self.coins)
+        cmap = colormaps.get_cmap("Set3")
+        colors = [cmap(i / n) for i in range(n)]
+
+        plt.figure(figsize=(6, 6))
+        plt.pie(
+            self.usd_value,
+            labels=self.coins,
+            autopct='%1.1f%%',
+            startangle=140,
+            colors=colors,
+            explode=[0.05] * n
+        )
+        plt.title(f"Wallet Distribution\nTotal Equity: ${self.total_equity:,.2f}")
+        plt.show()
+
+    def __repr__(self):
+        return f"WalletBalance({self.account_type}, total_equity={self.total_equity:.2f}, coins={len(self.coins)})"
     
 
 class Account_client:
     
-    def __init__(self, http_manager: HTTPManager, data_handler: DataHandler):
+    def __init__(self, http_manager: HTTPManager, data_handler: DataHandler, state_cache: StateCache = None):
         self._http_manager = http_manager
         self._data_handler = data_handler
         self.endpoint = http_manager.endpoint
 
+        # Wallet cache, invalidated by our own order/transfer actions (see StateCache).
+        # Shared with Trade_client when built through BybitAPI.
+        if state_cache is None:
+            state_cache = StateCache()
+            state_cache.attach(http_manager)
+        self.state_cache = state_cache
+
 
-    def get_wallet_balance(self, accountType, plot=False, raw=False, **kwargs):
+    def get_wallet_balance(self, accountType, plot=False, raw=False, typed=False, **kwargs):
         """
         Fetch and process the wallet balance from the Bybit API.
 
         This function retrieves wallet balance details, optionally plots a 
         pie chart of the balance distribution, and can return either the 
-        raw response or formatted text output.
+        raw response, a parsed WalletBalance, or formatted text output.
 
         Required args:
             accountType (string): Account type
@@ -54,62 +184,17 @@ class Account_client:
         Args:
             plot (bool): Whether to plot the wallet balance as a pie chart.
             raw (bool): Whether to return the raw API response.
+            typed (bool): Whether to return a WalletBalance (nothing is printed).
             **kwargs: Additional query parameters for the API request.
 
         Returns:
-            dict or None: 
+            dict, WalletBalance or None: 
                 - If raw=True, returns the full API response as a dictionary.
-                - If raw=False, prints the wallet balance in a formatted manner.
+                - If typed=True, returns the parsed WalletBalance.
+                - Otherwise, prints the wallet balance in a formatted manner.
         
         https://bybit-exchange.github.io/docs/v5/account/wallet-balance
         """
-
-
-        def plot_wallet_balance(response):
-            """
-            Plot a pie chart for the wallet balance distribution.
-            """
-            coin_data = response['result']['list'][0]['coin']
-            coins = [entry['coin'] for entry in coin_data]
-            usd_values = [float(entry['usdValue']) for entry in coin_data]
-            total_equity = float(response['result']['list'][0]['totalEquity'])
-
-            cmap = colormaps.get_cmap("Set3")
-            colors = [cmap(i / len(coins)) for i in range(len(coins))]
-
-            explode = [0.05] * len(coins)
-
-            plt.figure(figsize=(6, 6))
-            plt.pie(
-                usd_values,
-                labels=coins,
-                autopct='%1.1f%%',
-                startangle=140,
-                colors=colors,
-                explode=explode
-            )
-            plt.title(f"Wallet Distribution\nTotal Equity: ${total_equity:,.2f}")
-            plt.show()
-
-        def format_wallet_balance(response):
-            """
-            Format the wallet balance into a readable string format.            
-            """
-
-            coin_data = response['result']['list'][0]['coin']
-            total_equity = float(response['result']['list'][0]['totalEquity'])
-            output_lines = []
-            for entry in coin_data:
-                coin = entry['coin']
-                wallet_balance = float(entry['walletBalance'])
-                usd_value = float(entry['usdValue'])
-                output_lines.append(
-                    f"{coin}: Wallet Balance = {wallet_balance:.6f}, "
-                    f"USD Value = ${usd_value:.2f}"
-                )
-            print(f"Total equity: ${total_equity:,.2f}")
-            print("\n".join(output_lines))
-        
         kwargs["accountType"] = accountType
 
         # Fetch wallet balance from the API
@@ -119,16 +204,48 @@ class Account_client:
             query=kwargs,
             auth=True,
         )
+        if raw and not plot:
+            return response
 
-        # Plot the wallet balance if requested
+        # Parsed once; the plot and the text output both read from it
+        wallet = WalletBalance.from_response(response)
         if plot:
-            plot_wallet_balance(response)
+            wallet.plot()
 
-        # Return either the raw response or formatted wallet balance
         if raw:
             return response
-        else:
-            return format_wallet_balance(response)
+        if typed:
+            return wallet
+        print(wallet.format())
+
+
+    def get_cached_wallet_balance(self, accountType, max_age: float = 5.0, typed: bool = False, **kwargs):
+        """
+        Return the raw wallet-balance response from the local cache, calling the API
+        only if the entry is missing, invalidated by one of our own actions,
+        or older than `max_age` seconds (None accepts any age).
+
+        Required args:
+            accountType (string): Account type. UNIFIED or CONTRACT
+
+        Args:
+            typed (bool): Return a WalletBalance instead of the raw response.
+
+        Returns:
+            dict | WalletBalance: The raw API response, as with `get_wallet_balance(raw=True)`,
+                or its WalletBalance.
+        """
+        def load():
+            return self.get_wallet_balance(accountType, raw=True, **kwargs)
+
+        key = (WALLET, accountType, tuple(sorted(kwargs.items())))
+        response = self.state_cache.get(key, load, max_age)
+        return WalletBalance.from_response(response) if typed else response
+
+
+    def wallet_cache_age(self, accountType, **kwargs) -> float | None:
+        """Seconds since the cached wallet balance was fetched (None if never)."""
+        return self.state_cache.age((WALLET, accountType, tuple(sorted(kwargs.items()))))
 
 
     def repay_liability(self, **kwargs):
@@ -299,6 +416,37 @@ class Account_client:
                 auth=True,
             )
 
+    def iter_transaction_log(self, cursor=None, max_pages=None, **kwargs):
+        """
+        Stream transaction-log pages (Unified account) without collecting them.
+
+        :param cursor: (str) Resume after the page that returned this cursor.
+        :param max_pages: (int) Stop after this many pages (default: all).
+        :param kwargs: Additional query params (limit, category, startTime, endTime, etc.).
+        :return: A generator of (records, next_cursor) per page; next_cursor is None on the last page.
+        """
+        return self._http_manager._iter_paginated_request(
+            method="GET",
+            path=f"{self.endpoint}{Account.GET_TRANSACTION_LOG}",
+            query=kwargs,
+            auth=True,
+            max_pages=max_pages,
+            cursor=cursor,
+        )
+
+    def iter_contract_transaction_log(self, cursor=None, max_pages=None, **kwargs):
+        """
+        Stream contract transaction-log pages (Classic account), as `iter_transaction_log`.
+        """
+        return self._http_manager._iter_paginated_request(
+            method="GET",
+            path=f"{self.endpoint}{Account.GET_CONTRACT_TRANSACTION_LOG}",
+            query=kwargs,
+            auth=True,
+            max_pages=max_pages,
+            cursor=cursor,
+        )
+
     def set_margin_mode(self, **kwargs):
         """
         Set margin mode. 
@@ -0,0 +1,227 @@
+import numpy as np
+import pandas as pd
+
+
+# Column types of the typed frames (fields missing from the records are skipped).
+EXECUTION_TYPES = {
+    "numeric": ("execPrice", "execQty", "execValue", "execFee", "feeRate", "orderPrice", "orderQty",
+                "leavesQty", "closedSize", "markPrice", "indexPrice"),
+    "time": ("execTime",),
+    "category": ("symbol", "side", "orderType", "execType", "feeCurrency", "stopOrderType"),
+    "bool": ("isMaker",),
+}
+CLOSED_PNL_TYPES = {
+    "numeric": ("qty", "orderPrice", "closedSize", "cumEntryValue", "avgEntryPrice", "cumExitValue",
+                "avgExitPrice", "closedPnl", "fillCount", "leverage", "openFee", "closeFee"),
+    "time": ("createdTime", "updatedTime"),
+    "category": ("symbol", "side", "orderType", "execType"),
+    "bool": (),
+}
+
+
+def _to_float(values: pd.Series) -> np.ndarray:
+    try:
+        # Fast path: every field is a number string
+        return values.to_numpy().astype(np.float64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(values.replace("", np.nan), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _typed_frame(records, types: dict) -> pd.DataFrame:
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(records)
+    df = df.copy()
+    for column in types["numeric"]:
+        if column in df:
+            df[column] = _to_float(df[column])
+    for column in types["time"]:
+        if column in df:
+            try:
+                ms = df[column].to_numpy().astype(np.int64)
+            except (ValueError, TypeError):
+                ms = _to_float(df[column])
+            df[column] = pd.to_datetime(ms, unit="ms", utc=True)
+    for column in types["category"]:
+        if column in df:
+            df[column] = df[column].astype("category")
+    for column in types["bool"]:
+        if column in df:
+            values = df[column]
+            if values.dtype == object:
+                values = values.map({True: True, False: False, "true": True, "false": False})
+            df[column] = values.fillna(False).astype(bool)
+    return df
+
+
+def executions_frame(records) -> pd.DataFrame:
+    """
+    Typed DataFrame of raw execution records (as returned by `get_executions(raw=True)`):
+    float64 prices/quantities/fees, UTC datetimes for execTime, categoricals for
+    symbol/side/types and a bool isMaker.
+    """
+    return _typed_frame(records, EXECUTION_TYPES)
+
+
+def closed_pnl_frame(records) -> pd.DataFrame:
+    """Typed DataFrame of raw closed-PnL records (as returned by `get_closed_pnl(raw=True)`)."""
+    return _typed_frame(records, CLOSED_PNL_TYPES)
+
+
+def _equals(column: pd.Series, value) -> np.ndarray:
+    # Series comparison runs on the codes of categorical columns
+    return (column == value).to_numpy(dtype=bool)
+
+
+def _side_sign(side: pd.Series) -> np.ndarray:
+    return np.where(_equals(side, "Sell"), -1.0, 1.0)
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df:
+        return np.full(len(df), np.nan)
+    return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _grouped(frame: pd.DataFrame, keys) -> "pd.core.groupby.DataFrameGroupBy":
+    return frame.groupby(keys, observed=True, sort=True)
+
+
+def pnl_stats(closed: pd.DataFrame, by="symbol") -> pd.DataFrame:
+    """
+    Realized PnL statistics from a closed-PnL frame, per group.
+
+    Args:
+        closed (pd.DataFrame): From `closed_pnl_frame` / `get_closed_pnl(frame=True)`.
+        by (str | list): Grouping column(s), e.g. "symbol" or ["symbol", "side"]. None for one total row.
+
+    Returns:
+        pd.DataFrame: trades, pnl (net, as reported by closedPnl), gross_profit, gross_loss,
+            wins, losses, win_rate, avg_win, avg_loss, profit_factor, best, worst,
+            turnover (entry + exit value) and fees (open + close fee, where reported).
+    """
+    pnl = _column(closed, "closedPnl")
+    win = pnl > 0
+    loss = pnl < 0
+    frame = pd.DataFrame({
+        "trades": np.ones(len(closed), dtype=np.int64),
+        "pnl": pnl,
+        "gross_profit": np.where(win, pnl, 0.0),
+        "gross_loss": np.where(loss, pnl, 0.0),
+        "wins": win.astype(np.int64),
+        "losses": loss.astype(np.int64),
+        "best": pnl,
+        "worst": pnl,
+        "turnover": np.nan_to_num(_column(closed, "cumEntryValue")) + np.nan_to_num(_column(closed, "cumExitValue")),
+        "fees": np.nan_to_num(_column(closed, "openFee")) + np.nan_to_num(_column(closed, "closeFee")),
+    }, index=closed.index)
+    aggregations = {c: "sum" for c in frame.columns}
+    aggregations.update(best="max", worst="min")
+    if by is None:
+        out = frame.agg(aggregations).to_frame().T
+    else:
+        keys = [by] if isinstance(by, str) else list(by)
+        for key in keys:
+            frame[key] = closed[key]
+        out = _grouped(frame, keys).agg(aggregations)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["win_rate"] = out["wins"] / out["trades"]
+        out["avg_win"] = out["gross_profit"] / out["wins"]
+        out["avg_loss"] = out["gross_loss"] / out["losses"]
+        out["profit_factor"] = out["gross_profit"] / -out["gross_loss"]
+    return out
+
+
+def execution_stats(executions: pd.DataFrame, by="symbol", trades_only: bool = True) -> pd.DataFrame:
+    """
+    Fill statistics from an executions frame, per group.
+
+    Slippage is signed so that positive means worse for us: buys above / sells
+    below the reference. It is reported in basis points, value-weighted, against
+    the order price (limit orders only, since a market order's price is just
+    its protection bound) and against the mark price at execution.
+
+    Args:
+        executions (pd.DataFrame): From `executions_frame` / `get_executions(frame=True)`.
+        by (str | list): Grouping column(s), e.g. "symbol", ["symbol", "side"]. None for one total row.
+        trades_only (bool): Ignore funding, settlement and other non-trade executions.
+
+    Returns:
+        pd.DataFrame: fills, qty, turnover, buy_value, sell_value, fees, fee_bps, maker_share
+            (share of turnover), vwap, slippage_bps (vs order price), mark_slippage_bps.
+    """
+    if trades_only and "execType" in executions:
+        trades = _equals(executions["execType"], "Trade")
+        if not trades.all():
+            executions = executions[trades]
+
+    sign = _side_sign(executions["side"])
+    price = _column(executions, "execPrice")
+    qty = _column(executions, "execQty")
+    value = _column(executions, "execValue")
+    value = np.where(np.isnan(value), price * qty, value)
+    order_price = _column(executions, "orderPrice")
+    mark = _column(executions, "markPrice")
+    maker = executions["isMaker"].to_numpy(dtype=bool) if "isMaker" in executions else np.zeros(len(value), bool)
+
+    limit = _equals(executions["orderType"], "Limit") if "orderType" in executions else np.ones(len(value), bool)
+    has_order_price = limit & (order_price > 0)
+    has_mark = mark > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slip = np.where(has_order_price, sign * (price - order_price) / order_price * 1e4, 0.0)
+        mark_slip = np.where(has_mark, sign * (price - mark) / mark * 1e4, 0.0)
+
+    frame = pd.DataFrame({
+        "fills": np.ones(len(value), dtype=np.int64),
+        "qty": qty,
+        "turnover": value,
+        "buy_value": np.where(sign > 0, value, 0.0),
+        "sell_value": np.where(sign < 0, value, 0.0),
+        "fees": _column(executions, "execFee"),
+        "maker_value": np.where(maker, value, 0.0),
+        "price_qty": price * qty,
+        "slip_weighted": slip * value,
+        "slip_value": np.where(has_order_price, value, 0.0),
+        "mark_slip_weighted": mark_slip * value,
+        "mark_slip_value": np.where(has_mark, value, 0.0),
+    }, index=executions.index)
+
+    if by is None:
+        sums = frame.sum().to_frame().T
+    else:
+        keys = [by] if isinstance(by, str) else list(by)
+        for key in keys:
+            frame[key] = executions[key]
+        sums = _grouped(frame, keys).sum()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = sums[["fills", "qty", "turnover", "buy_value", "sell_value", "fees"]].copy()
+        out["fee_bps"] = sums["fees"] / sums["turnover"] * 1e4
+        out["maker_share"] = sums["maker_value"] / sums["turnover"]
+        out["vwap"] = sums["price_qty"] / sums["qty"]
+        out["slippage_bps"] = sums["slip_weighted"] / sums["slip_value"]
+        out["mark_slippage_bps"] = sums["mark_slip_weighted"] / sums["mark_slip_value"]
+    return out
+
+
+def pnl_summary(closed: pd.DataFrame, executions: pd.DataFrame = None, by="symbol") -> pd.DataFrame:
+    """
+    `pnl_stats` joined with the execution fees and turnover of the same groups, plus
+    fee_drag: the share of the gross (pre-fee) PnL paid in fees.
+    """
+    out = pnl_stats(closed, by)
+    if executions is None:
+        return out
+    fills = execution_stats(executions, by)[["fills", "fees", "fee_bps", "maker_share", "slippage_bps"]]
+    out = out.drop(columns="fees").join(fills, how="outer")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["fee_drag"] = out["fees"] / (out["pnl"] + out["fees"]).abs()
+    return out
+
+
+def daily_pnl(closed: pd.DataFrame, by: str = None) -> pd.DataFrame | pd.Series:
+    """Realized PnL per UTC day (columns per `by` group if given), from closed-PnL createdTime."""
+    day = closed["createdTime"].dt.floor("D")
+    pnl = pd.Series(_column(closed, "closedPnl"), index=closed.index)
+    if by is None:
+        return pnl.groupby(day.to_numpy()).sum()
+    return pnl.groupby([day.to_numpy(), closed[by].to_numpy()]).sum().unstack(fill_value=0.0)
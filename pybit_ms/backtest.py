@@ -0,0 +1,236 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from pybit_ms.data_layer.data_handler import DataHandler
+from pybit_ms.account import Account_client
+
+
+MS_PER_YEAR = 365 * 24 * 60 * 60 * 1000
+
+
+class Indicators:
+    """
+    Per-symbol indicator cache, so a parameter sweep computes each window once.
+
+    Strategies receive an `Indicators` instance and call e.g. `ind.sma(20)`;
+    every array has the length of the bar series, with NaN during warm-up.
+    """
+
+    def __init__(self, bars: dict):
+        self.bars = bars
+        self.close = bars["close"]
+        self._cache = {}
+        self._csum = None
+
+    def sma(self, window: int) -> np.ndarray:
+        key = ("sma", int(window))
+        out = self._cache.get(key)
+        if out is None:
+            window = int(window)
+            if self._csum is None:
+                self._csum = np.concatenate(([0.0], np.cumsum(self.close)))
+            out = np.full(self.close.shape, np.nan)
+            if window <= len(self.close):
+                out[window - 1:] = (self._csum[window:] - self._csum[:-window]) / window
+            out = self._cache[key] = out
+        return out
+
+    def momentum(self, lookback: int) -> np.ndarray:
+        key = ("mom", int(lookback))
+        out = self._cache.get(key)
+        if out is None:
+            lookback = int(lookback)
+            out = np.full(self.close.shape, np.nan)
+            out[lookback:] = self.close[lookback:] / self.close[:-lookback] - 1.0
+            out = self._cache[key] = out
+        return out
+
+
+def sma_crossover(ind: Indicators, fast, slow) -> np.ndarray:
+    """Long when the fast SMA is above the slow one, short otherwise (flat during warm-up)."""
+    out = np.empty((len(fast), len(ind.close)))
+    for row, f, s in zip(out, fast, slow):
+        np.subtract(ind.sma(f), ind.sma(s), out=row)
+        np.sign(row, out=row)
+        row[: max(int(f), int(s)) - 1] = 0.0
+    return out
+
+
+def momentum(ind: Indicators, lookback, threshold) -> np.ndarray:
+    """Long above +threshold return over `lookback` bars, short below -threshold, flat in between."""
+    out = np.empty((len(lookback), len(ind.close)))
+    for row, n, t in zip(out, lookback, threshold):
+        mom = ind.momentum(n)
+        np.subtract(mom > t, mom < -t, out=row, dtype=np.float64)
+    return out
+
+
+class Backtester:
+    """
+    Vectorized backtester over stored klines.
+
+    A strategy is a function `strategy(ind, **params) -> positions` where `ind` is
+    the symbol's `Indicators` and every param is a 1-D array holding one value
+    per parameter set of the current chunk; it returns a (n_sets, n_bars) array
+    of target positions in [-1, 1]. The position decided on a bar's close is
+    held over the next bar, so there is no look-ahead.
+
+    Costs: every change of position pays `fee_rate * |change|` (the taker fee,
+    per symbol, e.g. from `Account_client.get_fee_rates`).
+
+    Example:
+        bt = Backtester.from_store(api.data_handler, {"BTCUSDT": "BTCUSDT_kline.csv"},
+                                   account_client=api.account, category="linear")
+        results = bt.run(sma_crossover, {"fast": range(5, 50, 5), "slow": range(50, 500, 50)})
+        results.sort_values("sharpe", ascending=False).head()
+    """
+
+    def __init__(self, data: dict, fee_rates: dict | float = 0.00055):
+        """
+        Args:
+            data (dict): symbol -> kline arrays ("timestamp", "close", ...), ascending.
+            fee_rates (dict | float): symbol -> fee rate, or one rate for every symbol.
+        """
+        self.data = data
+        if isinstance(fee_rates, dict):
+            self.fee_rates = {s: float(fee_rates.get(s, 0.00055)) for s in data}
+        else:
+            self.fee_rates = {s: float(fee_rates) for s in data}
+
+    @classmethod
+    def from_store(cls, data_handler: DataHandler, files: dict, account_client: Account_client = None,
+                   category: str = "linear", fee_rates: dict | float = 0.00055) -> "Backtester":
+        """
+        Build a backtester from kline CSVs in the DataHandler store.
+
+        Args:
+            data_handler (DataHandler): Store holding the CSV files.
+            files (dict): symbol -> CSV filename.
+            account_client (Account_client, optional): If given, taker fee rates are
+                fetched with `get_fee_rates` (one request for the whole category).
+            category (str): Category used for the fee-rate query.
+            fee_rates (dict | float): Fallback fee rates.
+        """
+        data = {symbol: data_handler.load_kline_arrays(name) for symbol, name in files.items()}
+        if account_client is not None:
+            fee_rates = cls.fetch_fee_rates(account_client, category, list(files), default=fee_rates)
+        return cls(data, fee_rates)
+
+    @staticmethod
+    def fetch_fee_rates(account_client: Account_client, category: str, symbols: list,
+                        default: dict | float = 0.00055) -> dict:
+        """Taker fee rate per symbol from `get_fee_rates` (falling back to `default`)."""
+        response = account_client.get_fee_rates(category=category)
+        rates = {r.get("symbol"): float(r.get("takerFeeRate", 0)) for r in response.get("result", {}).get("list", [])}
+        fallback = (lambda s: default.get(s, 0.00055)) if isinstance(default, dict) else (lambda s: default)
+        return {s: rates.get(s, fallback(s)) for s in symbols}
+
+    @staticmethod
+    def grid(params: dict) -> dict:
+        """Expand {"name": values, ...} into the cartesian product, as equal-length arrays."""
+        names = list(params)
+        combos = list(itertools.product(*(list(params[n]) for n in names)))
+        return {n: np.array([c[i] for c in combos]) for i, n in enumerate(names)}
+
+    @staticmethod
+    def bars_per_year(timestamps: np.ndarray) -> float:
+        if len(timestamps) < 2:
+            return 1.0
+        return MS_PER_YEAR / float(np.median(np.diff(timestamps)))
+
+    @staticmethod
+    def evaluate(positions: np.ndarray, returns: np.ndarray, fee_rate: float, bars_per_year: float) -> dict:
+        """
+        Score a (n_sets, n_bars) block of positions against per-bar returns (n_bars - 1).
+
+        Returns:
+            dict: name -> (n_sets,) array: total_return, sharpe, max_drawdown, trades, turnover, fees.
+        """
+        n_sets = positions.shape[0]
+        pnl = positions[:, :-1] * returns
+
+        # Positions change rarely, so costs are applied sparsely: entering the first
+        # position on bar 0, then every change between consecutive held positions.
+        entry = np.abs(positions[:, 0])
+        rows, cols = np.nonzero(np.diff(positions[:, :-1], axis=1))
+        change = np.abs(positions[rows, cols + 1] - positions[rows, cols])
+        pnl[:, 0] -= entry * fee_rate
+        pnl[rows, cols + 1] -= change * fee_rate
+        trades = np.bincount(rows, minlength=n_sets) + (entry > 0)
+        turnover = np.bincount(rows, weights=change, minlength=n_sets) + entry
+
+        n_bars = pnl.shape[1]
+        mean = pnl.sum(axis=1) / n_bars
+        var = np.einsum("ij,ij->i", pnl, pnl) / n_bars - mean ** 2
+        std = np.sqrt(np.maximum(var, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std > 0, mean / std * np.sqrt(bars_per_year), 0.0)
+
+        # A bar losing more than everything (leverage > 1) is ruin: equity stays at zero
+        np.maximum(pnl, -1.0, out=pnl)
+        with np.errstate(divide="ignore"):
+            log_equity = np.log1p(pnl, out=pnl)
+        np.cumsum(log_equity, axis=1, out=log_equity)
+        # The peak starts at the initial equity (log 0), so a loss on the first bar is a drawdown
+        peak = np.maximum.accumulate(log_equity, axis=1)
+        np.maximum(peak, 0.0, out=peak)
+        np.subtract(peak, log_equity, out=peak)
+        return {
+            "total_return": np.expm1(log_equity[:, -1]),
+            "sharpe": sharpe,
+            "max_drawdown": -np.expm1(-peak.max(axis=1)),
+            "trades": trades,
+            "turnover": turnover,
+            "fees": turnover * fee_rate,
+        }
+
+    def run(self, strategy, params: dict, chunk_size: int = 8, symbols: list = None) -> pd.DataFrame:
+        """
+        Evaluate `strategy` for every parameter set on every symbol.
+
+        Args:
+            strategy (callable): See the class docstring.
+            params (dict): Parameter grid, {"name": values}; the cartesian product is swept.
+            chunk_size (int): Parameter sets evaluated per vectorized block (bounds memory:
+                each block holds about chunk_size * n_bars floats per temporary).
+            symbols (list, optional): Subset of symbols. Defaults to all loaded.
+
+        Returns:
+            pd.DataFrame: One row per (symbol, parameter set) with the parameters and metrics.
+        """
+        grid = self.grid(params)
+        n_sets = len(next(iter(grid.values()))) if grid else 0
+        columns = {}
+        for symbol in symbols or list(self.data):
+            bars = self.data[symbol]
+            ind = Indicators(bars)
+            returns = bars["close"][1:] / bars["close"][:-1] - 1.0
+            per_year = self.bars_per_year(bars["timestamp"])
+            for start in range(0, n_sets, chunk_size):
+                chunk = {k: v[start:start + chunk_size] for k, v in grid.items()}
+                block = run_chunk(strategy, ind, returns, chunk, self.fee_rates[symbol], per_year)
+                append_columns(columns, symbol, block)
+        return columns_to_frame(columns)
+
+
+def run_chunk(strategy, ind: Indicators, returns: np.ndarray, chunk: dict, fee_rate: float,
+              bars_per_year: float) -> dict:
+    """Evaluate one block of parameter sets on one symbol; returns parameter and metric columns."""
+    positions = np.clip(np.asarray(strategy(ind, **chunk), dtype=np.float64), -1.0, 1.0)
+    return {**chunk, **Backtester.evaluate(positions, returns, fee_rate, bars_per_year)}
+
+
+def append_columns(columns: dict, symbol: str, block: dict):
+    """Append a result block to a columnar accumulator (column -> list of arrays)."""
+    n = len(next(iter(block.values())))
+    columns.setdefault("symbol", []).append(np.full(n, symbol, dtype=object))
+    for name, values in block.items():
+        columns.setdefault(name, []).append(np.asarray(values))
+
+
+def columns_to_frame(columns: dict) -> pd.DataFrame:
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame({name: np.concatenate(parts) for name, parts in columns.items()})
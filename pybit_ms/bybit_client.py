@@ -4,6 +4,7 @@ from pybit_ms.market import Market_client
 from pybit_ms.trade import Trade_client
 from pybit_ms.account import Account_client
 from pybit_ms.margin import Margin_client
+from pybit_ms._state_cache import StateCache
 
 
 class BybitAPI:
@@ -17,21 +18,34 @@ class BybitAPI:
         - account: Handles account management endpoints.
     """
 
-    def __init__(self, api_key=None, api_secret=None, testnet=False, **kwargs):
+    def __init__(self, api_key=None, api_secret=None, testnet=False, http_manager: HTTPManager = None,
+                 batch_order_rate: float = 10.0, **kwargs):
         """
         Initialize the BybitAPI client.
 
         :param testnet: (bool) Whether to use the testnet environment.
+        :param http_manager: (HTTPManager) Use this manager instead of building one,
+            e.g. a PaperHTTPManager for offline simulation.
+        :param batch_order_rate: (float) Orders per second for batch endpoints. Defaults to
+            Bybit's base limit of 10; pass the account's limit if higher, or None to disable pacing.
         :param kwargs: Additional parameters to pass to the HTTPManager.
         """
-        self.http_manager = HTTPManager(api_key=api_key, api_secret=api_secret, testnet=testnet, **kwargs)
+        if http_manager is None:
+            http_manager = HTTPManager(api_key=api_key, api_secret=api_secret, testnet=testnet, **kwargs)
+        self.http_manager = http_manager
         self.data_handler = DataHandler(base_dir="data/")
 
+        # Position/wallet cache shared by trade and account, invalidated by our own actions
+        self.state_cache = StateCache()
+        self.state_cache.attach(self.http_manager)
+
         # Subclients
-        self.trade = Trade_client(self.http_manager, self.data_handler)
+        self.trade = Trade_client(
+            self.http_manager, self.data_handler, state_cache=self.state_cache, batch_order_rate=batch_order_rate
+        )
         self.leverage = Margin_client(self.http_manager, self.data_handler)
         self.market = Market_client(self.http_manager, self.data_handler)
-        self.account = Account_client(self.http_manager, self.data_handler)
+        self.account = Account_client(self.http_manager, self.data_handler, state_cache=self.state_cache)
 
     def __repr__(self):
         return f"BybitAPI(testnet={self.http_manager.testnet})"
@@ -0,0 +1,172 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pybit_ms._http_manager import HTTPManager
+from pybit_ms.bybit_client import BybitAPI
+
+
+class BybitClientPool:
+    """
+    Many Bybit accounts (e.g. sub-accounts) behind one object.
+
+    Every account gets its own BybitAPI and HTTPManager (rate limits are per
+    UID, so each keeps its own signing, lanes and breakers), but all of them
+    send through one shared, pooled `requests.Session`. Calls are routed by
+    account name (`pool["arb-1"].trade.place_order(...)`), and reads can be
+    fanned out over every account concurrently with the results merged, each
+    record tagged with its "account".
+
+    Args:
+        accounts (dict): name -> (api_key, api_secret) or {"api_key": ..., "api_secret": ...}.
+        testnet (bool): Whether to use the testnet environment.
+        pool_maxsize (int): Connections kept in the shared pool.
+        max_workers (int, optional): Threads used for fan-out reads. Defaults to pool_maxsize.
+        **kwargs: Additional HTTPManager settings applied to every account.
+
+    Example:
+        pool = BybitClientPool({"main": (key, secret), "arb-1": (key1, secret1)})
+        balances = pool.get_wallet_balances("UNIFIED")
+        positions = pool.get_positions("linear", settle_coin="USDT")
+    """
+
+    def __init__(self, accounts: dict, testnet: bool = False, pool_maxsize: int = 20, max_workers: int = None,
+                 **kwargs):
+        self.testnet = testnet
+        self.settings = kwargs
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool_maxsize = pool_maxsize
+        self.clients = {}
+        for name, credentials in accounts.items():
+            if isinstance(credentials, dict):
+                self.add_account(name, **credentials)
+            else:
+                self.add_account(name, *credentials)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or pool_maxsize, thread_name_prefix="pool")
+        self.logger = logging.getLogger(__name__)
+
+    def add_account(self, name: str, api_key: str, api_secret: str, **overrides) -> BybitAPI:
+        """Add an account on the shared session; `overrides` replace the pool's HTTPManager settings."""
+        if name in self.clients:
+            raise ValueError(f"Account '{name}' is already in the pool.")
+        settings = {"pool_maxsize": self.pool_maxsize, **self.settings, **overrides}
+        http_manager = HTTPManager(
+            api_key=api_key, api_secret=api_secret, testnet=self.testnet, session=self.session, **settings
+        )
+        client = self.clients[name] = BybitAPI(http_manager=http_manager)
+        return client
+
+    def remove_account(self, name: str):
+        self.clients.pop(name)
+
+    @property
+    def accounts(self) -> list:
+        return list(self.clients)
+
+    def __getitem__(self, name: str) -> BybitAPI:
+        return self.clients[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.clients
+
+    def __len__(self):
+        return len(self.clients)
+
+    def __iter__(self):
+        return iter(self.clients.items())
+
+    def map(self, func, accounts: list = None, return_exceptions: bool = False) -> dict:
+        """
+        Call `func(client)` for every account concurrently.
+
+        Args:
+            func (callable): Receives the account's BybitAPI.
+            accounts (list, optional): Subset of account names. Defaults to all.
+            return_exceptions (bool): Put an account's exception in the result instead of
+                raising it (the first one, after every call has finished).
+
+        Returns:
+            dict: account name -> result, in pool order.
+        """
+        names = accounts if accounts is not None else self.accounts
+        futures = {name: self._executor.submit(func, self.clients[name]) for name in names}
+        results, error = {}, None
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    error = error or e
+                results[name] = e
+        if error is not None:
+            raise error
+        return results
+
+    def _merge(self, per_account: dict, return_exceptions: bool = False) -> list | tuple:
+        merged, errors = [], {}
+        for name, records in per_account.items():
+            if isinstance(records, Exception):
+                self.logger.warning(f"Account '{name}' failed: {records}")
+                errors[name] = records
+                continue
+            merged.extend({"account": name, **record} for record in records)
+        return (merged, errors) if return_exceptions else merged
+
+    def get_wallet_balances(self, accountType: str = "UNIFIED", accounts: list = None,
+                            return_exceptions: bool = False, **kwargs) -> list:
+        """
+        Wallet balance of every account, fetched concurrently.
+
+        Returns:
+            list: The `result.list` wallets of every account, each with an "account" key.
+            tuple: (list, errors) with `return_exceptions`, errors being account name -> exception.
+        """
+        def fetch(client):
+            response = client.account.get_wallet_balance(accountType, raw=True, **kwargs)
+            return response.get("result", {}).get("list", [])
+
+        return self._merge(self.map(fetch, accounts, return_exceptions), return_exceptions)
+
+    def get_positions(self, category: str, accounts: list = None, max_pages: int = 10,
+                      return_exceptions: bool = False, **kwargs) -> list:
+        """
+        Open positions of every account, fetched concurrently (see `Trade_client.get_positions`
+        for the filters, e.g. `symbol` or `settle_coin`).
+
+        Returns:
+            list: Raw position records, each with an "account" key.
+            tuple: (list, errors) with `return_exceptions`, errors being account name -> exception.
+        """
+        def fetch(client):
+            return client.trade.get_positions(category, max_pages=max_pages, raw=True, **kwargs)
+
+        return self._merge(self.map(fetch, accounts, return_exceptions), return_exceptions)
+
+    def get_executions(self, category: str, accounts: list = None, max_pages: int = 1,
+                       return_exceptions: bool = False, **kwargs) -> list:
+        """
+        Executions of every account, fetched concurrently (see `Trade_client.get_executions`
+        for the filters).
+
+        Returns:
+            list: Raw execution records, each with an "account" key, newest first.
+            tuple: (list, errors) with `return_exceptions`, errors being account name -> exception.
+        """
+        def fetch(client):
+            return client.trade.get_executions(category, max_pages=max_pages, raw=True, **kwargs)
+
+        merged, errors = self._merge(self.map(fetch, accounts, return_exceptions), return_exceptions=True)
+        merged.sort(key=lambda r: int(r.get("execTime", 0)), reverse=True)
+        return (merged, errors) if return_exceptions else merged
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def __repr__(self):
+        return f"BybitClientPool(accounts={len(self.clients)}, testnet={self.testnet})"
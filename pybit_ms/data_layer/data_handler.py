@@ -1,5 +1,6 @@
 import os
 import csv
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 from IPython.display import display_html
@@ -66,7 +67,57 @@ class DataHandler:
         with open(filepath, mode='r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             return list(reader)
-        
+
+
+    KLINE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume", "turnover")
+
+    def load_kline_arrays(self, filename: str) -> Dict[str, np.ndarray]:
+        """
+        Load a kline CSV (as written by `get_kline(save_csv=True)`) into NumPy arrays.
+
+        Rows are sorted by ascending timestamp and, for duplicate timestamps, only the
+        last row is kept, so files appended from several downloads can be loaded directly.
+
+        Args:
+            filename (str): The CSV filename (without path).
+
+        Returns:
+            dict[str, np.ndarray]: "timestamp" (int64, ms) and float64 "open", "high",
+                "low", "close", "volume", "turnover" (whichever are present).
+        """
+        filepath = os.path.join(self.base_dir, filename)
+
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File not found: {filepath}")
+
+        df = pd.read_csv(filepath, usecols=lambda c: c in self.KLINE_COLUMNS, engine="c")
+        # Later rows win: an appended download holds the final version of a bar saved while still open
+        df = df.drop_duplicates("timestamp", keep="last").sort_values("timestamp", kind="stable")
+
+        arrays = {"timestamp": df["timestamp"].to_numpy(dtype=np.int64)}
+        for column in self.KLINE_COLUMNS[1:]:
+            if column in df:
+                arrays[column] = df[column].to_numpy(dtype=np.float64)
+        return arrays
+
+
+    def append_arrays_to_csv(self, columns: Dict[str, np.ndarray], filename: str) -> str:
+        """
+        Append equal-length column arrays to a CSV file, writing the header only
+        when the file is new.
+
+        Args:
+            columns (dict[str, np.ndarray]): Column name -> values, in column order.
+            filename (str): The CSV filename (without path).
+
+        Returns:
+            str: Full path of the CSV file.
+        """
+        filepath = os.path.join(self.base_dir, filename)
+        exists = os.path.exists(filepath) and os.path.getsize(filepath) > 0
+        pd.DataFrame(columns).to_csv(filepath, mode="a", header=not exists, index=False)
+        return filepath
+
 
     def is_not_zero(self, value):
         """Check if a value is numeric and not zero."""
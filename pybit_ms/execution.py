@@ -0,0 +1,475 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from decimal import Decimal, ROUND_DOWN
+
+from pybit_ms.trade import Trade_client
+from pybit_ms.market import Market_client
+from pybit_ms._exceptions import FailedRequestError, InvalidRequestError
+
+
+_parent_ids = itertools.count(1)
+
+
+class ParentOrder:
+    """
+    A large order worked through child orders over time.
+
+    Subclasses decide when the next child is due and how big it is
+    (`first_due` / `on_due`); the scheduler places children, feeds fills back
+    through `on_fill` and keeps the parent alive until it is complete.
+
+    Child orders are tagged with orderLinkId "<parent id>-<n>", so fills can be
+    matched from the executions endpoint.
+    """
+
+    def __init__(self, category: str, symbol: str, side: str, qty, order_type: str = "Market",
+                 price=None, qty_step=None, tag: str = None):
+        self.id = tag or f"algo{next(_parent_ids)}x{int(time.time()) % 100000}"
+        self.category = category
+        self.symbol = symbol
+        self.side = side
+        self.order_type = order_type
+        self.price = price
+        self.qty = Decimal(str(qty))
+        self.qty_step = Decimal(str(qty_step)) if qty_step else None
+
+        self.sent_qty = Decimal(0)
+        self.filled_qty = Decimal(0)
+        self.filled_notional = Decimal(0)
+        self.fees = Decimal(0)
+        self.children = {}          # orderLinkId -> {"qty", "filled", "orderId", "sent_at"}
+        self.errors = []
+        self.arrival_price = None
+        self.started_at = None
+        self.finished_at = None
+        self.status = "pending"     # pending -> working -> sent -> done | cancelled | failed
+
+    # ---------------------------------------------------------------- sizing
+
+    @property
+    def remaining_qty(self) -> Decimal:
+        return self.qty - self.sent_qty
+
+    def _round(self, qty: Decimal) -> Decimal:
+        if self.qty_step:
+            qty = (qty / self.qty_step).to_integral_value(rounding=ROUND_DOWN) * self.qty_step
+        return min(qty, self.remaining_qty)
+
+    # -------------------------------------------------------------- schedule
+
+    def first_due(self, now: float) -> float:
+        """Timestamp of the first child."""
+        return now
+
+    def on_due(self, now: float, scheduler: "ExecutionScheduler") -> float | None:
+        """Place whatever is due and return when to be called next (None: nothing more to send)."""
+        raise NotImplementedError
+
+    # ----------------------------------------------------------------- fills
+
+    def on_fill(self, link_id: str, qty: Decimal, price: Decimal, fee: Decimal):
+        child = self.children.get(link_id)
+        if child is not None:
+            child["filled"] += qty
+        self.filled_qty += qty
+        self.filled_notional += qty * price
+        self.fees += fee
+
+    @property
+    def avg_price(self) -> Decimal | None:
+        return self.filled_notional / self.filled_qty if self.filled_qty else None
+
+    @property
+    def slippage_bps(self) -> float | None:
+        """Average fill price vs arrival price, in basis points; positive means worse than arrival."""
+        if self.avg_price is None or not self.arrival_price:
+            return None
+        sign = 1 if self.side == "Buy" else -1
+        return float(sign * (self.avg_price - self.arrival_price) / self.arrival_price * 10000)
+
+    def report(self) -> dict:
+        """Summary of the parent's progress."""
+        return {
+            "id": self.id,
+            "algo": type(self).__name__,
+            "symbol": self.symbol,
+            "side": self.side,
+            "status": self.status,
+            "qty": str(self.qty),
+            "sent_qty": str(self.sent_qty),
+            "filled_qty": str(self.filled_qty),
+            "avg_price": None if self.avg_price is None else float(self.avg_price),
+            "arrival_price": None if self.arrival_price is None else float(self.arrival_price),
+            "slippage_bps": self.slippage_bps,
+            "fees": float(self.fees),
+            "children": len(self.children),
+            "errors": len(self.errors),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class TWAPOrder(ParentOrder):
+    """Split `qty` into `slices` equal children spread evenly over `duration` seconds."""
+
+    def __init__(self, category, symbol, side, qty, duration: float, slices: int, **kwargs):
+        super().__init__(category, symbol, side, qty, **kwargs)
+        self.duration = float(duration)
+        self.weights = [1.0 / slices] * slices
+        self._slice = 0
+        self._start = None
+
+    def first_due(self, now):
+        self._start = now
+        return now
+
+    def on_due(self, now, scheduler):
+        n = len(self.weights)
+        if self._slice >= n:
+            return None
+        self._slice += 1
+        if self._slice == n:
+            qty = self.remaining_qty
+        else:
+            # Cumulative target, so missed or rounded-off quantity is carried forward
+            target = self.qty * Decimal(str(sum(self.weights[:self._slice])))
+            qty = self._round(target - self.sent_qty)
+        if qty > 0:
+            scheduler._place_child(self, qty)
+        if self._slice >= n:
+            return None
+        return self._start + self.duration * self._slice / n
+
+
+class VWAPOrder(TWAPOrder):
+    """
+    Like TWAP, but slice sizes follow a volume profile (one weight per slice).
+    Use `from_kline_profile` to derive the profile from historical klines.
+    """
+
+    def __init__(self, category, symbol, side, qty, duration: float, profile: list, **kwargs):
+        super().__init__(category, symbol, side, qty, duration, slices=len(profile), **kwargs)
+        total = float(sum(profile)) or 1.0
+        self.weights = [w / total for w in profile] if sum(profile) else [1.0 / len(profile)] * len(profile)
+
+    @classmethod
+    def from_kline_profile(cls, market_client: Market_client, category: str, symbol: str, side: str, qty,
+                           duration: float, interval: int = 5, lookback_bars: int = 1000,
+                           start: float = None, **kwargs) -> "VWAPOrder":
+        """
+        Build a VWAP parent whose slices follow the average volume per time-of-day bucket.
+
+        Args:
+            market_client (Market_client): Used for `get_kline`.
+            category, symbol, side, qty: As for any parent order. `symbol` must be a
+                pair name such as "BTCUSDT"; it is split into coin1/coin2 for `get_kline`.
+            duration (float): Execution window in seconds (one slice per kline interval).
+            interval (int): Kline interval in minutes. Defaults to 5.
+            lookback_bars (int): Number of historical bars used for the profile (max 1000).
+            start (float, optional): Window start (epoch seconds). Defaults to now.
+        """
+        quote = next((q for q in ("USDT", "USDC", "USD", "BTC", "ETH") if symbol.endswith(q) and symbol != q), "")
+        response = market_client.get_kline(
+            category, symbol[: len(symbol) - len(quote)], quote, str(interval),
+            raw=True, limit=min(lookback_bars, 1000),
+        )
+        rows = response.get("result", {}).get("list", [])
+
+        bucket_ms = interval * 60_000
+        buckets_per_day = 86_400_000 // bucket_ms
+        totals = [0.0] * buckets_per_day
+        counts = [0] * buckets_per_day
+        for row in rows:
+            bucket = (int(row[0]) // bucket_ms) % buckets_per_day
+            totals[bucket] += float(row[5])
+            counts[bucket] += 1
+        average = [t / c if c else 0.0 for t, c in zip(totals, counts)]
+
+        start = time.time() if start is None else start
+        slices = max(1, int(round(duration * 1000 / bucket_ms)))
+        first = (int(start * 1000) // bucket_ms) % buckets_per_day
+        profile = [average[(first + i) % buckets_per_day] for i in range(slices)]
+        return cls(category, symbol, side, qty, duration, profile, **kwargs)
+
+
+class IcebergOrder(ParentOrder):
+    """
+    Show only `display_qty` at a time as a resting limit order; a new child is
+    placed as soon as the previous one is filled, until `qty` is done.
+
+    The working child's status is checked every `status_interval` seconds: if
+    the exchange cancelled, rejected or deactivated it, its unfilled qty is
+    released and a new child is placed. After `max_errors` failed placements
+    or closed children in a row, the parent stops with status "failed".
+    """
+
+    CLOSED_STATUSES = ("Cancelled", "Rejected", "Deactivated", "PartiallyFilledCanceled")
+
+    def __init__(self, category, symbol, side, qty, display_qty, price, check_interval: float = 1.0,
+                 status_interval: float = 10.0, max_errors: int = 5, **kwargs):
+        kwargs.setdefault("order_type", "Limit")
+        super().__init__(category, symbol, side, qty, price=price, **kwargs)
+        self.display_qty = Decimal(str(display_qty))
+        self.check_interval = check_interval
+        self.status_interval = status_interval
+        self.max_errors = max_errors
+        self._working = None
+        self._failures = 0
+
+    def _fail(self, now):
+        self.status = "failed"
+        self.finished_at = now
+        return None
+
+    def on_due(self, now, scheduler):
+        if self._working is not None:
+            child = self.children[self._working]
+            if child["filled"] < child["qty"]:
+                if now - child.get("checked_at", child["sent_at"]) < self.status_interval:
+                    return now + self.check_interval
+                child["checked_at"] = now
+                record = scheduler._child_order(self, self._working)
+                if record is None or record.get("orderStatus") not in self.CLOSED_STATUSES:
+                    return now + self.check_interval
+                # Closed on the exchange: give back what it will never fill
+                executed = Decimal(record.get("cumExecQty") or "0")
+                self.sent_qty -= child["qty"] - executed
+                child["qty"] = executed
+                self.errors.append(f"Child {self._working} {record.get('orderStatus')}")
+                self._failures += 1
+            else:
+                self._failures = 0
+            self._working = None
+        if self._failures >= self.max_errors:
+            return self._fail(now)
+        if self.remaining_qty <= 0:
+            return None
+        qty = self._round(min(self.display_qty, self.remaining_qty))
+        if qty <= 0:
+            qty = self.remaining_qty
+        self._working = scheduler._place_child(self, qty)
+        if self._working is None:
+            self._failures += 1
+            if self._failures >= self.max_errors:
+                return self._fail(now)
+        return now + self.check_interval
+
+
+class ExecutionScheduler:
+    """
+    Runs many parent orders concurrently on a single background thread.
+
+    Children are placed with `Trade_client.place_order`. Fills are collected by
+    polling `get_executions` once per (category, symbol) every `poll_interval`
+    seconds, whatever the number of parents on that symbol. Each poll pages
+    through everything since the newest execTime already seen on that symbol
+    (up to `max_poll_pages` pages of 100).
+
+    Example:
+        scheduler = ExecutionScheduler(api.trade, api.market)
+        scheduler.start()
+        twap = scheduler.submit(TWAPOrder("linear", "BTCUSDT", "Buy", "0.5", duration=600, slices=20, qty_step="0.001"))
+        ...
+        twap.report()
+    """
+
+    def __init__(self, trade_client: Trade_client, market_client: Market_client = None,
+                 poll_interval: float = 2.0, fill_grace: float = 60.0, max_poll_pages: int = 20):
+        self._trade = trade_client
+        self._market = market_client
+        self.poll_interval = poll_interval
+        self.fill_grace = fill_grace
+        self.max_poll_pages = max_poll_pages
+        self.parents = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._fills_since = {}      # (category, symbol) -> execTime (ms) polled from
+        self._seen_exec_ids = {}    # (category, symbol) -> {execId: execTime} at or after _fills_since
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_poll = 0.0
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------ api
+
+    def submit(self, parent: ParentOrder) -> ParentOrder:
+        """Queue a parent order; its first child goes out on the next scheduler pass."""
+        if self._market is not None and parent.arrival_price is None:
+            try:
+                last = self._market.get_tickers(parent.category, parent.symbol, only_ticker=True)
+                if last:
+                    parent.arrival_price = Decimal(str(last))
+            except (InvalidRequestError, FailedRequestError) as e:
+                self.logger.error(f"Could not fetch arrival price for {parent.symbol}: {e}")
+        now = time.time()
+        with self._lock:
+            parent.status = "working"
+            parent.started_at = now
+            self.parents[parent.id] = parent
+            heapq.heappush(self._heap, (parent.first_due(now), next(self._seq), parent))
+        self._wake.set()
+        return parent
+
+    def cancel(self, parent_id: str, cancel_children: bool = True):
+        """Stop scheduling a parent and optionally cancel its unfilled children."""
+        parent = self.parents.get(parent_id)
+        if parent is None or parent.status in ("done", "cancelled", "failed"):
+            return
+        parent.status = "cancelled"
+        parent.finished_at = time.time()
+        if cancel_children:
+            for link_id, child in parent.children.items():
+                if child["filled"] < child["qty"] and parent.order_type.lower() != "market":
+                    try:
+                        self._trade.cancel_order(parent.category, parent.symbol, order_link_id=link_id, raw=True)
+                    except (InvalidRequestError, FailedRequestError) as e:
+                        parent.errors.append(str(e))
+
+    def reports(self) -> list[dict]:
+        """Progress reports of every known parent."""
+        return [p.report() for p in list(self.parents.values())]
+
+    # ----------------------------------------------------------- internals
+
+    def _place_child(self, parent: ParentOrder, qty: Decimal) -> str | None:
+        link_id = f"{parent.id}-{len(parent.children) + 1}"
+        try:
+            response = self._trade.place_order(
+                parent.category, parent.symbol, parent.side, parent.order_type, str(qty),
+                price=parent.price, order_link_id=link_id, raw=True,
+                market_unit="baseCoin",            # child slices are sized in the base coin
+            )
+        except (InvalidRequestError, FailedRequestError) as e:
+            parent.errors.append(str(e))
+            self.logger.error(f"Child order {link_id} failed: {e}")
+            return None
+        parent.children[link_id] = {
+            "qty": qty,
+            "filled": Decimal(0),
+            "orderId": response.get("result", {}).get("orderId"),
+            "sent_at": time.time(),
+        }
+        parent.sent_qty += qty
+        return link_id
+
+    def _child_order(self, parent: ParentOrder, link_id: str) -> dict | None:
+        """The child's order record from the order history, or None if unknown or the query failed."""
+        try:
+            records = self._trade.get_order_history(
+                parent.category, symbol=parent.symbol, order_link_id=link_id, max_pages=1, raw=True,
+            )
+        except (InvalidRequestError, FailedRequestError) as e:
+            self.logger.error(f"Status query for child order {link_id} failed: {e}")
+            return None
+        return records[0] if records else None
+
+    def _poll_fills(self):
+        active = [p for p in self.parents.values() if p.status in ("working", "sent")]
+        scopes = {}
+        for p in active:
+            scope = (p.category, p.symbol)
+            scopes[scope] = min(scopes.get(scope, p.started_at), p.started_at)
+        for scope in set(self._fills_since) - set(scopes):
+            del self._fills_since[scope]
+            self._seen_exec_ids.pop(scope, None)
+
+        for (category, symbol), started_at in scopes.items():
+            since = self._fills_since.get((category, symbol), int(started_at * 1000) - 1000)
+            seen = self._seen_exec_ids.setdefault((category, symbol), {})
+            try:
+                executions = self._trade.get_executions(
+                    category, symbol=symbol, startTime=since, limit=100,
+                    max_pages=self.max_poll_pages, raw=True,
+                )
+            except (InvalidRequestError, FailedRequestError) as e:
+                self.logger.error(f"Fill polling failed for {symbol}: {e}")
+                continue
+            newest = since
+            for execution in executions:
+                exec_id = execution.get("execId")
+                exec_time = int(execution.get("execTime") or 0)
+                newest = max(newest, exec_time)
+                link_id = execution.get("orderLinkId", "")
+                if exec_time < since or exec_id in seen or "-" not in link_id:
+                    continue
+                parent = self.parents.get(link_id.rsplit("-", 1)[0])
+                if parent is None:
+                    continue
+                seen[exec_id] = exec_time
+                parent.on_fill(
+                    link_id,
+                    Decimal(execution.get("execQty", "0") or "0"),
+                    Decimal(execution.get("execPrice", "0") or "0"),
+                    Decimal(execution.get("execFee", "0") or "0"),
+                )
+            if len(executions) >= 100 * self.max_poll_pages:
+                self.logger.warning(f"Fill polling for {symbol} hit max_poll_pages; older fills may be missed.")
+            # The next poll starts at the newest execTime (inclusive), so only ids from then on can repeat
+            self._fills_since[(category, symbol)] = newest
+            for exec_id in [i for i, t in seen.items() if t < newest]:
+                del seen[exec_id]
+
+        now = time.time()
+        for parent in active:
+            if parent.status != "sent":
+                continue
+            if parent.filled_qty >= parent.sent_qty or now - parent.finished_at > self.fill_grace:
+                parent.status = "done"
+
+    def run_pending(self, now: float = None):
+        """Process everything due at `now` (one scheduler pass). Used by the background thread."""
+        now = time.time() if now is None else now
+        while True:
+            with self._lock:
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                _, _, parent = heapq.heappop(self._heap)
+            if parent.status != "working":
+                continue
+            next_due = parent.on_due(now, self)
+            if next_due is None:
+                if parent.status != "working":
+                    continue
+                parent.status = "sent"
+                parent.finished_at = now
+            else:
+                with self._lock:
+                    heapq.heappush(self._heap, (next_due, next(self._seq), parent))
+
+        if now >= self._next_poll:
+            self._poll_fills()
+            self._next_poll = now + self.poll_interval
+
+    def start(self):
+        """Run the scheduler on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.run_pending()
+                except Exception:
+                    self.logger.exception("Execution scheduler pass failed.")
+                with self._lock:
+                    next_due = self._heap[0][0] if self._heap else float("inf")
+                timeout = max(0.0, min(next_due, self._next_poll) - time.time())
+                self._wake.wait(timeout)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=run, name="ExecutionScheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the scheduler thread (parents keep their state)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,248 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from pybit_ms.account import Account_client
+
+
+# Bybit caps transaction-log queries at a 7-day startTime..endTime range.
+WINDOW_MS = 7 * 24 * 60 * 60 * 1000
+
+TRANSACTION_LOG_FIELDS = (
+    "id", "symbol", "category", "side", "transactionTime", "type", "qty", "size", "currency",
+    "tradePrice", "funding", "fee", "cashFlow", "change", "cashBalance", "feeRate", "bonusChange",
+    "tradeId", "orderId", "orderLinkId",
+)
+
+
+def _ms(value) -> int:
+    if isinstance(value, int):
+        return value
+    return int(pd.Timestamp(value).timestamp() * 1000)
+
+
+class TransactionLogExporter:
+    """
+    Stream the (contract) transaction log of a time range into one gzip CSV file.
+
+    The range is cut into 7-day windows, fetched in parallel by `workers`
+    threads. Each window streams page by page (see `iter_transaction_log`)
+    into its own part file, one gzip member per page, so memory stays at
+    one page per worker whatever the size of the export. When every window
+    is done, the parts are concatenated (gzip members can be joined as they
+    are) in time order into `path`: windows oldest first, rows inside a
+    window newest first, as Bybit returns them.
+
+    Progress is kept in "<path>.state.json": the cursor and byte offset of
+    each window after every page. A later `run()` with the same arguments
+    skips finished windows and resumes the others from their last cursor,
+    truncating any page written after the last saved state.
+
+    Example:
+        exporter = TransactionLogExporter(api.account, "data/tx_2023.csv.gz",
+                                          start="2023-01-01", end="2024-01-01", workers=4,
+                                          on_progress=print)
+        exporter.run()
+    """
+
+    def __init__(
+        self,
+        account_client: Account_client,
+        path: str,
+        start,
+        end=None,
+        contract: bool = False,
+        workers: int = 4,
+        fields=TRANSACTION_LOG_FIELDS,
+        on_progress=None,
+        progress_interval: float = 5.0,
+        **query,
+    ):
+        """
+        Args:
+            account_client (Account_client): Source of the logs.
+            path (str): Output file (gzip CSV).
+            start (int | str | datetime): Start of the range (ms or anything pd.Timestamp parses, UTC).
+            end (int | str | datetime, optional): End of the range. Defaults to now.
+            contract (bool): Export the Classic-account contract transaction log instead.
+            workers (int): Windows fetched in parallel.
+            fields (iterable): CSV columns (other record fields are dropped).
+            on_progress (callable, optional): Called with `progress()` after every page,
+                at most every `progress_interval` seconds, and at the end.
+            progress_interval (float): Seconds between progress reports.
+            **query: Extra query parameters, e.g. accountType, category or currency.
+        """
+        self._account = account_client
+        self.path = path
+        self.start = _ms(start)
+        self.end = _ms(end) if end is not None else int(time.time() * 1000)
+        self._end_given = end is not None
+        self.contract = contract
+        self.workers = workers
+        self.fields = tuple(fields)
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.query = query
+        self.state_path = f"{path}.state.json"
+        self.parts_dir = f"{path}.parts"
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._state = None
+        self._started = None
+        self._last_report = 0.0
+        self._session = {"rows": 0, "pages": 0, "bytes": 0}
+
+    # ----------------------------------------------------------------- state
+
+    def windows(self) -> list:
+        """(start, end) of every 7-day window of the range, oldest first."""
+        out, start = [], self.start
+        while start <= self.end:
+            out.append((start, min(self.end, start + WINDOW_MS - 1)))
+            start += WINDOW_MS
+        return out
+
+    def _load_state(self) -> dict:
+        # A defaulted end ("now") is not part of the signature: a resumed run keeps the first run's end
+        signature = {"start": self.start, "end": self.end if self._end_given else None,
+                     "contract": self.contract, "query": self.query, "fields": list(self.fields)}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("signature") == signature:
+                self.end = state["end"]
+                return state
+            raise ValueError(f"{self.state_path} belongs to a different export; remove it to start over.")
+        return {
+            "signature": signature,
+            "end": self.end,
+            "windows": {f"{s}-{e}": {"cursor": None, "offset": 0, "rows": 0, "done": False}
+                        for s, e in self.windows()},
+        }
+
+    def _save_state(self):
+        # Called with the lock held; write-then-rename so a crash never leaves half a file
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+        os.replace(tmp, self.state_path)
+
+    # --------------------------------------------------------------- export
+
+    def _encode(self, records: list) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.fields, extrasaction="ignore")
+        writer.writerows(records)
+        return gzip.compress(buffer.getvalue().encode("utf-8"), compresslevel=6)
+
+    def _export_window(self, key: str):
+        window = self._state["windows"][key]
+        if window["done"]:
+            return
+        start, end = (int(x) for x in key.split("-"))
+        part = os.path.join(self.parts_dir, f"{key}.csv.gz")
+
+        with open(part, "ab") as f:
+            # Drop anything written after the last saved page (interrupted run)
+            f.truncate(window["offset"])
+            f.seek(window["offset"])
+            iterate = self._account.iter_contract_transaction_log if self.contract \
+                else self._account.iter_transaction_log
+            pages = iterate(cursor=window["cursor"], startTime=start, endTime=end, limit=50, **self.query)
+            for records, next_cursor in pages:
+                if records:
+                    data = self._encode(records)
+                    f.write(data)
+                    f.flush()
+                else:
+                    data = b""
+                with self._lock:
+                    window["offset"] = f.tell()
+                    window["rows"] += len(records)
+                    window["cursor"] = next_cursor
+                    window["done"] = next_cursor is None
+                    self._session["rows"] += len(records)
+                    self._session["pages"] += 1
+                    self._session["bytes"] += len(data)
+                    self._save_state()
+                self._report()
+            with self._lock:
+                window["done"] = True
+                self._save_state()
+
+    def progress(self) -> dict:
+        """Windows done, rows/pages/bytes written, elapsed seconds and throughput of this run."""
+        with self._lock:
+            windows = self._state["windows"].values() if self._state else ()
+            elapsed = time.monotonic() - self._started if self._started else 0.0
+            return {
+                "windows_done": sum(w["done"] for w in windows),
+                "windows": len(windows),
+                "rows": sum(w["rows"] for w in windows),
+                "session_rows": self._session["rows"],
+                "pages": self._session["pages"],
+                "bytes": self._session["bytes"],
+                "elapsed": elapsed,
+                "rows_per_second": self._session["rows"] / elapsed if elapsed > 0 else 0.0,
+            }
+
+    def _report(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+        progress = self.progress()
+        self.logger.info(
+            f"Transaction log export: {progress['windows_done']}/{progress['windows']} windows, "
+            f"{progress['rows']} rows, {progress['rows_per_second']:.0f} rows/s."
+        )
+        if self.on_progress is not None:
+            self.on_progress(progress)
+
+    def _assemble(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as out:
+            out.write(gzip.compress((",".join(self.fields) + "\r\n").encode("utf-8")))
+            for key in self._state["windows"]:
+                part = os.path.join(self.parts_dir, f"{key}.csv.gz")
+                if os.path.exists(part):
+                    with open(part, "rb") as f:
+                        while chunk := f.read(1 << 20):
+                            out.write(chunk)
+        os.replace(tmp, self.path)
+
+    def run(self) -> dict:
+        """
+        Export (or resume) the range.
+
+        Returns:
+            dict: Final progress (see `progress`), plus the output "path".
+        """
+        os.makedirs(self.parts_dir, exist_ok=True)
+        self._state = self._load_state()
+        self._started = time.monotonic()
+        todo = [key for key, window in self._state["windows"].items() if not window["done"]]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(todo) or 1))) as executor:
+            for future in [executor.submit(self._export_window, key) for key in todo]:
+                future.result()
+
+        self._assemble()
+        for key in self._state["windows"]:
+            part = os.path.join(self.parts_dir, f"{key}.csv.gz")
+            if os.path.exists(part):
+                os.remove(part)
+        os.rmdir(self.parts_dir)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        self._report(force=True)
+        return {**self.progress(), "path": self.path}
@@ -0,0 +1,263 @@
+import threading
+import time
+from datetime import datetime as dt, timezone
+from decimal import Decimal, ROUND_DOWN, ROUND_UP, ROUND_HALF_UP, InvalidOperation
+
+from pybit_ms._http_manager import HTTPManager
+from pybit_ms._exceptions import InvalidRequestError
+from pybit_ms.market import Market
+
+
+# Bybit's "params error" code, used so callers can handle local rejections like remote ones.
+PARAMS_ERROR_CODE = 10001
+
+
+def _dec(value):
+    """Parse an instrument-info field into a Decimal (None if missing or empty)."""
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def _fmt(value: Decimal) -> str:
+    """Render a Decimal without exponent or trailing zeros, as Bybit expects."""
+    text = format(value, "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text
+
+
+class InstrumentRules:
+    """
+    Lot-size and price filters of one instrument, parsed once from `get_instruments_info`.
+
+    Attributes (str): category, symbol, status, base_coin, settle_coin (quoteCoin for spot).
+
+    Attributes (Decimal or None):
+        qty_step: Quantity increment (qtyStep, or basePrecision for spot).
+        min_qty / max_qty: Order quantity bounds.
+        max_market_qty: Quantity bound for market orders (derivatives).
+        tick_size: Price increment.
+        min_price / max_price: Price bounds.
+        min_notional: Minimum order value (minNotionalValue, or minOrderAmt for spot).
+        quote_step: Quote-amount increment for spot orders sized in quoteCoin.
+    """
+
+    __slots__ = (
+        "category", "symbol", "status", "base_coin", "settle_coin", "qty_step", "min_qty", "max_qty", "max_market_qty",
+        "tick_size", "min_price", "max_price", "min_notional", "quote_step",
+    )
+
+    def __init__(self, category: str, info: dict):
+        lot = info.get("lotSizeFilter", {}) or {}
+        price = info.get("priceFilter", {}) or {}
+
+        self.category = category
+        self.symbol = info.get("symbol", "")
+        self.status = info.get("status", "")
+        self.base_coin = info.get("baseCoin", "")
+        self.settle_coin = info.get("settleCoin") or info.get("quoteCoin", "")
+        self.qty_step = _dec(lot.get("qtyStep")) or _dec(lot.get("basePrecision"))
+        self.min_qty = _dec(lot.get("minOrderQty"))
+        self.max_qty = _dec(lot.get("maxOrderQty"))
+        self.max_market_qty = _dec(lot.get("maxMktOrderQty"))
+        self.tick_size = _dec(price.get("tickSize"))
+        self.min_price = _dec(price.get("minPrice"))
+        self.max_price = _dec(price.get("maxPrice"))
+        self.min_notional = _dec(lot.get("minNotionalValue")) or _dec(lot.get("minOrderAmt"))
+        self.quote_step = _dec(lot.get("quotePrecision"))
+
+    def __repr__(self):
+        return (
+            f"InstrumentRules({self.category}:{self.symbol}, qty_step={self.qty_step}, "
+            f"tick_size={self.tick_size}, min_qty={self.min_qty}, min_notional={self.min_notional})"
+        )
+
+    @staticmethod
+    def _round(value: Decimal, step: Decimal, rounding) -> Decimal:
+        if not step:
+            return value
+        return (value / step).quantize(Decimal(1), rounding=rounding) * step
+
+    def check(
+        self,
+        qty=None,
+        price=None,
+        side: str = None,
+        order_type: str = "Limit",
+        market_unit: str = "baseCoin",
+        round_values: bool = False,
+    ) -> dict:
+        """
+        Validate (and optionally round) an order's quantity and price.
+
+        Args:
+            qty (str | float, optional): Order quantity.
+            price (str | float, optional): Limit price. Ignored for market orders.
+            side (str, optional): "Buy" or "Sell". When rounding, buy prices are
+                rounded down and sell prices up to the tick, so the price is never worse.
+                Without a side, prices are rounded to the nearest tick.
+            order_type (str): "Limit" or "Market".
+            market_unit (str): "baseCoin" or "quoteCoin" (spot market orders).
+            round_values (bool): If True, snap qty down to the step and price to the tick
+                instead of rejecting values off the grid.
+
+        Returns:
+            dict: {"qty": str | None, "price": str | None} ready to be sent.
+
+        Raises:
+            InvalidRequestError: If a rule is violated (status_code 10001, resp_headers None).
+        """
+        is_market = str(order_type).lower() == "market"
+        quote_sized = is_market and market_unit == "quoteCoin"
+
+        d_qty = _dec(qty)
+        d_price = None if is_market else _dec(price)
+        if qty not in (None, "") and d_qty is None:
+            self._reject(f"qty {qty!r} is not a number", qty, price)
+        if not is_market and price not in (None, "") and d_price is None:
+            self._reject(f"price {price!r} is not a number", qty, price)
+
+        if d_qty is not None:
+            step = self.quote_step if quote_sized else self.qty_step
+            if step:
+                snapped = self._round(d_qty, step, ROUND_DOWN)
+                if snapped != d_qty:
+                    if not round_values:
+                        self._reject(f"qty {qty} is not a multiple of the step {_fmt(step)}", qty, price)
+                    d_qty = snapped
+
+            if d_qty <= 0:
+                self._reject(f"qty {qty} rounds to zero", qty, price)
+            if quote_sized:
+                if self.min_notional and d_qty < self.min_notional:
+                    self._reject(f"order value {_fmt(d_qty)} is below the minimum {_fmt(self.min_notional)}", qty, price)
+            else:
+                if self.min_qty and d_qty < self.min_qty:
+                    self._reject(f"qty {_fmt(d_qty)} is below the minimum {_fmt(self.min_qty)}", qty, price)
+                max_qty = self.max_market_qty if is_market and self.max_market_qty else self.max_qty
+                if max_qty and d_qty > max_qty:
+                    self._reject(f"qty {_fmt(d_qty)} is above the maximum {_fmt(max_qty)}", qty, price)
+
+        if d_price is not None:
+            if self.tick_size:
+                if side == "Buy":
+                    rounding = ROUND_DOWN
+                elif side == "Sell":
+                    rounding = ROUND_UP
+                else:
+                    rounding = ROUND_HALF_UP
+                snapped = self._round(d_price, self.tick_size, rounding)
+                if snapped != d_price:
+                    if not round_values:
+                        self._reject(f"price {price} is not a multiple of the tick size {_fmt(self.tick_size)}", qty, price)
+                    d_price = snapped
+
+            if self.min_price and d_price < self.min_price:
+                self._reject(f"price {_fmt(d_price)} is below the minimum {_fmt(self.min_price)}", qty, price)
+            if self.max_price and d_price > self.max_price:
+                self._reject(f"price {_fmt(d_price)} is above the maximum {_fmt(self.max_price)}", qty, price)
+
+            if d_qty is not None and self.min_notional and d_qty * d_price < self.min_notional:
+                self._reject(
+                    f"order value {_fmt(d_qty * d_price)} is below the minimum {_fmt(self.min_notional)}", qty, price
+                )
+
+        return {
+            "qty": _fmt(d_qty) if d_qty is not None else qty,
+            "price": _fmt(d_price) if d_price is not None else price,
+        }
+
+    def _reject(self, message, qty, price):
+        raise InvalidRequestError(
+            request=f"{self.category} {self.symbol}: qty={qty}, price={price}",
+            message=f"Pre-trade check failed: {message}",
+            status_code=PARAMS_ERROR_CODE,
+            time=dt.now(timezone.utc).strftime("%H:%M:%S"),
+            resp_headers=None,
+        )
+
+
+class InstrumentCache:
+    """
+    Thread-safe cache of instrument rules, indexed by (category, symbol).
+
+    A whole category is fetched in one paginated `instruments-info` call the
+    first time any of its symbols is needed, then served from memory until
+    `max_age` seconds have passed. Only one thread loads a category at a time;
+    the others wait for its result. A symbol missing from a fresh load is
+    rejected without another request until the next refresh.
+    """
+
+    def __init__(self, http_manager: HTTPManager, max_age: float = 3600.0):
+        self._http_manager = http_manager
+        self.endpoint = http_manager.endpoint
+        self.max_age = max_age
+        self._rules = {}
+        self._loaded_at = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def load(self, category: str) -> int:
+        """
+        (Re)load every instrument of a category, replacing its previous entries
+        (delisted symbols are dropped).
+
+        Returns:
+            int: Number of instruments indexed.
+        """
+        records = self._http_manager._submit_paginated_request(
+            method="GET",
+            path=f"{self.endpoint}{Market.GET_INSTRUMENTS_INFO}",
+            query={"category": category, "limit": 1000},
+        )
+        rules = {(category, info["symbol"]): InstrumentRules(category, info) for info in records if "symbol" in info}
+        with self._lock:
+            # Swap in a new dict, so lock-free readers see either the old or the new category
+            merged = {key: value for key, value in self._rules.items() if key[0] != category}
+            merged.update(rules)
+            self._rules = merged
+            self._loaded_at[category] = time.monotonic()
+        return len(rules)
+
+    def _stale(self, category: str) -> bool:
+        loaded_at = self._loaded_at.get(category)
+        return loaded_at is None or time.monotonic() - loaded_at > self.max_age
+
+    def get(self, category: str, symbol: str) -> InstrumentRules:
+        """
+        Return the rules of one instrument, loading the category if it was never loaded or is stale.
+
+        Raises:
+            InvalidRequestError: If the symbol does not exist in that category.
+        """
+        if self._stale(category):
+            with self._lock:
+                load_lock = self._load_locks.setdefault(category, threading.Lock())
+            with load_lock:
+                # Another thread may have loaded the category while this one waited
+                if self._stale(category):
+                    self.load(category)
+        rules = self._rules.get((category, symbol))
+        if rules is None:
+            raise InvalidRequestError(
+                request=f"{category} {symbol}",
+                message=f"Pre-trade check failed: unknown symbol {symbol} for category {category}",
+                status_code=PARAMS_ERROR_CODE,
+                time=dt.now(timezone.utc).strftime("%H:%M:%S"),
+                resp_headers=None,
+            )
+        return rules
+
+    def invalidate(self, category: str = None):
+        """Forget the cached rules of one category (or all of them)."""
+        with self._lock:
+            if category is None:
+                self._rules.clear()
+                self._loaded_at.clear()
+            else:
+                self._rules = {k: v for k, v in self._rules.items() if k[0] != category}
+                self._loaded_at.pop(category, None)
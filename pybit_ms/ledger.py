@@ -0,0 +1,371 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from pybit_ms.trade import Trade_client
+from pybit_ms.data_layer.data_handler import DataHandler
+
+
+# Bybit caps execution / order-history queries at a 7-day startTime..endTime range.
+WINDOW_MS = 7 * 24 * 60 * 60 * 1000
+
+# Order statuses after which an order can no longer change.
+FINAL_STATUSES = ("Filled", "Cancelled", "Rejected", "Deactivated", "PartiallyFilledCanceled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execId      TEXT PRIMARY KEY,
+    orderId     TEXT,
+    orderLinkId TEXT,
+    category    TEXT,
+    symbol      TEXT,
+    side        TEXT,
+    execType    TEXT,
+    execPrice   REAL,
+    execQty     REAL,
+    execValue   REAL,
+    execFee     REAL,
+    feeRate     REAL,
+    isMaker     INTEGER,
+    execTime    INTEGER,
+    raw         TEXT
+);
+CREATE INDEX IF NOT EXISTS executions_order ON executions (orderId);
+CREATE INDEX IF NOT EXISTS executions_symbol_time ON executions (symbol, execTime);
+CREATE INDEX IF NOT EXISTS executions_time ON executions (execTime);
+
+CREATE TABLE IF NOT EXISTS orders (
+    orderId     TEXT PRIMARY KEY,
+    orderLinkId TEXT,
+    category    TEXT,
+    symbol      TEXT,
+    side        TEXT,
+    orderType   TEXT,
+    orderStatus TEXT,
+    price       REAL,
+    qty         REAL,
+    cumExecQty  REAL,
+    cumExecFee  REAL,
+    avgPrice    REAL,
+    createdTime INTEGER,
+    updatedTime INTEGER,
+    raw         TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_link ON orders (orderLinkId);
+CREATE INDEX IF NOT EXISTS orders_symbol_time ON orders (symbol, createdTime);
+CREATE INDEX IF NOT EXISTS orders_status ON orders (orderStatus);
+
+CREATE TABLE IF NOT EXISTS watermarks (
+    kind     TEXT,
+    scope    TEXT,
+    value    INTEGER,
+    PRIMARY KEY (kind, scope)
+);
+"""
+
+_EXEC_COLUMNS = ("execId", "orderId", "orderLinkId", "category", "symbol", "side", "execType", "execPrice",
+                 "execQty", "execValue", "execFee", "feeRate", "isMaker", "execTime")
+_ORDER_COLUMNS = ("orderId", "orderLinkId", "category", "symbol", "side", "orderType", "orderStatus", "price",
+                  "qty", "cumExecQty", "cumExecFee", "avgPrice", "createdTime", "updatedTime")
+_REAL = {"execPrice", "execQty", "execValue", "execFee", "feeRate", "price", "qty", "cumExecQty", "cumExecFee",
+         "avgPrice"}
+_INT = {"execTime", "createdTime", "updatedTime"}
+
+
+def _value(column, record):
+    value = record.get(column)
+    if column in _REAL:
+        return float(value) if value not in (None, "") else None
+    if column in _INT:
+        return int(value) if value not in (None, "") else None
+    if column == "isMaker":
+        return int(bool(value))
+    return value
+
+
+class TradeLedger:
+    """
+    Local SQLite ledger of executions and order history.
+
+    `sync()` fetches only what is newer than each scope's stored watermark
+    (the latest execTime / createdTime already stored, minus a small overlap),
+    walking forward in 7-day windows through the paginated endpoints; rows are
+    upserted by execId / orderId, so overlapping fetches never duplicate.
+    Orders that were still open at the previous sync are refreshed through
+    the open-orders endpoint (or by orderId once they leave it) until they
+    reach a final status, without moving the window walk back.
+
+    Fill and fee questions are then answered from the indexed tables
+    (execId, orderId, symbol + execTime, ...) without touching the API.
+
+    Example:
+        ledger = TradeLedger(api.trade, data_handler=api.data_handler)
+        ledger.sync("linear")
+        ledger.fills(symbol="BTCUSDT", start="2025-01-01")
+        ledger.fees(by="symbol")
+    """
+
+    def __init__(
+        self,
+        trade_client: Trade_client = None,
+        path: str = None,
+        data_handler: DataHandler = None,
+        initial_lookback_days: float = 7.0,
+        overlap_ms: int = 1000,
+        max_pages: int = 1000,
+    ):
+        """
+        Args:
+            trade_client (Trade_client, optional): Source for `sync`; queries work without it.
+            path (str, optional): SQLite file. Defaults to "ledger.sqlite3" in the DataHandler
+                store (or the working directory); ":memory:" keeps it in memory.
+            data_handler (DataHandler, optional): Store holding the default file.
+            initial_lookback_days (float): How far back the first sync of a scope goes.
+            overlap_ms (int): Re-fetched margin before each watermark.
+            max_pages (int): Page limit per 7-day window.
+        """
+        if path is None:
+            path = os.path.join(data_handler.base_dir if data_handler else ".", "ledger.sqlite3")
+        self.path = path
+        self._trade = trade_client
+        self.initial_lookback_ms = int(initial_lookback_days * 24 * 60 * 60 * 1000)
+        self.overlap_ms = overlap_ms
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.logger = logging.getLogger(__name__)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------------------------------------------------------------- writes
+
+    def _upsert(self, table: str, columns: tuple, records: list):
+        rows = [
+            tuple(_value(c, r) for c in columns) + (json.dumps(r, separators=(",", ":")),)
+            for r in records
+        ]
+        placeholders = ",".join("?" * (len(columns) + 1))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({','.join(columns)},raw) VALUES ({placeholders})", rows
+            )
+
+    def add_executions(self, records: list, category: str = None):
+        """Store raw execution records (e.g. from `get_executions`)."""
+        if category is not None:
+            records = [{"category": category, **r} for r in records]
+        self._upsert("executions", _EXEC_COLUMNS, records)
+
+    def add_orders(self, records: list, category: str = None):
+        """Store raw order records (e.g. from `get_order_history`)."""
+        if category is not None:
+            records = [{"category": category, **r} for r in records]
+        self._upsert("orders", _ORDER_COLUMNS, records)
+
+    def watermark(self, kind: str, category: str, symbol: str = None) -> int | None:
+        """Latest stored timestamp (ms) of a sync scope; kind is "executions" or "orders"."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM watermarks WHERE kind = ? AND scope = ?", (kind, f"{category}:{symbol or ''}")
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_watermark(self, kind, category, symbol, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (kind, scope, value) VALUES (?, ?, ?)",
+                (kind, f"{category}:{symbol or ''}", value),
+            )
+
+    # ------------------------------------------------------------------ sync
+
+    def _windows(self, start: int, end: int):
+        while start <= end:
+            yield start, min(end, start + WINDOW_MS - 1)
+            start += WINDOW_MS
+
+    def sync_executions(self, category: str, symbol: str = None, now: int = None) -> int:
+        """Fetch executions newer than the watermark. Returns the number of records fetched."""
+        if self._trade is None:
+            raise ValueError("TradeLedger needs a Trade_client to sync.")
+        now = int(time.time() * 1000) if now is None else now
+        mark = self.watermark("executions", category, symbol)
+        start = now - self.initial_lookback_ms if mark is None else mark - self.overlap_ms
+
+        fetched = 0
+        latest = mark or 0
+        for window_start, window_end in self._windows(start, now):
+            records = self._trade.get_executions(
+                category, symbol=symbol, max_pages=self.max_pages, raw=True,
+                startTime=window_start, endTime=window_end, limit=100,
+            )
+            if records:
+                self.add_executions(records, category)
+                fetched += len(records)
+                latest = max(latest, max(int(r.get("execTime") or 0) for r in records))
+            # Advance per window, so an interrupted backfill resumes where it stopped
+            self._set_watermark("executions", category, symbol, max(latest, window_start))
+        return fetched
+
+    def _open_order_ids(self, category, symbol=None) -> dict:
+        """Stored orders of a scope without a final status, as {orderId: symbol}."""
+        query = "SELECT orderId, symbol FROM orders WHERE category = ? AND orderStatus NOT IN ({})".format(
+            ",".join("?" * len(FINAL_STATUSES))
+        )
+        params = [category, *FINAL_STATUSES]
+        if symbol is not None:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        with self._lock:
+            return dict(self._conn.execute(query, params).fetchall())
+
+    def sync_orders(self, category: str, symbol: str = None, now: int = None) -> int:
+        """
+        Fetch orders created after the watermark, then refresh every stored order
+        that is still open: one `get_open_orders` call per symbol, and an order-history
+        lookup by orderId for those that have left the open list since.
+        """
+        if self._trade is None:
+            raise ValueError("TradeLedger needs a Trade_client to sync.")
+        now = int(time.time() * 1000) if now is None else now
+        mark = self.watermark("orders", category, symbol)
+        start = now - self.initial_lookback_ms if mark is None else mark - self.overlap_ms
+
+        fetched = 0
+        latest = mark or 0
+        for window_start, window_end in self._windows(start, now):
+            records = self._trade.get_order_history(
+                category, symbol=symbol, max_pages=self.max_pages, raw=True,
+                start_time=pd.Timestamp(window_start, unit="ms"), end_time=pd.Timestamp(window_end, unit="ms"),
+                limit=50,
+            )
+            if records:
+                self.add_orders(records, category)
+                fetched += len(records)
+                latest = max(latest, max(int(r.get("createdTime") or 0) for r in records))
+            self._set_watermark("orders", category, symbol, max(latest, window_start))
+
+        pending = self._open_order_ids(category, symbol)
+        for order_symbol in sorted(set(pending.values())):
+            records = self._trade.get_open_orders(
+                category, symbol=order_symbol, max_pages=self.max_pages, raw=True, limit=50,
+            )
+            if records:
+                self.add_orders(records, category)
+                fetched += len(records)
+            for record in records:
+                pending.pop(record.get("orderId"), None)
+        for order_id in pending:
+            records = self._trade.get_order_history(category, order_id=order_id, max_pages=1, raw=True)
+            if records:
+                self.add_orders(records, category)
+                fetched += len(records)
+        return fetched
+
+    def sync(self, categories=("linear",), symbol: str = None, orders: bool = True) -> dict:
+        """Sync executions (and orders) of every category. Returns {(kind, category): fetched}."""
+        if isinstance(categories, str):
+            categories = (categories,)
+        counts = {}
+        for category in categories:
+            counts[("executions", category)] = self.sync_executions(category, symbol)
+            if orders:
+                counts[("orders", category)] = self.sync_orders(category, symbol)
+        return counts
+
+    # --------------------------------------------------------------- queries
+
+    @staticmethod
+    def _ms(value):
+        if value is None or isinstance(value, int):
+            return value
+        return int(pd.Timestamp(value).timestamp() * 1000)
+
+    def _where(self, symbol=None, category=None, order_id=None, start=None, end=None, time_column="execTime"):
+        clauses, params = [], []
+        for column, value in (("symbol", symbol), ("category", category), ("orderId", order_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append(f"{time_column} >= ?")
+            params.append(self._ms(start))
+        if end is not None:
+            clauses.append(f"{time_column} < ?")
+            params.append(self._ms(end))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _query(self, sql, params) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def fills(self, symbol: str = None, category: str = None, order_id: str = None,
+              start=None, end=None) -> pd.DataFrame:
+        """Stored executions (newest first), filtered by symbol, category, order and time (ms or date)."""
+        where, params = self._where(symbol, category, order_id, start, end)
+        columns = ",".join(_EXEC_COLUMNS)
+        return self._query(f"SELECT {columns} FROM executions{where} ORDER BY execTime DESC", params)
+
+    def fees(self, by: str = "symbol", symbol: str = None, category: str = None,
+             start=None, end=None) -> pd.DataFrame:
+        """
+        Fee and volume totals grouped by `by` ("symbol", "category", "side", "orderId"
+        or "day"), from trade executions.
+        """
+        group = {"day": "date(execTime / 1000, 'unixepoch')"}.get(by, by)
+        if by not in ("symbol", "category", "side", "orderId", "day"):
+            raise ValueError(f"Cannot group fees by {by!r}.")
+        where, params = self._where(symbol, category, None, start, end)
+        where = (where + " AND" if where else " WHERE") + " execType = 'Trade'"
+        return self._query(
+            f"SELECT {group} AS {by}, COUNT(*) AS fills, SUM(execQty) AS qty, SUM(execValue) AS value, "
+            f"SUM(execFee) AS fees, SUM(CASE WHEN isMaker THEN execValue ELSE 0 END) AS maker_value "
+            f"FROM executions{where} GROUP BY {group} ORDER BY fees DESC",
+            params,
+        )
+
+    def order_fills(self, order_id: str) -> dict:
+        """Filled quantity, average price and fees of one order, from its executions."""
+        with self._lock:
+            qty, value, fees, count = self._conn.execute(
+                "SELECT SUM(execQty), SUM(execValue), SUM(execFee), COUNT(*) FROM executions WHERE orderId = ?",
+                (order_id,),
+            ).fetchone()
+        return {
+            "orderId": order_id,
+            "fills": count,
+            "qty": qty or 0.0,
+            "avg_price": value / qty if qty else None,
+            "fees": fees or 0.0,
+        }
+
+    def orders(self, symbol: str = None, category: str = None, status: str = None,
+               start=None, end=None) -> pd.DataFrame:
+        """Stored orders (newest first)."""
+        where, params = self._where(symbol, category, None, start, end, time_column="createdTime")
+        if status is not None:
+            where = (where + " AND" if where else " WHERE") + " orderStatus = ?"
+            params.append(status)
+        columns = ",".join(_ORDER_COLUMNS)
+        return self._query(f"SELECT {columns} FROM orders{where} ORDER BY createdTime DESC", params)
+
+    def execution(self, exec_id: str) -> dict | None:
+        """The raw record of one execution."""
+        with self._lock:
+            row = self._conn.execute("SELECT raw FROM executions WHERE execId = ?", (exec_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM executions").fetchone()[0]
+
+    def __repr__(self):
+        return f"TradeLedger({self.path}, executions={len(self)})"
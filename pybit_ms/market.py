@@ -1,6 +1,9 @@
 from pybit_ms._http_manager import HTTPManager
 from pybit_ms.data_layer.data_handler import DataHandler
+from pybit_ms.resample import INTERVAL_MS, check_interval
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -31,6 +34,95 @@ class Market(str, Enum):
 
 
 
+# Kline sources of `get_kline_panel` and their endpoints
+KLINE_SOURCES = {
+    "last": Market.GET_KLINE,
+    "mark": Market.GET_MARK_PRICE_KLINE,
+    "index": Market.GET_INDEX_PRICE_KLINE,
+    "premium": Market.GET_PREMIUM_INDEX_PRICE_KLINE,
+}
+PANEL_FIELDS = ("open", "high", "low", "close")
+
+
+def _ms(value) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).timestamp() * 1000)
+
+
+class KlinePanel:
+    """
+    Klines of several symbols and sources on one time grid.
+
+    `data` has shape (time, symbol, source, field), oldest first, fields being
+    open, high, low, close. For fixed intervals the grid has every bar from the
+    first to the last one returned by any source, so a bar missing from a
+    source (or from all of them) is a NaN row, flagged in `missing`.
+
+    Example:
+        panel = api.market.get_kline_panel("linear", ["BTCUSDT", "ETHUSDT"], "60", start="2024-01-01")
+        panel.close[:, 0, panel.sources.index("mark")]
+        panel.basis("last", "index")
+        panel.to_frame()
+    """
+
+    __slots__ = ("category", "interval", "timestamps", "symbols", "sources", "data")
+
+    def __init__(self, category: str, interval: str, timestamps: np.ndarray, symbols: tuple, sources: tuple,
+                 data: np.ndarray):
+        self.category = category
+        self.interval = interval
+        self.timestamps = timestamps
+        self.symbols = tuple(symbols)
+        self.sources = tuple(sources)
+        self.data = data
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def field(self, name: str) -> np.ndarray:
+        """(time, symbol, source) array of one field: open, high, low or close."""
+        return self.data[..., PANEL_FIELDS.index(name)]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.data[..., 3]
+
+    @property
+    def missing(self) -> np.ndarray:
+        """(time, symbol, source) bool array, True where the source has no bar."""
+        return np.isnan(self.close)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.to_datetime(self.timestamps, unit="ms", utc=True)
+
+    def get(self, symbol: str, source: str, field: str = "close") -> np.ndarray:
+        """One series, aligned with `timestamps`."""
+        return self.field(field)[:, self.symbols.index(symbol), self.sources.index(source)]
+
+    def basis(self, source: str = "last", reference: str = "index", field: str = "close") -> pd.DataFrame:
+        """Relative spread `source / reference - 1` per symbol (time x symbol), NaN where either is missing."""
+        values = self.field(field)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread = values[:, :, self.sources.index(source)] / values[:, :, self.sources.index(reference)] - 1.0
+        return pd.DataFrame(spread, index=self.index, columns=list(self.symbols))
+
+    def to_frame(self, field: str = None) -> pd.DataFrame:
+        """
+        Frame indexed by UTC time with (symbol, source, field) columns, or
+        (symbol, source) columns for a single `field`.
+        """
+        if field is not None:
+            columns = pd.MultiIndex.from_product([self.symbols, self.sources], names=["symbol", "source"])
+            values = self.field(field).reshape(len(self), -1)
+        else:
+            columns = pd.MultiIndex.from_product([self.symbols, self.sources, PANEL_FIELDS],
+                                                 names=["symbol", "source", "field"])
+            values = self.data.reshape(len(self), -1)
+        return pd.DataFrame(values, index=self.index, columns=columns)
+
+
 class Market_client:
     
     def __init__(self, http_manager: HTTPManager, data_handler: DataHandler):
@@ -291,6 +383,103 @@ class Market_client:
             query=kwargs,
         )
 
+    def _fetch_klines(self, source: str, query: dict, start: int = None, end: int = None, max_pages: int = None) -> list:
+        """Kline rows of one source, newest first, paging back from `end` to `start`."""
+        limit = query.get("limit", 1000)
+        rows, pages = [], 0
+        while True:
+            page_query = dict(query, limit=limit)
+            if start is not None:
+                page_query["start"] = start
+            if end is not None:
+                page_query["end"] = end
+            response = self._http_manager._submit_request(
+                method="GET",
+                path=f"{self.endpoint}{KLINE_SOURCES[source]}",
+                query=page_query,
+            )
+            page = response.get("result", {}).get("list", [])
+            rows.extend(page)
+            pages += 1
+            if start is None or len(page) < limit or (max_pages and pages >= max_pages):
+                return rows
+            oldest = int(page[-1][0])
+            if oldest <= start:
+                return rows
+            end = oldest - 1
+
+    def get_kline_panel(self, category: str, symbols, interval: str, start=None, end=None,
+                        sources=("last", "mark", "index", "premium"), limit: int = 1000, max_pages: int = None,
+                        max_workers: int = 8, frame: bool = False):
+        """
+        Fetch last-traded, mark, index and premium-index klines of several symbols
+        concurrently and align them on one time grid (see KlinePanel).
+
+        Required args:
+            category (string): Product type. linear,inverse
+            symbols (iterable): Symbol names, e.g. ["BTCUSDT", "ETHUSDT"]
+            interval (string): Kline interval. 1,3,5,15,30,60,120,240,360,720,D,M,W
+
+        Args:
+            start (int | str | datetime, optional): Start of the range (ms or anything pd.Timestamp
+                parses, UTC). With a start, each source is paged back from `end` until it is reached;
+                without, only the latest `limit` bars are fetched.
+            end (int | str | datetime, optional): End of the range. Defaults to now.
+            sources (iterable): Any of "last", "mark", "index", "premium". Premium index klines
+                exist for linear contracts only and are left as gaps for other categories.
+            limit (int): Bars per request (max 1000).
+            max_pages (int, optional): Page limit per symbol and source.
+            max_workers (int): Requests in flight at once.
+            frame (bool): If True, returns `KlinePanel.to_frame()` instead of the panel.
+
+        Returns:
+            KlinePanel | pd.DataFrame
+
+        https://bybit-exchange.github.io/docs/v5/market/kline
+        """
+        interval = check_interval(interval)
+        symbols = (symbols,) if isinstance(symbols, str) else tuple(symbols)
+        sources = tuple(sources)
+        for source in sources:
+            if source not in KLINE_SOURCES:
+                raise ValueError(f"Unknown kline source {source!r}; expected one of {', '.join(KLINE_SOURCES)}.")
+        start = _ms(start) if start is not None else None
+        end = _ms(end) if end is not None else None
+
+        tasks = [(i, k) for i in range(len(symbols)) for k, source in enumerate(sources)
+                 if source != "premium" or category == "linear"]
+
+        def fetch(task):
+            i, k = task
+            query = {"category": category, "symbol": symbols[i], "interval": interval, "limit": limit}
+            rows = self._fetch_klines(sources[k], query, start, end, max_pages)
+            if not rows:
+                return np.empty(0, np.int64), np.empty((0, 4))
+            values = np.array([row[:5] for row in rows], dtype=np.float64)
+            return values[:, 0].astype(np.int64), values[:, 1:5]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks) or 1))) as executor:
+            results = list(executor.map(fetch, tasks))
+
+        stamps = [ts for ts, _ in results if len(ts)]
+        if not stamps:
+            grid = np.empty(0, np.int64)
+        elif interval in INTERVAL_MS:
+            step = INTERVAL_MS[interval]
+            first = min(int(ts.min()) for ts in stamps)
+            last = max(int(ts.max()) for ts in stamps)
+            grid = np.arange(first, last + step, step, dtype=np.int64)
+        else:
+            grid = np.unique(np.concatenate(stamps))
+
+        data = np.full((len(grid), len(symbols), len(sources), len(PANEL_FIELDS)), np.nan)
+        for (i, k), (ts, values) in zip(tasks, results):
+            if len(ts):
+                data[np.searchsorted(grid, ts), i, k] = values
+
+        panel = KlinePanel(category, interval, grid, symbols, sources, data)
+        return panel.to_frame() if frame else panel
+
     def get_instruments_info(self, max_pages=None, **kwargs):
         """
         Query a list of instruments of online trading pair.
@@ -0,0 +1,367 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from pybit_ms.trade import Trade_client
+from pybit_ms._exceptions import FailedRequestError, InvalidRequestError
+
+
+# Bybit order statuses under which an order can still trade.
+OPEN_STATUSES = frozenset({"Created", "New", "PartiallyFilled", "Untriggered", "Active"})
+
+# Local status for orders that left the open list but could not be found in
+# the recent order history during reconciliation.
+CLOSED_STATUS = "Closed"
+
+
+class OrderManager:
+    """
+    Local order management layered on a Trade_client.
+
+    Keeps every order it has seen in memory, indexed by orderId, orderLinkId,
+    symbol and status. The index is updated from the responses of
+    place/amend/cancel calls made through the manager and from `reconcile`,
+    which diffs the local view against `get_open_orders` (plus an order-history
+    lookup per order that disappeared). Queries never touch the network.
+
+    Orders are stored as Bybit-shaped dicts (camelCase keys: orderId, orderLinkId,
+    category, symbol, side, orderType, qty, price, orderStatus, cumExecQty,
+    leavesQty, avgPrice, updatedTime). Query methods return copies.
+
+    Example:
+        oms = OrderManager(api.trade)
+        oms.place_order("linear", "BTCUSDT", "Buy", "Limit", qty="0.001", price="60000")
+        oms.open_orders(symbol="BTCUSDT")
+        oms.start(interval=5, scopes=[{"category": "linear", "settle_coin": "USDT"}])
+    """
+
+    def __init__(self, trade_client: Trade_client):
+        self._trade = trade_client
+        self._lock = threading.RLock()
+        self._orders = {}                     # orderId -> order dict
+        self._by_link = {}                    # orderLinkId -> orderId
+        self._by_symbol = defaultdict(set)    # symbol -> {orderId}
+        self._by_status = defaultdict(set)    # orderStatus -> {orderId}
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------ index
+
+    def _upsert(self, update: dict):
+        """Merge `update` into the stored order and refresh the indexes."""
+        order_id = update.get("orderId")
+        if not order_id:
+            return None
+
+        with self._lock:
+            previous = self._orders.get(order_id)
+            order = dict(previous) if previous else {}
+            order.update({k: v for k, v in update.items() if v is not None})
+
+            if previous:
+                self._by_symbol[previous.get("symbol")].discard(order_id)
+                self._by_status[previous.get("orderStatus")].discard(order_id)
+            self._orders[order_id] = order
+            self._by_symbol[order.get("symbol")].add(order_id)
+            self._by_status[order.get("orderStatus")].add(order_id)
+            if order.get("orderLinkId"):
+                self._by_link[order["orderLinkId"]] = order_id
+
+        if previous != order:
+            for listener in list(self._listeners):
+                try:
+                    listener(dict(order), dict(previous) if previous else None)
+                except Exception:
+                    self.logger.exception("OrderManager listener failed.")
+        return order
+
+    def add_listener(self, callback):
+        """
+        Register `callback(order, previous)` to be called whenever an order changes.
+        `previous` is None for orders seen for the first time.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    # ---------------------------------------------------------------- queries
+
+    def get(self, order_id: str = None, order_link_id: str = None) -> dict | None:
+        """Look up one order by orderId or orderLinkId."""
+        with self._lock:
+            if order_id is None and order_link_id is not None:
+                order_id = self._by_link.get(order_link_id)
+            order = self._orders.get(order_id)
+            return dict(order) if order else None
+
+    def orders(self, symbol: str = None, status: str | set = None, category: str = None) -> list[dict]:
+        """
+        Return the known orders matching every given filter.
+
+        Args:
+            symbol (str, optional): Symbol name, e.g. "BTCUSDT".
+            status (str | set, optional): One status or a set of statuses.
+            category (str, optional): Product type.
+        """
+        with self._lock:
+            if symbol is not None:
+                ids = set(self._by_symbol.get(symbol, ()))
+            else:
+                ids = None
+            if status is not None:
+                statuses = {status} if isinstance(status, str) else status
+                by_status = set().union(*(self._by_status.get(s, ()) for s in statuses))
+                ids = by_status if ids is None else ids & by_status
+            if ids is None:
+                ids = self._orders.keys()
+            result = [dict(self._orders[i]) for i in ids]
+        if category is not None:
+            result = [o for o in result if o.get("category") == category]
+        return result
+
+    def open_orders(self, symbol: str = None, category: str = None) -> list[dict]:
+        """Orders that can still trade (see OPEN_STATUSES)."""
+        return self.orders(symbol=symbol, status=OPEN_STATUSES, category=category)
+
+    def __len__(self):
+        return len(self._orders)
+
+    # ---------------------------------------------------------------- actions
+
+    def place_order(self, category: str, symbol: str, side: str, order_type: str, qty, price=None, **kwargs) -> dict:
+        """
+        Place an order through `Trade_client.place_order` and index it.
+        Extra keyword arguments are forwarded (snake_case, e.g. order_link_id).
+
+        Returns:
+            dict: The indexed order.
+        """
+        response = self._trade.place_order(
+            category, symbol, side, order_type, qty, price=price, raw=True, **kwargs
+        )
+        result = response.get("result", {})
+        return self._upsert({
+            "orderId": result.get("orderId"),
+            "orderLinkId": result.get("orderLinkId") or kwargs.get("order_link_id"),
+            "category": category,
+            "symbol": symbol,
+            "side": side,
+            "orderType": order_type,
+            "qty": str(qty),
+            "price": None if price is None else str(price),
+            "orderStatus": "New",
+            "cumExecQty": "0",
+            "leavesQty": str(qty),
+            "createdTime": str(response.get("time", "")),
+            "updatedTime": str(response.get("time", "")),
+        })
+
+    def place_batch_order(self, category: str, orders: list[dict], **kwargs) -> list[dict]:
+        """
+        Place orders through `Trade_client.place_batch_order` and index the successful ones.
+
+        Returns:
+            list[dict]: One entry per input order: the indexed order, or the
+                per-order error ({"code", "msg"}) from retExtInfo.
+        """
+        response = self._trade.place_batch_order(category, orders, raw=True, **kwargs)
+        results = response.get("result", {}).get("list", [])
+        errors = response.get("retExtInfo", {}).get("list", [])
+        out = []
+        for idx, order in enumerate(orders):
+            result = results[idx] if idx < len(results) else {}
+            error = errors[idx] if idx < len(errors) else {"code": 0}
+            if error.get("code", 0) != 0 or not result.get("orderId"):
+                out.append(error)
+                continue
+            out.append(self._upsert({
+                "orderId": result["orderId"],
+                "orderLinkId": result.get("orderLinkId") or order.get("orderLinkId"),
+                "category": category,
+                "symbol": order.get("symbol"),
+                "side": order.get("side"),
+                "orderType": order.get("orderType"),
+                "qty": None if order.get("qty") is None else str(order["qty"]),
+                "price": None if order.get("price") is None else str(order["price"]),
+                "orderStatus": "New",
+                "cumExecQty": "0",
+                "leavesQty": None if order.get("qty") is None else str(order["qty"]),
+                "createdTime": result.get("createAt"),
+                "updatedTime": result.get("createAt"),
+            }))
+        return out
+
+    def amend_order(self, category: str, symbol: str, order_id: str = None, order_link_id: str = None,
+                    qty=None, price=None, **kwargs) -> dict:
+        """Amend an order through `Trade_client.amend_order` and update the index."""
+        response = self._trade.amend_order(
+            category, symbol, qty=qty, price=price,
+            order_id=order_id, order_link_id=order_link_id, raw=True, **kwargs
+        )
+        result = response.get("result", {})
+        order_id = result.get("orderId") or order_id or self._by_link.get(order_link_id)
+        return self._upsert({
+            "orderId": order_id,
+            "orderLinkId": result.get("orderLinkId") or order_link_id,
+            "category": category,
+            "symbol": symbol,
+            "qty": None if qty is None else str(qty),
+            "price": None if price is None else str(price),
+            "updatedTime": str(response.get("time", "")),
+        })
+
+    def cancel_order(self, category: str, symbol: str, order_id: str = None, order_link_id: str = None,
+                     **kwargs) -> dict:
+        """Cancel an order through `Trade_client.cancel_order` and mark it Cancelled."""
+        response = self._trade.cancel_order(
+            category, symbol, order_id=order_id, order_link_id=order_link_id, raw=True, **kwargs
+        )
+        result = response.get("result", {})
+        order_id = result.get("orderId") or order_id or self._by_link.get(order_link_id)
+        return self._upsert({
+            "orderId": order_id,
+            "orderLinkId": result.get("orderLinkId") or order_link_id,
+            "category": category,
+            "symbol": symbol,
+            "orderStatus": "Cancelled",
+            "updatedTime": str(response.get("time", "")),
+        })
+
+    def cancel_all_orders(self, category: str, symbol: str = None, **kwargs) -> list[str]:
+        """Cancel orders through `Trade_client.cancel_all_orders` and mark them Cancelled."""
+        response = self._trade.cancel_all_orders(category, symbol=symbol, raw=True, **kwargs)
+        cancelled = []
+        for item in response.get("result", {}).get("list", []):
+            order = self._upsert({
+                "orderId": item.get("orderId"),
+                "orderLinkId": item.get("orderLinkId") or None,
+                "category": category,
+                "orderStatus": "Cancelled",
+                "updatedTime": str(response.get("time", "")),
+            })
+            if order:
+                cancelled.append(order["orderId"])
+        return cancelled
+
+    # --------------------------------------------------------- reconciliation
+
+    def reconcile(self, category: str, symbol: str = None, settle_coin: str = None,
+                  base_coin: str = None, max_pages: int = 20) -> dict:
+        """
+        Diff the local index against the exchange for one scope.
+
+        One `get_open_orders` call (paginated, 50 per page) refreshes every open
+        order. Orders the index believes open but the exchange no longer lists are
+        looked up one by one in the order history; any not found there are marked
+        "Closed". If the snapshot may be truncated (its last page was full), no
+        order is treated as vanished in that round.
+
+        Args:
+            category, symbol, settle_coin, base_coin: Scope of the `get_open_orders` query.
+                baseCoin/settleCoin scopes are matched exactly, using the instrument rules.
+            max_pages (int): Page limit of the open-orders query (at least 1).
+
+        Returns:
+            dict: {"new": [...], "changed": [...], "closed": [...]} lists of orderIds.
+        """
+        if max_pages is None or max_pages < 1:
+            raise ValueError("reconcile needs max_pages >= 1: a partial snapshot would mark unlisted open orders closed.")
+
+        def coins(order):
+            # Exact baseCoin/settleCoin, as the exchange filters them (ETH must not match ETHFIUSDT)
+            try:
+                rules = self._trade.instruments.get(category, order.get("symbol", ""))
+            except (InvalidRequestError, FailedRequestError):
+                return None
+            return rules.base_coin, rules.settle_coin
+
+        def in_scope(order):
+            if order.get("category") != category or (symbol is not None and order.get("symbol") != symbol):
+                return False
+            if base_coin is None and settle_coin is None:
+                return True
+            # Unknown instrument: leave the order alone rather than risk closing it
+            order_coins = coins(order)
+            return (
+                order_coins is not None
+                and (base_coin is None or order_coins[0] == base_coin)
+                and (settle_coin is None or order_coins[1] == settle_coin)
+            )
+
+        # Only orders known before the snapshot can have vanished from it; orders
+        # placed while it is in flight may legitimately be missing.
+        known_open = {o["orderId"] for o in self.open_orders() if in_scope(o)}
+        page_size = 50
+        remote = self._trade.get_open_orders(
+            category, symbol=symbol, settle_coin=settle_coin, base_coin=base_coin,
+            max_pages=max_pages, raw=True, limit=page_size,
+        )
+        diff = {"new": [], "changed": [], "closed": []}
+        seen = set()
+        for record in remote:
+            order_id = record.get("orderId")
+            seen.add(order_id)
+            before = self._orders.get(order_id)
+            self._upsert({**record, "category": category})
+            if before is None:
+                diff["new"].append(order_id)
+            elif self._orders[order_id] != before:
+                diff["changed"].append(order_id)
+
+        if len(remote) >= max_pages * page_size:
+            self.logger.warning(
+                f"Open orders of {category} {symbol or settle_coin or base_coin or ''} fill all {max_pages} pages; "
+                f"skipping vanished-order detection."
+            )
+            return diff
+
+        open_now = {o["orderId"] for o in self.open_orders() if in_scope(o)}
+        for order_id in known_open - seen:
+            if order_id not in open_now:
+                continue
+            history = self._trade.get_order_history(category, order_id=order_id, raw=True)
+            records = history.get("result", {}).get("list", [])
+            if records:
+                self._upsert({**records[0], "category": category})
+            else:
+                self._upsert({"orderId": order_id, "orderStatus": CLOSED_STATUS})
+            diff["closed"].append(order_id)
+        return diff
+
+    def start(self, interval: float = 5.0, scopes: list[dict] = None):
+        """
+        Reconcile in a background thread every `interval` seconds.
+
+        Args:
+            interval (float): Seconds between reconciliation rounds.
+            scopes (list[dict]): Keyword arguments for `reconcile`, one dict per scope,
+                e.g. [{"category": "linear", "settle_coin": "USDT"}, {"category": "spot"}].
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        scopes = scopes or [{"category": "linear", "settle_coin": "USDT"}]
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                started = time.monotonic()
+                for scope in scopes:
+                    try:
+                        self.reconcile(**scope)
+                    except (InvalidRequestError, FailedRequestError) as e:
+                        self.logger.error(f"Order reconciliation failed for {scope}: {e}")
+                self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+        self._thread = threading.Thread(target=run, name="OrderManager-reconcile", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop the background reconciliation thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
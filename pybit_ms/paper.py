@@ -0,0 +1,713 @@
+import bisect
+import itertools
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime as dt, timezone
+from decimal import Decimal, InvalidOperation
+from urllib.parse import urlsplit
+
+from pybit_ms._http_manager import HTTPManager
+from pybit_ms._exceptions import InvalidRequestError
+from pybit_ms.trade import Trade
+from pybit_ms.account import Account
+from pybit_ms.market import Market
+
+
+# Bybit error codes returned by the simulated exchange.
+PARAMS_ERROR = 10001
+ORDER_NOT_EXISTS = 110001
+INSUFFICIENT_BALANCE = 110007
+REDUCE_ONLY_REJECTED = 110017
+POST_ONLY_WOULD_TAKE = 110079
+
+QUOTE_COINS = ("USDT", "USDC", "USD", "BTC", "ETH", "EUR")
+
+ZERO = Decimal(0)
+
+
+def _d(value, default=None):
+    if value in (None, ""):
+        return default
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return default
+
+
+def _s(value: Decimal) -> str:
+    text = format(value, "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text or "0"
+
+
+def split_symbol(symbol: str) -> tuple[str, str]:
+    """Split a symbol such as "BTCUSDT" into ("BTC", "USDT")."""
+    for quote in QUOTE_COINS:
+        if symbol.endswith(quote) and symbol != quote:
+            return symbol[: -len(quote)], quote
+    return symbol, ""
+
+
+class _Book:
+    """
+    Resting orders of one symbol in price-time priority.
+    Each side maps price -> deque of orders (arrival order) plus a sorted price list.
+    """
+
+    __slots__ = ("levels", "prices")
+
+    def __init__(self):
+        self.levels = {"Buy": {}, "Sell": {}}
+        self.prices = {"Buy": [], "Sell": []}   # ascending
+
+    def add(self, order):
+        side, price = order["side"], order["_price"]
+        level = self.levels[side].get(price)
+        if level is None:
+            level = self.levels[side][price] = deque()
+            bisect.insort(self.prices[side], price)
+        level.append(order)
+
+    def remove(self, order):
+        side, price = order["side"], order["_price"]
+        level = self.levels[side].get(price)
+        if level is None:
+            return
+        try:
+            level.remove(order)
+        except ValueError:
+            return
+        if not level:
+            del self.levels[side][price]
+            self.prices[side].remove(price)
+
+    def crossing(self, trade_price: Decimal):
+        """Yield resting orders that a trade at `trade_price` fills, best price first, oldest first."""
+        bids = self.prices["Buy"]
+        for price in reversed(bids[bisect.bisect_left(bids, trade_price):]):
+            yield from list(self.levels["Buy"].get(price, ()))
+        asks = self.prices["Sell"]
+        for price in asks[: bisect.bisect_right(asks, trade_price)]:
+            yield from list(self.levels["Sell"].get(price, ()))
+
+
+class PaperExchange:
+    """
+    In-process simulated Bybit account with a price-time-priority matching engine.
+
+    Market data comes from `on_trade` / `on_kline` (or `load_klines` for stored
+    klines): resting limit orders that the traded price crosses are filled at
+    their limit price as maker, in price then arrival order, up to the traded
+    size when one is given. Market orders and marketable limit orders fill
+    immediately at the last price (plus `slippage_bps`) as taker.
+
+    Derivatives (linear/inverse) keep one-way net positions with average entry
+    price and realised PnL; fills that open or add to a position need initial
+    margin (notional / leverage plus the fee) within the available balance. Spot
+    orders move coin balances directly; a spot Market Buy's qty is in the quote
+    coin unless `marketUnit` says "baseCoin". Fees are charged in the
+    settle/quote coin. The simulated clock follows the market data.
+
+    Use it through `PaperHTTPManager`, so the real Trade_client and
+    Account_client run unchanged against it.
+    """
+
+    def __init__(self, balances: dict = None, taker_fee=0.00055, maker_fee=0.0002,
+                 slippage_bps: float = 0.0, history_size: int = 100_000):
+        self.balances = defaultdict(Decimal, {k: _d(v) for k, v in (balances or {"USDT": 10000}).items()})
+        self.taker_fee = _d(taker_fee)
+        self.maker_fee = _d(maker_fee)
+        self.slippage = _d(slippage_bps) / 10000
+        self.last_price = {}                     # symbol -> Decimal
+        self.leverage = defaultdict(lambda: "10")
+        self._books = defaultdict(_Book)
+        self._open = {}                          # orderId -> order
+        self._by_link = {}                       # orderLinkId -> orderId
+        self._history = deque(maxlen=history_size)
+        self._executions = deque(maxlen=history_size)
+        self._positions = {}                     # (category, symbol) -> position
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._clock = None
+
+    # ------------------------------------------------------------------ clock
+
+    def now(self) -> int:
+        """Simulated time in ms (last market-data timestamp, wall clock before any data)."""
+        return self._clock if self._clock is not None else int(time.time() * 1000)
+
+    # ------------------------------------------------------------ market data
+
+    def on_trade(self, symbol: str, price, size=None, timestamp: int = None):
+        """
+        Feed one public trade (or price print). Fills crossing resting orders.
+
+        Args:
+            symbol (str): Symbol name.
+            price: Traded price.
+            size (optional): Traded size; limits the quantity filled. None fills without limit.
+            timestamp (int, optional): Event time in ms; advances the simulated clock.
+        """
+        price = _d(price)
+        liquidity = _d(size)
+        with self._lock:
+            if timestamp is not None:
+                self._clock = int(timestamp)
+            self.last_price[symbol] = price
+            book = self._books.get(symbol)
+            if book is None:
+                return
+            for order in book.crossing(price):
+                if liquidity is not None and liquidity <= 0:
+                    break
+                qty = order["_leaves"] if liquidity is None else min(order["_leaves"], liquidity)
+                self._fill(order, qty, order["_price"], maker=True)
+                if liquidity is not None:
+                    liquidity -= qty
+
+    def on_kline(self, symbol: str, row):
+        """
+        Feed one kline, as a list [start, open, high, low, close, volume, ...] or a
+        dict with those keys (the `get_kline(save_csv=True)` format). The bar is
+        replayed as four prints, open -> low -> high -> close for up bars and
+        open -> high -> low -> close for down bars, each carrying a quarter of the volume.
+        """
+        if isinstance(row, dict):
+            row = [row["timestamp"], row["open"], row["high"], row["low"], row["close"], row.get("volume")]
+        ts, o, h, l, c = int(row[0]), _d(row[1]), _d(row[2]), _d(row[3]), _d(row[4])
+        volume = _d(row[5]) if len(row) > 5 else None
+        size = volume / 4 if volume is not None else None
+        path = (o, l, h, c) if c >= o else (o, h, l, c)
+        for price in path:
+            self.on_trade(symbol, price, size, ts)
+
+    def load_klines(self, symbol: str, rows):
+        """Replay klines (any order; sorted by start time) through `on_kline`."""
+        rows = sorted(rows, key=lambda r: int(r["timestamp"] if isinstance(r, dict) else r[0]))
+        for row in rows:
+            self.on_kline(symbol, row)
+
+    # ----------------------------------------------------------------- orders
+
+    def _reject(self, message, code=PARAMS_ERROR, request=""):
+        raise InvalidRequestError(
+            request=request,
+            message=message,
+            status_code=code,
+            time=dt.now(timezone.utc).strftime("%H:%M:%S"),
+            resp_headers=None,
+        )
+
+    def _find(self, order_id=None, order_link_id=None):
+        if not order_id and order_link_id:
+            order_id = self._by_link.get(order_link_id)
+        order = self._open.get(order_id)
+        if order is None:
+            self._reject("order not exists or too late to cancel", ORDER_NOT_EXISTS, f"{order_id or order_link_id}")
+        return order
+
+    def place(self, params: dict) -> dict:
+        """Handle a create-order request (camelCase Bybit params)."""
+        with self._lock:
+            category, symbol = params.get("category"), params.get("symbol")
+            side, order_type = params.get("side"), str(params.get("orderType", "Limit")).capitalize()
+            qty, price = _d(params.get("qty")), _d(params.get("price"))
+            tif = params.get("timeInForce") or ("IOC" if order_type == "Market" else "GTC")
+            if side not in ("Buy", "Sell") or not symbol or qty is None or qty <= 0:
+                self._reject("params error: symbol, side and a positive qty are required")
+            if order_type == "Limit" and price is None:
+                self._reject("params error: price is required for limit orders")
+            last = self.last_price.get(symbol)
+            if last is None:
+                self._reject(f"params error: no market data for {symbol}")
+
+            if params.get("reduceOnly") in (True, "true", 1) and category != "spot":
+                held = self._positions.get((category, symbol), {}).get("_size", ZERO)
+                reducible = -held if side == "Buy" else held
+                if reducible <= 0:
+                    self._reject("current position is zero, cannot fix reduce-only order qty", REDUCE_ONLY_REJECTED)
+                qty = min(qty, reducible)
+
+            market_unit = ""
+            if category == "spot" and order_type == "Market":
+                # Bybit reads the qty of a spot market Buy in the quote coin unless told otherwise
+                market_unit = params.get("marketUnit") or ("quoteCoin" if side == "Buy" else "baseCoin")
+                if market_unit not in ("baseCoin", "quoteCoin"):
+                    self._reject("params error: marketUnit must be baseCoin or quoteCoin")
+
+            now = self.now()
+            order_id = f"paper-{next(self._ids)}"
+            order = {
+                "orderId": order_id,
+                "orderLinkId": params.get("orderLinkId") or "",
+                "category": category,
+                "symbol": symbol,
+                "side": side,
+                "orderType": order_type,
+                "price": _s(price) if price is not None else "0",
+                "qty": _s(qty),
+                "timeInForce": tif,
+                "orderStatus": "New",
+                "reduceOnly": params.get("reduceOnly") in (True, "true", 1),
+                "positionIdx": 0,
+                "marketUnit": market_unit,
+                "createdTime": str(now),
+                "updatedTime": str(now),
+                "_price": price,
+                "_qty": qty,
+                "_leaves": qty,
+                "_cum": ZERO,
+                "_value": ZERO,
+                "_fee": ZERO,
+            }
+            self._sync(order)
+
+            marketable = order_type == "Market" or (side == "Buy" and price >= last) or (side == "Sell" and price <= last)
+            if marketable and tif == "PostOnly":
+                self._close(order, "Cancelled")
+                self._reject("post only order will take liquidity", POST_ONLY_WOULD_TAKE)
+
+            self._open[order_id] = order
+            if order["orderLinkId"]:
+                self._by_link[order["orderLinkId"]] = order_id
+
+            if marketable:
+                sign = 1 if side == "Buy" else -1
+                fill_price = last * (1 + sign * self.slippage)
+                if order_type == "Limit":
+                    fill_price = min(fill_price, price) if side == "Buy" else max(fill_price, price)
+                elif order["marketUnit"] == "quoteCoin":
+                    # qty is the quote amount to spend (fee included) or to receive
+                    qty = qty / (fill_price * (1 + self.taker_fee)) if side == "Buy" else qty / fill_price
+                    order["_qty"] = order["_leaves"] = qty
+                if not self._fill(order, qty, fill_price, maker=False):
+                    self._reject("Insufficient balance.", INSUFFICIENT_BALANCE)
+            elif tif in ("IOC", "FOK"):
+                self._close(order, "Cancelled")
+            else:
+                self._books[symbol].add(order)
+            return {"orderId": order_id, "orderLinkId": order["orderLinkId"]}
+
+    def amend(self, params: dict) -> dict:
+        """Handle an amend-order request. Changing the price or raising the qty loses time priority."""
+        with self._lock:
+            order = self._find(params.get("orderId"), params.get("orderLinkId"))
+            qty, price = _d(params.get("qty")), _d(params.get("price"))
+            if qty is not None and qty <= order["_cum"]:
+                self._reject("qty must be greater than the filled qty")
+            book = self._books[order["symbol"]]
+            requeue = (price is not None and price != order["_price"]) or (qty is not None and qty > order["_qty"])
+            if requeue:
+                book.remove(order)
+            if qty is not None:
+                order["_leaves"] = qty - order["_cum"]
+                order["_qty"] = qty
+                order["qty"] = _s(qty)
+            if price is not None:
+                order["_price"] = price
+                order["price"] = _s(price)
+            order["updatedTime"] = str(self.now())
+            self._sync(order)
+            if requeue:
+                book.add(order)
+            return {"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]}
+
+    def cancel(self, params: dict) -> dict:
+        """Handle a cancel-order request."""
+        with self._lock:
+            order = self._find(params.get("orderId"), params.get("orderLinkId"))
+            self._books[order["symbol"]].remove(order)
+            self._close(order, "Cancelled")
+            return {"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]}
+
+    def cancel_all(self, params: dict) -> dict:
+        """Handle a cancel-all request."""
+        with self._lock:
+            cancelled = []
+            for order in self._select(params):
+                self._books[order["symbol"]].remove(order)
+                self._close(order, "Cancelled")
+                cancelled.append({"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]})
+            return {"list": cancelled, "success": "1"}
+
+    def _select(self, params: dict) -> list[dict]:
+        symbol, base, settle = params.get("symbol"), params.get("baseCoin"), params.get("settleCoin")
+        order_id, link_id = params.get("orderId"), params.get("orderLinkId")
+        return [
+            o for o in list(self._open.values())
+            if o["category"] == params.get("category")
+            and (not symbol or o["symbol"] == symbol)
+            and (not base or split_symbol(o["symbol"])[0] == base)
+            and (not settle or split_symbol(o["symbol"])[1] == settle)
+            and (not order_id or o["orderId"] == order_id)
+            and (not link_id or o["orderLinkId"] == link_id)
+        ]
+
+    # ------------------------------------------------------------------ fills
+
+    def _fill(self, order, qty: Decimal, price: Decimal, maker: bool) -> bool:
+        """
+        Execute `qty` of `order` at `price`. Returns False, rejecting the order, if a
+        spot order lacked the coin balance or a derivatives order the initial margin.
+        """
+        fee_rate = self.maker_fee if maker else self.taker_fee
+        category, symbol, side = order["category"], order["symbol"], order["side"]
+        base, quote = split_symbol(symbol)
+        inverse = category == "inverse"
+        value = qty / price if inverse else qty * price
+        fee = value * fee_rate
+        fee_coin = base if inverse else quote
+
+        if category == "spot":
+            short = self.balances[quote] < value + fee if side == "Buy" else self.balances[base] < qty
+        else:
+            short = self._margin_needed(category, symbol, side, qty, price) + fee > self._available(fee_coin)
+        if short:
+            self._books[symbol].remove(order)
+            self._close(order, "Rejected" if order["_cum"] == 0 else "PartiallyFilledCanceled")
+            return False
+
+        if category == "spot":
+            if side == "Buy":
+                self.balances[quote] -= value
+                self.balances[base] += qty
+            else:
+                self.balances[base] -= qty
+                self.balances[quote] += value
+        else:
+            self._apply_position(category, symbol, side, qty, price)
+        self.balances[fee_coin] -= fee
+
+        now = self.now()
+        order["_leaves"] -= qty
+        order["_cum"] += qty
+        order["_value"] += value
+        order["_fee"] += fee
+        order["updatedTime"] = str(now)
+        self._executions.appendleft({
+            "execId": f"paper-exec-{next(self._ids)}",
+            "orderId": order["orderId"],
+            "orderLinkId": order["orderLinkId"],
+            "category": category,
+            "symbol": symbol,
+            "side": side,
+            "orderType": order["orderType"],
+            "orderPrice": order["price"],
+            "orderQty": order["qty"],
+            "execPrice": _s(price),
+            "execQty": _s(qty),
+            "execValue": _s(value),
+            "execFee": _s(fee),
+            "feeRate": _s(fee_rate),
+            "execType": "Trade",
+            "isMaker": maker,
+            "leavesQty": _s(order["_leaves"]),
+            "execTime": str(now),
+        })
+
+        if order["_leaves"] <= 0:
+            self._books[symbol].remove(order)
+            self._close(order, "Filled")
+        else:
+            order["orderStatus"] = "PartiallyFilled"
+            self._sync(order)
+        return True
+
+    def _initial_margin(self, category, symbol, size: Decimal, price: Decimal) -> Decimal:
+        if not size or not price:
+            return ZERO
+        value = abs(size) / price if category == "inverse" else abs(size) * price
+        return value / _d(self.leverage[symbol])
+
+    def _margin_needed(self, category, symbol, side, qty, price) -> Decimal:
+        """Extra initial margin a fill needs: all of it when opening or adding, none when reducing."""
+        pos = self._positions.get((category, symbol), {})
+        held, entry = pos.get("_size", ZERO), pos.get("_entry", ZERO)
+        signed = qty if side == "Buy" else -qty
+        new_size = held + signed
+        if held == 0 or (held > 0) == (signed > 0):
+            return self._initial_margin(category, symbol, signed, price)
+        if new_size == 0 or (new_size > 0) == (held > 0):
+            return ZERO
+        # Flipped: the remainder opens at the fill price, releasing the old position's margin
+        released = self._initial_margin(category, symbol, held, entry)
+        return max(self._initial_margin(category, symbol, new_size, price) - released, ZERO)
+
+    def _available(self, coin) -> Decimal:
+        """Wallet balance plus unrealised PnL, less the initial margin of positions settled in `coin`."""
+        available = self.balances[coin]
+        for (category, sym), pos in self._positions.items():
+            base, quote = split_symbol(sym)
+            if (base if category == "inverse" else quote) == coin:
+                available += self._unrealised(category, sym, pos)
+                available -= self._initial_margin(category, sym, pos["_size"], pos["_entry"])
+        return available
+
+    def _apply_position(self, category, symbol, side, qty, price):
+        pos = self._positions.get((category, symbol))
+        if pos is None:
+            pos = self._positions[(category, symbol)] = {"_size": ZERO, "_entry": ZERO, "_realised": ZERO}
+        signed = qty if side == "Buy" else -qty
+        size, entry = pos["_size"], pos["_entry"]
+        inverse = category == "inverse"
+
+        if size == 0 or (size > 0) == (signed > 0):
+            # Opening or adding: weighted average entry (harmonic for inverse contracts)
+            new_size = size + signed
+            if inverse:
+                entry = abs(new_size) / (abs(size) / entry + abs(signed) / price) if size else price
+            else:
+                entry = (abs(size) * entry + abs(signed) * price) / abs(new_size)
+        else:
+            closed = min(abs(size), abs(signed))
+            direction = 1 if size > 0 else -1
+            if inverse:
+                pos["_realised"] += direction * closed * (1 / entry - 1 / price)
+            else:
+                pos["_realised"] += direction * closed * (price - entry)
+            new_size = size + signed
+            if new_size != 0 and (new_size > 0) != (size > 0):
+                entry = price                      # flipped: remainder opens at the fill price
+            elif new_size == 0:
+                entry = ZERO
+
+        realised = pos["_realised"]
+        settle = split_symbol(symbol)[0] if inverse else split_symbol(symbol)[1]
+        self.balances[settle] += realised
+        pos["_realised"] = ZERO
+        pos["_cum_realised"] = pos.get("_cum_realised", ZERO) + realised
+        pos["_size"], pos["_entry"] = new_size, entry
+        pos["_updated"] = self.now()
+
+    def _close(self, order, status):
+        order["orderStatus"] = status
+        order["updatedTime"] = str(self.now())
+        self._open.pop(order["orderId"], None)
+        if order["orderLinkId"]:
+            self._by_link.pop(order["orderLinkId"], None)
+        self._sync(order)
+        self._history.appendleft(order)
+
+    @staticmethod
+    def _sync(order):
+        """Refresh the string fields Bybit reports from the internal Decimals."""
+        order["leavesQty"] = _s(order["_leaves"])
+        order["cumExecQty"] = _s(order["_cum"])
+        order["cumExecValue"] = _s(order["_value"])
+        order["cumExecFee"] = _s(order["_fee"])
+        if order["_cum"]:
+            avg = order["_cum"] / order["_value"] if order["category"] == "inverse" else order["_value"] / order["_cum"]
+            order["avgPrice"] = _s(avg)
+        else:
+            order["avgPrice"] = ""
+
+    # ---------------------------------------------------------------- queries
+
+    @staticmethod
+    def _public(order) -> dict:
+        return {k: v for k, v in order.items() if not k.startswith("_")}
+
+    def open_orders(self, params: dict) -> list[dict]:
+        with self._lock:
+            return [self._public(o) for o in sorted(self._select(params), key=lambda o: -int(o["createdTime"]))]
+
+    def order_history(self, params: dict) -> list[dict]:
+        with self._lock:
+            symbol, order_id, link_id = params.get("symbol"), params.get("orderId"), params.get("orderLinkId")
+            return [
+                self._public(o) for o in self._history
+                if o["category"] == params.get("category")
+                and (not symbol or o["symbol"] == symbol)
+                and (not order_id or o["orderId"] == order_id)
+                and (not link_id or o["orderLinkId"] == link_id)
+            ]
+
+    def executions(self, params: dict) -> list[dict]:
+        with self._lock:
+            symbol, order_id, link_id = params.get("symbol"), params.get("orderId"), params.get("orderLinkId")
+            start, end = params.get("startTime"), params.get("endTime")
+            return [
+                dict(e) for e in self._executions
+                if e["category"] == params.get("category")
+                and (not symbol or e["symbol"] == symbol)
+                and (not order_id or e["orderId"] == order_id)
+                and (not link_id or e["orderLinkId"] == link_id)
+                and (start is None or int(e["execTime"]) >= int(start))
+                and (end is None or int(e["execTime"]) <= int(end))
+            ]
+
+    def _unrealised(self, category, symbol, pos) -> Decimal:
+        size, entry = pos["_size"], pos["_entry"]
+        mark = self.last_price.get(symbol, entry)
+        if size == 0 or not mark:
+            return ZERO
+        if category == "inverse":
+            return size * (1 / entry - 1 / mark)
+        return size * (mark - entry)
+
+    def positions(self, params: dict) -> list[dict]:
+        with self._lock:
+            symbol, settle = params.get("symbol"), params.get("settleCoin")
+            out = []
+            for (category, sym), pos in self._positions.items():
+                if category != params.get("category") or (symbol and sym != symbol):
+                    continue
+                if settle and split_symbol(sym)[1] != settle:
+                    continue
+                size = pos["_size"]
+                mark = self.last_price.get(sym, pos["_entry"])
+                out.append({
+                    "category": category,
+                    "symbol": sym,
+                    "side": "Buy" if size > 0 else "Sell" if size < 0 else "",
+                    "size": _s(abs(size)),
+                    "avgPrice": _s(pos["_entry"]),
+                    "markPrice": _s(mark),
+                    "positionValue": _s(abs(size) / pos["_entry"] if category == "inverse" and pos["_entry"] else abs(size) * pos["_entry"]),
+                    "unrealisedPnl": _s(self._unrealised(category, sym, pos)),
+                    "cumRealisedPnl": _s(pos.get("_cum_realised", ZERO)),
+                    "leverage": self.leverage[sym],
+                    "positionIdx": 0,
+                    "positionStatus": "Normal",
+                    "updatedTime": str(pos.get("_updated", self.now())),
+                })
+            return out
+
+    def wallet(self, params: dict) -> dict:
+        with self._lock:
+            upl = defaultdict(Decimal)
+            for (category, sym), pos in self._positions.items():
+                base, quote = split_symbol(sym)
+                upl[base if category == "inverse" else quote] += self._unrealised(category, sym, pos)
+
+            wanted = set(params["coin"].split(",")) if params.get("coin") else None
+            coins, total = [], ZERO
+            for coin, balance in sorted(self.balances.items()):
+                if wanted is not None and coin not in wanted:
+                    continue
+                equity = balance + upl[coin]
+                usd = equity if coin in ("USDT", "USDC", "USD") else equity * self.last_price.get(f"{coin}USDT", ZERO)
+                total += usd
+                coins.append({
+                    "coin": coin,
+                    "walletBalance": _s(balance),
+                    "equity": _s(equity),
+                    "usdValue": _s(usd),
+                    "unrealisedPnl": _s(upl[coin]),
+                    "availableToWithdraw": _s(balance),
+                    "cumRealisedPnl": _s(sum(
+                        (p.get("_cum_realised", ZERO) for (c, s), p in self._positions.items()
+                         if (split_symbol(s)[0] if c == "inverse" else split_symbol(s)[1]) == coin),
+                        ZERO,
+                    )),
+                })
+            return {"list": [{
+                "accountType": params.get("accountType", "UNIFIED"),
+                "totalEquity": _s(total),
+                "totalWalletBalance": _s(total),
+                "totalAvailableBalance": _s(total),
+                "coin": coins,
+            }]}
+
+
+def _page(records: list, query: dict, default_limit: int = 20) -> dict:
+    """Slice `records` like a Bybit cursor-paginated endpoint (the cursor is an offset)."""
+    limit = int(query.get("limit") or default_limit)
+    offset = int(query.get("cursor") or 0)
+    chunk = records[offset: offset + limit]
+    more = offset + limit < len(records)
+    return {"list": chunk, "nextPageCursor": str(offset + limit) if more else ""}
+
+
+class PaperHTTPManager(HTTPManager):
+    """
+    HTTPManager that answers from a PaperExchange instead of the network.
+
+    Only the transport step is replaced: query copying, metrics, response hooks
+    (StateCache invalidation) and pagination behave as with the real manager, so
+    Trade_client, Account_client and everything built on them run unchanged.
+    Requests to endpoints the simulator does not implement raise InvalidRequestError.
+
+    Example:
+        exchange = PaperExchange(balances={"USDT": 10000})
+        exchange.load_klines("BTCUSDT", api.data_handler.load_from_csv("BTCUSDT_kline.csv"))
+        paper = BybitAPI(http_manager=PaperHTTPManager(exchange))
+        paper.trade.place_order("linear", "BTCUSDT", "Buy", "Market", "0.01", raw=True)
+    """
+
+    def __init__(self, exchange: PaperExchange = None, **kwargs):
+        kwargs.setdefault("api_key", "paper")
+        kwargs.setdefault("api_secret", "paper")
+        super().__init__(**kwargs)
+        self.exchange = exchange or PaperExchange()
+        ex = self.exchange
+        self._routes = {
+            Trade.PLACE_ORDER.value: lambda q: ex.place(q),
+            Trade.AMEND_ORDER.value: lambda q: ex.amend(q),
+            Trade.CANCEL_ORDER.value: lambda q: ex.cancel(q),
+            Trade.CANCEL_ALL_ORDERS.value: lambda q: ex.cancel_all(q),
+            Trade.GET_OPEN_ORDERS.value: lambda q: _page(ex.open_orders(q), q, 20),
+            Trade.GET_ORDER_HISTORY.value: lambda q: _page(ex.order_history(q), q, 20),
+            Trade.GET_EXECUTIONS.value: lambda q: _page(ex.executions(q), q, 50),
+            Trade.GET_POSITIONS.value: lambda q: _page(ex.positions(q), q, 20),
+            Trade.SET_LEVERAGE.value: self._set_leverage,
+            Account.GET_WALLET_BALANCE.value: lambda q: ex.wallet(q),
+            Account.GET_FEE_RATE.value: self._fee_rate,
+            Market.GET_TICKERS.value: self._tickers,
+            Market.GET_SERVER_TIME.value: lambda q: {
+                "timeSecond": str(ex.now() // 1000), "timeNano": str(ex.now() * 1_000_000)
+            },
+        }
+        self._batch_routes = {
+            Trade.BATCH_PLACE_ORDER.value: ex.place,
+            Trade.BATCH_AMEND_ORDER.value: ex.amend,
+            Trade.BATCH_CANCEL_ORDER.value: ex.cancel,
+        }
+
+    def _set_leverage(self, query):
+        self.exchange.leverage[query.get("symbol")] = str(query.get("buyLeverage"))
+        return {}
+
+    def _fee_rate(self, query):
+        return {"list": [{
+            "symbol": query.get("symbol") or "",
+            "takerFeeRate": _s(self.exchange.taker_fee),
+            "makerFeeRate": _s(self.exchange.maker_fee),
+        }]}
+
+    def _tickers(self, query):
+        symbol = query.get("symbol")
+        symbols = [symbol] if symbol else list(self.exchange.last_price)
+        return {"category": query.get("category"), "list": [
+            {"symbol": s, "lastPrice": _s(self.exchange.last_price[s]),
+             "bid1Price": _s(self.exchange.last_price[s]), "ask1Price": _s(self.exchange.last_price[s])}
+            for s in symbols if s in self.exchange.last_price
+        ]}
+
+    def _batch(self, handler, query):
+        results, errors = [], []
+        for item in query.get("request", []):
+            item = {**item, "category": query.get("category")}
+            try:
+                results.append({"category": item["category"], "symbol": item.get("symbol"), **handler(item)})
+                errors.append({"code": 0, "msg": "OK"})
+            except InvalidRequestError as e:
+                results.append({"category": item["category"], "symbol": item.get("symbol"), "orderId": "", "orderLinkId": ""})
+                errors.append({"code": e.status_code, "msg": e.message})
+        return {"list": results}, {"list": errors}
+
+    def _send_with_retries(self, method, path, query, auth, timer):
+        started = time.perf_counter()
+        route = urlsplit(path).path
+        query = {k: v for k, v in query.items() if v is not None}
+        ext_info = {}
+        if route in self._batch_routes:
+            result, ext_info = self._batch(self._batch_routes[route], query)
+        elif route in self._routes:
+            result = self._routes[route](query)
+        else:
+            self.exchange._reject(f"{route} is not supported by the paper exchange", request=f"{method} {path}")
+        timer.phase("network", started)
+        return {"retCode": 0, "retMsg": "OK", "result": result, "retExtInfo": ext_info, "time": self.exchange.now()}
@@ -0,0 +1,240 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pybit_ms.bybit_client import BybitAPI
+from pybit_ms.client_pool import BybitClientPool
+
+
+# (category, settleCoin) position queries made per account. Linear positions
+# must be filtered by settle coin; inverse ones are listed without a filter.
+DEFAULT_POSITION_QUERIES = (("linear", "USDT"), ("linear", "USDC"), ("inverse", None))
+
+STABLE_COINS = ("USDT", "USDC", "USD")
+
+COLUMNS = [
+    "account", "kind", "category", "coin", "symbol", "side", "size", "avg_price", "mark_price",
+    "equity", "notional", "usd_value", "unrealised_pnl", "usd_unrealised_pnl",
+]
+
+
+class PortfolioSnapshot:
+    """
+    Firm-wide balances and positions at one point in time.
+
+    `table` is one columnar DataFrame with a row per (account, coin) balance
+    (kind "balance") and per open position (kind "position"):
+        - size: signed position size (negative for shorts), NaN for balances;
+        - equity: coin equity of a balance row;
+        - notional: signed position value, in the settle coin;
+        - usd_value / usd_unrealised_pnl: both converted to USD with each coin's
+          price implied by the wallet (usdValue / equity), stablecoins at 1.
+
+    `errors` lists (account, query, exception) for every request that failed;
+    the snapshot holds whatever else was fetched.
+    """
+
+    def __init__(self, table: pd.DataFrame, errors: list, taken_at: pd.Timestamp):
+        self.table = table
+        self.errors = errors
+        self.taken_at = taken_at
+
+    @property
+    def balances(self) -> pd.DataFrame:
+        return self.table[self.table["kind"] == "balance"]
+
+    @property
+    def positions(self) -> pd.DataFrame:
+        return self.table[self.table["kind"] == "position"]
+
+    def by_coin(self) -> pd.DataFrame:
+        """
+        Per-coin totals across every account: equity, USD value of the balances,
+        net and gross position notional, and unrealized PnL.
+        """
+        t = self.table
+        is_position = (t["kind"] == "position").to_numpy()
+        frame = pd.DataFrame({
+            "coin": t["coin"].to_numpy(),
+            "equity": t["equity"].to_numpy(),
+            "balance_usd": np.where(is_position, 0.0, t["usd_value"].to_numpy()),
+            "net_notional": np.where(is_position, t["notional"].to_numpy(), 0.0),
+            "gross_notional": np.where(is_position, np.abs(t["notional"].to_numpy()), 0.0),
+            "net_usd_exposure": np.where(is_position, t["usd_value"].to_numpy(), 0.0),
+            # From the positions only: a wallet's per-coin unrealisedPnl is the same PnL again
+            "unrealised_pnl": np.where(is_position, t["unrealised_pnl"].to_numpy(), 0.0),
+            "usd_unrealised_pnl": np.where(is_position, t["usd_unrealised_pnl"].to_numpy(), 0.0),
+            "positions": is_position.astype(np.int64),
+        })
+        return frame.groupby("coin", sort=True).sum(min_count=1)
+
+    def by_account(self) -> pd.DataFrame:
+        """Per-account USD balance, USD position exposure and USD unrealized PnL."""
+        t = self.table
+        is_position = (t["kind"] == "position").to_numpy()
+        frame = pd.DataFrame({
+            "account": t["account"].to_numpy(),
+            "balance_usd": np.where(is_position, 0.0, t["usd_value"].to_numpy()),
+            "gross_usd_exposure": np.where(is_position, np.abs(t["usd_value"].to_numpy()), 0.0),
+            "usd_unrealised_pnl": np.where(is_position, t["usd_unrealised_pnl"].to_numpy(), 0.0),
+        })
+        return frame.groupby("account", sort=False).sum()
+
+    def __repr__(self):
+        return (f"PortfolioSnapshot({self.taken_at:%Y-%m-%d %H:%M:%S}, balances={len(self.balances)}, "
+                f"positions={len(self.positions)}, errors={len(self.errors)})")
+
+
+def _numeric(frame: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in frame:
+        return np.full(len(frame), np.nan)
+    return pd.to_numeric(frame[column].replace("", np.nan), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _balance_frame(records: list) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(records)
+    if frame.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    equity = _numeric(frame, "equity")
+    upnl = _numeric(frame, "unrealisedPnl")
+    return pd.DataFrame({
+        "account": frame["account"],
+        "kind": "balance",
+        "category": frame["accountType"],
+        "coin": frame["coin"],
+        "symbol": None,
+        "side": None,
+        "size": np.nan,
+        "avg_price": np.nan,
+        "mark_price": np.nan,
+        "equity": equity,
+        "notional": np.nan,
+        "usd_value": _numeric(frame, "usdValue"),
+        "unrealised_pnl": upnl,
+        "usd_unrealised_pnl": np.nan,
+    })
+
+
+def _position_frame(records: list) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(records)
+    if frame.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    sign = np.where(frame["side"].to_numpy() == "Sell", -1.0, 1.0)
+    size = _numeric(frame, "size") * sign
+    open_ = size != 0
+    # Inverse contracts settle in their base coin (BTCUSD, BTCUSDH25 -> BTC)
+    inverse_coin = frame["symbol"].str.extract(r"^(.*?)USD", expand=False)
+    coin = frame["settleCoin"].where(frame["settleCoin"].notna(), inverse_coin)
+    return pd.DataFrame({
+        "account": frame["account"],
+        "kind": "position",
+        "category": frame["category"],
+        "coin": coin,
+        "symbol": frame["symbol"],
+        "side": frame["side"],
+        "size": size,
+        "avg_price": _numeric(frame, "avgPrice"),
+        "mark_price": _numeric(frame, "markPrice"),
+        "equity": np.nan,
+        "notional": _numeric(frame, "positionValue") * sign,
+        "usd_value": np.nan,
+        "unrealised_pnl": _numeric(frame, "unrealisedPnl"),
+        "usd_unrealised_pnl": np.nan,
+    })[open_]
+
+
+def _clients(source) -> dict:
+    if isinstance(source, BybitClientPool):
+        return dict(source.clients)
+    if isinstance(source, BybitAPI):
+        return {"default": source}
+    return dict(source)
+
+
+def portfolio_snapshot(
+    source,
+    account_type: str = "UNIFIED",
+    position_queries=DEFAULT_POSITION_QUERIES,
+    max_pages: int = 10,
+    max_workers: int = 16,
+) -> PortfolioSnapshot:
+    """
+    Query every account's wallet and positions in parallel and merge them into
+    one PortfolioSnapshot.
+
+    Every (account, request) pair is its own task, so the snapshot takes
+    about as long as the slowest single request rather than the sum of them.
+
+    Args:
+        source (BybitClientPool | dict | BybitAPI): The accounts; a dict maps name -> BybitAPI.
+        account_type (str): accountType of the wallet-balance query.
+        position_queries (iterable): (category, settle coin) pairs queried for positions.
+        max_pages (int): Page limit of each positions query.
+        max_workers (int): Requests in flight at once.
+
+    Returns:
+        PortfolioSnapshot: See the class docstring.
+
+    Example:
+        snapshot = portfolio_snapshot(pool)
+        snapshot.by_coin()
+    """
+    clients = _clients(source)
+    logger = logging.getLogger(__name__)
+    taken_at = pd.Timestamp.now(tz="UTC")
+
+    def wallet(name, client):
+        response = client.account.get_wallet_balance(account_type, raw=True)
+        rows = []
+        for account in response.get("result", {}).get("list", []):
+            for coin in account.get("coin", []):
+                rows.append({"account": name, "accountType": account.get("accountType", account_type), **coin})
+        return "balance", rows
+
+    def positions(name, client, category, settle_coin):
+        records = client.trade.get_positions(
+            category, settle_coin=settle_coin, max_pages=max_pages, raw=True
+        )
+        rows = [{"account": name, "category": category, "settleCoin": settle_coin, **r} for r in records]
+        return "position", rows
+
+    tasks = []
+    for name, client in clients.items():
+        tasks.append(((name, "wallet"), wallet, (name, client)))
+        for category, settle_coin in position_queries:
+            tasks.append(((name, f"positions {category} {settle_coin or ''}".strip()), positions,
+                          (name, client, category, settle_coin)))
+
+    records = {"balance": [], "position": []}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+        futures = [(key, executor.submit(func, *args)) for key, func, args in tasks]
+        for (name, query), future in futures:
+            try:
+                kind, rows = future.result()
+            except Exception as e:
+                logger.error(f"Portfolio snapshot: {query} failed for account '{name}': {e}")
+                errors.append((name, query, e))
+                continue
+            records[kind].extend(rows)
+
+    table = pd.concat(
+        [_balance_frame(records["balance"]), _position_frame(records["position"])], ignore_index=True
+    )[COLUMNS]
+
+    # USD conversion: each coin's price as implied by the wallets (usdValue / equity)
+    balances = table["kind"].to_numpy() == "balance"
+    equity = table["equity"].to_numpy(dtype=np.float64)
+    usd = table["usd_value"].to_numpy(dtype=np.float64)
+    priced = balances & (equity != 0) & np.isfinite(usd)
+    prices = pd.Series(usd[priced] / equity[priced]).groupby(table["coin"].to_numpy()[priced]).median()
+    for stable in STABLE_COINS:
+        prices[stable] = 1.0
+    price = table["coin"].map(prices).to_numpy(dtype=np.float64)
+
+    positions_mask = ~balances
+    table["usd_value"] = np.where(positions_mask, table["notional"].to_numpy(dtype=np.float64) * price, usd)
+    table["usd_unrealised_pnl"] = table["unrealised_pnl"].to_numpy(dtype=np.float64) * price
+    return PortfolioSnapshot(table, errors, taken_at)
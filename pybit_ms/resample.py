@@ -0,0 +1,355 @@
+import numpy as np
+import pandas as pd
+
+from pybit_ms.data_layer.data_handler import DataHandler
+from pybit_ms._ring import RingBuffer
+
+
+MS_PER_MINUTE = 60 * 1000
+MS_PER_DAY = 24 * 60 * MS_PER_MINUTE
+
+# Bybit kline intervals of fixed length, in ms ("M" is a calendar month)
+INTERVAL_MS = {
+    **{str(m): m * MS_PER_MINUTE for m in (1, 3, 5, 15, 30, 60, 120, 240, 360, 720)},
+    "D": MS_PER_DAY,
+    "W": 7 * MS_PER_DAY,
+}
+INTERVALS = (*INTERVAL_MS, "M")
+
+# Weekly klines start on Monday 00:00 UTC; the epoch (1970-01-01) was a Thursday.
+WEEK_OFFSET_MS = 4 * MS_PER_DAY
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+VOLUME_FIELDS = ("volume", "turnover")
+BAR_FIELDS = {"timestamp": np.int64, **{f: np.float64 for f in PRICE_FIELDS + VOLUME_FIELDS}, "count": np.int64}
+
+
+def check_interval(interval) -> str:
+    """Validate a Bybit kline interval and return it as a string (raises ValueError)."""
+    interval = str(interval)
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown kline interval {interval!r}; expected one of {', '.join(INTERVALS)}.")
+    return interval
+
+
+def _check_divides(base_interval: str, interval: str):
+    if interval == "M":
+        ok = INTERVAL_MS[base_interval] <= MS_PER_DAY and MS_PER_DAY % INTERVAL_MS[base_interval] == 0
+    elif base_interval == "M":
+        ok = False
+    else:
+        ok = INTERVAL_MS[interval] % INTERVAL_MS[base_interval] == 0
+    if not ok:
+        raise ValueError(f"Interval {interval!r} cannot be built from {base_interval!r} klines.")
+
+
+def bucket_start(timestamps, interval) -> np.ndarray:
+    """
+    Open time (ms) of the `interval` kline holding each timestamp, aligned as on
+    Bybit: minutes and days on UTC boundaries, weeks on Monday, months on the 1st.
+    """
+    interval = check_interval(interval)
+    ts = np.asarray(timestamps, dtype=np.int64)
+    if interval == "M":
+        return ts.astype("datetime64[ms]").astype("datetime64[M]").astype("datetime64[ms]").astype(np.int64)
+    step = INTERVAL_MS[interval]
+    offset = WEEK_OFFSET_MS if interval == "W" else 0
+    return ts - (ts - offset) % step
+
+
+def bucket_end(starts, interval) -> np.ndarray:
+    """Open time (ms) of the kline following each `interval` kline open time."""
+    interval = check_interval(interval)
+    starts = np.asarray(starts, dtype=np.int64)
+    if interval == "M":
+        months = starts.astype("datetime64[ms]").astype("datetime64[M]") + 1
+        return months.astype("datetime64[ms]").astype(np.int64)
+    return starts + INTERVAL_MS[interval]
+
+
+def _sorted(bars: dict) -> dict:
+    ts = np.asarray(bars["timestamp"], dtype=np.int64)
+    if len(ts) > 1 and (np.diff(ts) < 0).any():
+        order = np.argsort(ts, kind="stable")
+        return {k: np.asarray(v)[order] for k, v in bars.items()}
+    return bars
+
+
+def resample(bars: dict, interval, base_interval=None, drop_partial: bool = False) -> dict:
+    """
+    Derive `interval` klines from finer klines.
+
+    Base bars are grouped by the open time of the target kline they fall in,
+    and each group is reduced in one vectorized pass per field: first open,
+    max high, min low, last close, summed volume and turnover.
+
+    Args:
+        bars (dict): Kline arrays as returned by `DataHandler.load_kline_arrays`
+            ("timestamp" plus any of open, high, low, close, volume, turnover).
+            Unsorted input (e.g. straight from `get_kline`) is sorted first.
+        interval (str): Target interval: 1,3,5,15,30,60,120,240,360,720,D,W,M.
+        base_interval (str, optional): Interval of `bars`. If given, each output bar
+            is checked for completeness and the target is checked to be a multiple of it.
+        drop_partial (bool): Drop bars built from fewer base bars than they span
+            (requires `base_interval`), e.g. the bar still in progress.
+
+    Returns:
+        dict[str, np.ndarray]: "timestamp" (open time, ms), the reduced fields present
+            in `bars`, "count" (base bars per output bar) and, with `base_interval`,
+            a bool "complete".
+    """
+    interval = check_interval(interval)
+    if base_interval is not None:
+        base_interval = check_interval(base_interval)
+        _check_divides(base_interval, interval)
+    elif drop_partial:
+        raise ValueError("drop_partial requires base_interval.")
+
+    bars = _sorted(bars)
+    ts = np.asarray(bars["timestamp"], dtype=np.int64)
+    fields = [f for f in PRICE_FIELDS + VOLUME_FIELDS if f in bars]
+    if len(ts) == 0:
+        out = {"timestamp": ts.copy(), **{f: np.empty(0) for f in fields}, "count": np.empty(0, np.int64)}
+        if base_interval is not None:
+            out["complete"] = np.empty(0, bool)
+        return out
+
+    buckets = bucket_start(ts, interval)
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.append(starts[1:], len(ts))
+
+    out = {"timestamp": buckets[starts]}
+    for field in fields:
+        values = np.asarray(bars[field], dtype=np.float64)
+        if field == "open":
+            out[field] = values[starts]
+        elif field == "close":
+            out[field] = values[ends - 1]
+        elif field == "high":
+            out[field] = np.maximum.reduceat(values, starts)
+        elif field == "low":
+            out[field] = np.minimum.reduceat(values, starts)
+        else:
+            out[field] = np.add.reduceat(values, starts)
+    out["count"] = ends - starts
+
+    if base_interval is not None:
+        expected = (bucket_end(out["timestamp"], interval) - out["timestamp"]) // INTERVAL_MS[base_interval]
+        out["complete"] = out["count"] >= expected
+        if drop_partial:
+            keep = out["complete"]
+            out = {k: v[keep] for k, v in out.items()}
+    return out
+
+
+def derive(bars: dict, intervals=("5", "15", "60", "240", "D"), base_interval=None,
+           drop_partial: bool = False) -> dict:
+    """`resample` the same base klines into several intervals: interval -> kline arrays."""
+    bars = _sorted(bars)
+    return {str(i): resample(bars, i, base_interval, drop_partial) for i in intervals}
+
+
+class KlineResampler:
+    """
+    Incrementally maintained coarser klines, fed with base-interval klines only.
+
+    Only the newest base kline can still change (Bybit keeps updating the
+    kline in progress), so it is held apart as "pending" while every older
+    base kline is folded, once, into a running aggregate per target interval.
+    A new base kline confirms the pending one; an `update` with the pending
+    kline's timestamp replaces it. Folding is O(1) per interval, and a bar is
+    emitted as soon as its last base kline is confirmed (or, after a gap,
+    when a base kline of a later bar arrives).
+
+    Completed bars are kept in a RingBuffer per interval and, with a
+    DataHandler, appended to "<prefix>_<interval>.csv", which
+    `load_kline_arrays` reads back.
+
+    Example:
+        resampler = KlineResampler(["5", "60", "D"], base_interval="1")
+        resampler.seed(api.data_handler.load_kline_arrays("BTCUSDT_kline.csv"))
+        ...
+        new_bars = resampler.update(ts, o, h, l, c, v, t)   # e.g. from get_kline every minute
+        resampler.bars("60")
+    """
+
+    def __init__(
+        self,
+        intervals=("5", "15", "60"),
+        base_interval="1",
+        capacity: int = 10000,
+        data_handler: DataHandler = None,
+        prefix: str = "kline",
+        on_bar=None,
+    ):
+        """
+        Args:
+            intervals (iterable): Target intervals (multiples of `base_interval`).
+            base_interval (str): Interval of the klines fed in.
+            capacity (int): Completed bars kept in memory per interval.
+            data_handler (DataHandler, optional): Store completed bars are appended to.
+            prefix (str): Prefix of the CSV filenames.
+            on_bar (callable, optional): Called with (interval, bars) for every batch of
+                completed bars, bars being kline arrays.
+        """
+        self.base_interval = check_interval(base_interval)
+        self.intervals = tuple(check_interval(i) for i in intervals)
+        for interval in self.intervals:
+            _check_divides(self.base_interval, interval)
+        self.base_ms = INTERVAL_MS[self.base_interval]
+        self.data_handler = data_handler
+        self.prefix = prefix
+        self.on_bar = on_bar
+
+        self.history = {i: RingBuffer(capacity, BAR_FIELDS) for i in self.intervals}
+        self._partial = dict.fromkeys(self.intervals)   # aggregate of the confirmed base klines of the open bar
+        self._pending = None                            # newest base kline, may still change
+        self._confirmed = None                          # timestamp of the last folded base kline
+
+    # ---------------------------------------------------------------- folding
+
+    @staticmethod
+    def _merge(aggregate: dict, bar: dict) -> dict:
+        return {
+            "timestamp": aggregate["timestamp"],
+            "open": aggregate["open"],
+            "high": max(aggregate["high"], bar["high"]),
+            "low": min(aggregate["low"], bar["low"]),
+            "close": bar["close"],
+            "volume": aggregate["volume"] + bar["volume"],
+            "turnover": aggregate["turnover"] + bar["turnover"],
+            "count": aggregate["count"] + bar["count"],
+        }
+
+    def _fold(self, base: dict) -> dict:
+        """Fold confirmed base kline arrays into every interval; returns interval -> completed bars."""
+        emitted = {}
+        last_end = base["timestamp"][-1] + self.base_ms
+        for interval in self.intervals:
+            grouped = resample(base, interval)
+            grouped = {k: grouped[k] for k in BAR_FIELDS}
+            partial = self._partial[interval]
+            if partial is not None:
+                if partial["timestamp"] == grouped["timestamp"][0]:
+                    first = self._merge(partial, {k: v[0].item() for k, v in grouped.items()})
+                    for k, v in grouped.items():
+                        v[0] = first[k]
+                else:
+                    grouped = {k: np.insert(v, 0, partial[k]) for k, v in grouped.items()}
+            # Every bar but the last is over; the last one is over once its final base kline is in
+            n = len(grouped["timestamp"])
+            done = n - 1
+            if bucket_end(grouped["timestamp"][-1], interval) <= last_end:
+                done += 1
+            self._partial[interval] = {k: v[-1].item() for k, v in grouped.items()} if done < n else None
+            if done:
+                emitted[interval] = {k: v[:done] for k, v in grouped.items()}
+        self._confirmed = int(base["timestamp"][-1])
+
+        for interval, bars in emitted.items():
+            self.history[interval].extend(bars)
+            if self.data_handler is not None:
+                self.data_handler.append_arrays_to_csv(bars, f"{self.prefix}_{interval}.csv")
+            if self.on_bar is not None:
+                self.on_bar(interval, bars)
+        return emitted
+
+    # ---------------------------------------------------------------- input
+
+    def _columns(self, bars: dict) -> dict:
+        bars = _sorted(bars)
+        n = len(bars["timestamp"])
+        out = {"timestamp": np.asarray(bars["timestamp"], dtype=np.int64)}
+        for field in PRICE_FIELDS:
+            out[field] = np.asarray(bars[field], dtype=np.float64)
+        for field in VOLUME_FIELDS:
+            out[field] = np.asarray(bars[field], dtype=np.float64) if field in bars else np.zeros(n)
+        out["count"] = np.ones(n, dtype=np.int64)
+        return out
+
+    def update_arrays(self, bars: dict, confirm: bool = False) -> dict:
+        """
+        Feed several base klines at once (any order, e.g. a `get_kline` page or a
+        backfill). Klines older than the pending one are ignored; the newest
+        one becomes pending unless `confirm`.
+
+        Args:
+            bars (dict): Kline arrays ("timestamp", open, high, low, close and optionally
+                volume, turnover).
+            confirm (bool): The newest kline is final too (e.g. a websocket kline with confirm=true).
+
+        Returns:
+            dict: interval -> kline arrays of the bars completed by this update (intervals
+                without new bars are left out).
+        """
+        bars = self._columns(bars)
+        ts = bars["timestamp"]
+        if len(ts) > 1 and (np.diff(ts) == 0).any():
+            # Same kline twice in one batch: keep the last version
+            keep = np.append(ts[1:] != ts[:-1], True)
+            bars = {k: v[keep] for k, v in bars.items()}
+            ts = bars["timestamp"]
+
+        floor = self._pending["timestamp"][0] if self._pending is not None else self._confirmed
+        if floor is not None:
+            fresh = ts >= floor if self._pending is not None else ts > floor
+            if not fresh.all():
+                bars = {k: v[fresh] for k, v in bars.items()}
+                ts = bars["timestamp"]
+        if len(ts) == 0 and not (confirm and self._pending is not None):
+            return {}
+
+        if self._pending is not None and (len(ts) == 0 or ts[0] != self._pending["timestamp"][0]):
+            bars = {k: np.concatenate((self._pending[k], v)) for k, v in bars.items()}
+        self._pending = None
+
+        if not confirm:
+            self._pending = {k: v[-1:] for k, v in bars.items()}
+            bars = {k: v[:-1] for k, v in bars.items()}
+        if len(bars["timestamp"]) == 0:
+            return {}
+        return self._fold(bars)
+
+    def update(self, timestamp: int, open: float, high: float, low: float, close: float,
+               volume: float = 0.0, turnover: float = 0.0, confirm: bool = False) -> dict:
+        """Feed one base kline (a new one or a revision of the pending one). See `update_arrays`."""
+        return self.update_arrays({
+            "timestamp": [int(timestamp)], "open": [float(open)], "high": [float(high)],
+            "low": [float(low)], "close": [float(close)], "volume": [float(volume)],
+            "turnover": [float(turnover)],
+        }, confirm=confirm)
+
+    def seed(self, bars: dict, confirm: bool = False) -> dict:
+        """Feed stored history (e.g. `load_kline_arrays`); same as `update_arrays`."""
+        return self.update_arrays(bars, confirm=confirm)
+
+    # --------------------------------------------------------------- output
+
+    def current(self, interval) -> dict | None:
+        """The bar in progress for `interval` (confirmed base klines plus the pending one), or None."""
+        interval = check_interval(interval)
+        partial = self._partial[interval]
+        pending = None
+        if self._pending is not None:
+            pending = {k: v[0].item() for k, v in self._pending.items()}
+            start = int(bucket_start(pending["timestamp"], interval))
+            pending["timestamp"] = start
+            if partial is not None and partial["timestamp"] != start:
+                partial = None
+        if partial is None:
+            return pending
+        return partial if pending is None else self._merge(partial, pending)
+
+    def bars(self, interval, include_current: bool = True) -> dict:
+        """Completed bars held in memory for `interval`, oldest first, plus the bar in progress."""
+        interval = check_interval(interval)
+        out = self.history[interval].since(0)
+        current = self.current(interval) if include_current else None
+        if current is not None:
+            out = {k: np.append(v, current[k]).astype(v.dtype) for k, v in out.items()}
+        return out
+
+    def to_frame(self, interval, include_current: bool = True) -> pd.DataFrame:
+        df = pd.DataFrame(self.bars(interval, include_current))
+        df.index = pd.to_datetime(df.pop("timestamp"), unit="ms", utc=True)
+        return df
@@ -0,0 +1,290 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from pybit_ms.account import Account_client
+from pybit_ms.trade import Trade_client
+from pybit_ms.data_layer.data_handler import DataHandler
+from pybit_ms._ring import RingBuffer
+
+
+class RollingDrawdown:
+    """
+    Drawdown from the highest value of the last `window` samples.
+
+    The window maximum is kept in a monotonic deque (decreasing values), so
+    each update is amortized O(1) and reading it is O(1).
+    """
+
+    def __init__(self, window: int):
+        self.window = int(window)
+        self._peaks = deque()   # (sequence, value), values decreasing
+        self._seq = 0
+        self.peak = np.nan
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+
+    def update(self, value: float) -> float:
+        """Add one sample and return the current drawdown (0 at a new high, 0.1 = 10% below)."""
+        peaks = self._peaks
+        while peaks and peaks[-1][1] <= value:
+            peaks.pop()
+        peaks.append((self._seq, value))
+        if peaks[0][0] <= self._seq - self.window:
+            peaks.popleft()
+        self._seq += 1
+
+        self.peak = peaks[0][1]
+        self.drawdown = 1.0 - value / self.peak if self.peak > 0 else 0.0
+        self.max_drawdown = max(self.max_drawdown, self.drawdown)
+        return self.drawdown
+
+
+class RollingMean:
+    """Mean of the last `window` samples, with a running sum (O(1) per update)."""
+
+    def __init__(self, window: int):
+        self._values = deque(maxlen=int(window))
+        self._sum = 0.0
+
+    def update(self, value: float) -> float:
+        if len(self._values) == self._values.maxlen:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._sum / len(self._values) if self._values else np.nan
+
+
+class EquitySampler:
+    """
+    Background sampler of account equity, margin usage and per-position PnL.
+
+    Every `interval` seconds it reads `get_wallet_balance` and `get_positions`
+    and appends one account row and one row per open position to fixed-size
+    ring buffers (see RingBuffer). Rolling drawdown and exposure are updated
+    incrementally on every sample, so `metrics()` is O(1). With a DataHandler,
+    rows are appended to "<prefix>_account.csv" and "<prefix>_positions.csv"
+    every `flush_interval` seconds and on `stop()`.
+
+    Exposure is the sum of position values in their settle coin (USD for
+    USDT/USDC-margined contracts).
+
+    Example:
+        sampler = EquitySampler(api.account, api.trade, data_handler=api.data_handler)
+        sampler.start()
+        ...
+        sampler.metrics()["drawdown"]
+        sampler.history()
+    """
+
+    ACCOUNT_FIELDS = {
+        "timestamp": np.int64,
+        "equity": np.float64,
+        "wallet_balance": np.float64,
+        "available_balance": np.float64,
+        "initial_margin": np.float64,
+        "maintenance_margin": np.float64,
+        "margin_usage": np.float64,
+        "unrealised_pnl": np.float64,
+        "gross_exposure": np.float64,
+        "net_exposure": np.float64,
+        "drawdown": np.float64,
+    }
+    POSITION_FIELDS = {
+        "timestamp": np.int64,
+        "category": "U8",
+        "symbol": "U32",
+        "size": np.float64,
+        "position_value": np.float64,
+        "mark_price": np.float64,
+        "unrealised_pnl": np.float64,
+    }
+
+    def __init__(
+        self,
+        account_client: Account_client,
+        trade_client: Trade_client = None,
+        account_type: str = "UNIFIED",
+        position_queries=(("linear", "USDT"),),
+        interval: float = 10.0,
+        capacity: int = 8640,
+        position_capacity: int = None,
+        drawdown_window: int = 8640,
+        exposure_window: int = 360,
+        data_handler: DataHandler = None,
+        flush_interval: float = 300.0,
+        prefix: str = "equity",
+    ):
+        """
+        Args:
+            account_client (Account_client): Source of the wallet balance.
+            trade_client (Trade_client, optional): Source of the positions (skipped if None).
+            account_type (str): accountType of the wallet-balance query.
+            position_queries (iterable): (category, settle coin) pairs queried for positions.
+            interval (float): Seconds between samples.
+            capacity (int): Account samples kept in memory (8640 = one day at 10 s).
+            position_capacity (int, optional): Position rows kept. Defaults to 8 * capacity.
+            drawdown_window (int): Samples over which the drawdown peak is taken.
+            exposure_window (int): Samples averaged for the mean gross exposure.
+            data_handler (DataHandler, optional): Store flushed to; None keeps samples in memory only.
+            flush_interval (float): Seconds between flushes.
+            prefix (str): Prefix of the CSV filenames.
+        """
+        self._account = account_client
+        self._trade = trade_client
+        self.account_type = account_type
+        self.position_queries = tuple(position_queries)
+        self.interval = interval
+        self.data_handler = data_handler
+        self.flush_interval = flush_interval
+        self.prefix = prefix
+
+        self.account = RingBuffer(capacity, self.ACCOUNT_FIELDS)
+        self.positions = RingBuffer(position_capacity or 8 * capacity, self.POSITION_FIELDS)
+        self._drawdown = RollingDrawdown(drawdown_window)
+        self._exposure = RollingMean(exposure_window)
+        self._flushed = {"account": 0, "positions": 0}
+        self._last_flush = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.logger = logging.getLogger(__name__)
+
+    def _fetch_positions(self) -> list:
+        records = []
+        if self._trade is None:
+            return records
+        for category, settle_coin in self.position_queries:
+            rows = self._trade.get_positions(category, settle_coin=settle_coin, max_pages=10, raw=True)
+            records.extend({"category": category, **row} for row in rows)
+        return records
+
+    def sample(self, timestamp: int = None) -> dict:
+        """Take one sample now and return its account row."""
+        wallet = self._account.get_wallet_balance(self.account_type, typed=True)
+        records = self._fetch_positions()
+        timestamp = int(time.time() * 1000) if timestamp is None else timestamp
+
+        n = len(records)
+        sign = np.fromiter((-1.0 if r.get("side") == "Sell" else 1.0 for r in records), np.float64, n)
+        value = np.fromiter((float(r.get("positionValue") or 0) for r in records), np.float64, n) * sign
+        upnl = np.fromiter((float(r.get("unrealisedPnl") or 0) for r in records), np.float64, n)
+        size = np.fromiter((float(r.get("size") or 0) for r in records), np.float64, n) * sign
+        open_ = size != 0
+
+        equity = wallet.total_equity
+        row = {
+            "timestamp": timestamp,
+            "equity": equity,
+            "wallet_balance": wallet.total_wallet_balance,
+            "available_balance": wallet.total_available_balance,
+            "initial_margin": wallet.total_initial_margin,
+            "maintenance_margin": wallet.total_maintenance_margin,
+            "margin_usage": wallet.total_initial_margin / equity if equity > 0 else np.nan,
+            "unrealised_pnl": float(upnl.sum()) if n else float(wallet.unrealised_pnl.sum()),
+            "gross_exposure": float(np.abs(value).sum()),
+            "net_exposure": float(value.sum()),
+        }
+
+        with self._lock:
+            row["drawdown"] = self._drawdown.update(equity)
+            self._exposure.update(row["gross_exposure"])
+            self.account.append(row)
+            if open_.any():
+                self.positions.extend({
+                    "timestamp": np.full(int(open_.sum()), timestamp, dtype=np.int64),
+                    "category": [r["category"] for r, o in zip(records, open_) if o],
+                    "symbol": [r.get("symbol", "") for r, o in zip(records, open_) if o],
+                    "size": size[open_],
+                    "position_value": value[open_],
+                    "mark_price": np.fromiter(
+                        (float(r.get("markPrice") or 0) for r, o in zip(records, open_) if o), np.float64
+                    ),
+                    "unrealised_pnl": upnl[open_],
+                })
+        return row
+
+    def metrics(self) -> dict:
+        """Latest values and rolling metrics (no history scan)."""
+        with self._lock:
+            equity = self.account.latest("equity")
+            gross = self.account.latest("gross_exposure")
+            return {
+                "timestamp": self.account.latest("timestamp"),
+                "equity": equity,
+                "peak": self._drawdown.peak,
+                "drawdown": self._drawdown.drawdown,
+                "max_drawdown": self._drawdown.max_drawdown,
+                "margin_usage": self.account.latest("margin_usage"),
+                "gross_exposure": gross,
+                "net_exposure": self.account.latest("net_exposure"),
+                "mean_gross_exposure": self._exposure.value,
+                "leverage": gross / equity if equity else np.nan,
+                "samples": self.account.total,
+            }
+
+    def history(self) -> pd.DataFrame:
+        """Account samples held in memory, oldest first."""
+        with self._lock:
+            return self.account.to_frame()
+
+    def position_history(self) -> pd.DataFrame:
+        """Position rows held in memory, oldest first."""
+        with self._lock:
+            return self.positions.to_frame()
+
+    def flush(self):
+        """Append the rows sampled since the last flush to the DataHandler store."""
+        if self.data_handler is None:
+            return
+        with self._lock:
+            pending = {
+                "account": (self.account.since(self._flushed["account"]), self.account.total),
+                "positions": (self.positions.since(self._flushed["positions"]), self.positions.total),
+            }
+        for name, (columns, total) in pending.items():
+            if len(columns["timestamp"]):
+                self.data_handler.append_arrays_to_csv(columns, f"{self.prefix}_{name}.csv")
+            self._flushed[name] = total
+        self._last_flush = time.monotonic()
+
+    def start(self):
+        """Sample on a background thread until `stop()`."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            next_due = time.monotonic()
+            while not self._stop.is_set():
+                try:
+                    self.sample()
+                except Exception:
+                    self.logger.exception("Equity sample failed.")
+                if time.monotonic() - self._last_flush >= self.flush_interval:
+                    try:
+                        self.flush()
+                    except Exception:
+                        self.logger.exception("Equity sample flush failed.")
+                next_due += self.interval
+                self._stop.wait(max(0.0, next_due - time.monotonic()))
+
+        self._thread = threading.Thread(target=run, name="EquitySampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop sampling and flush what is left."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
@@ -0,0 +1,194 @@
+import os
+import queue
+import traceback
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from pybit_ms.backtest import (
+    Backtester, Indicators, run_chunk, append_columns, columns_to_frame,
+)
+
+
+class SharedKlines:
+    """
+    Kline arrays of many symbols packed into one shared-memory block.
+
+    The owner (`SharedKlines(data)`) copies the arrays in once; workers call
+    `attach(name, layout)` and get NumPy views onto the same pages, so no
+    process holds a private copy. The owner must `close()` when done (which
+    also unlinks the block).
+    """
+
+    def __init__(self, data: dict):
+        layout, offset = {}, 0
+        for symbol, bars in data.items():
+            layout[symbol] = {}
+            for column, values in bars.items():
+                values = np.ascontiguousarray(values)
+                offset = -(-offset // 8) * 8  # 8-byte alignment
+                layout[symbol][column] = (offset, values.shape[0], values.dtype.str)
+                offset += values.nbytes
+
+        self.layout = layout
+        self.shm = SharedMemory(create=True, size=max(offset, 1))
+        self.name = self.shm.name
+        for symbol, bars in data.items():
+            for column, values in bars.items():
+                self._view(self.shm, layout[symbol][column])[:] = values
+        self.data = self.views(self.shm, layout)
+
+    @staticmethod
+    def _view(shm, spec) -> np.ndarray:
+        offset, length, dtype = spec
+        return np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+
+    @classmethod
+    def views(cls, shm, layout: dict) -> dict:
+        return {
+            symbol: {column: cls._view(shm, spec) for column, spec in columns.items()}
+            for symbol, columns in layout.items()
+        }
+
+    @classmethod
+    def attach(cls, name: str, layout: dict):
+        """Attach to an existing block; returns (shm, data). Close `shm` when done."""
+        shm = SharedMemory(name=name)
+        return shm, cls.views(shm, layout)
+
+    def close(self):
+        self.data = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _sweep_worker(shm_name, layout, strategy, grid, chunk_size, fee_rates, tasks, results):
+    """Pull (symbol, start) tasks until the sentinel, evaluating each block on the shared arrays."""
+    shm, prepared = None, {}
+    try:
+        shm, data = SharedKlines.attach(shm_name, layout)
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            symbol, start = task
+            if symbol not in prepared:
+                bars = data[symbol]
+                prepared[symbol] = (
+                    Indicators(bars),
+                    bars["close"][1:] / bars["close"][:-1] - 1.0,
+                    Backtester.bars_per_year(bars["timestamp"]),
+                )
+            ind, returns, per_year = prepared[symbol]
+            chunk = {k: v[start:start + chunk_size] for k, v in grid.items()}
+            block = run_chunk(strategy, ind, returns, chunk, fee_rates[symbol], per_year)
+            results.put((symbol, start, block))
+    except Exception:
+        results.put((None, None, traceback.format_exc()))
+    finally:
+        # Drop every view onto the block before closing the mapping
+        prepared = data = None
+        if shm is not None:
+            shm.close()
+
+
+class ParallelSweep:
+    """
+    Multi-process parameter sweep for a Backtester.
+
+    The kline arrays are placed once in shared memory (see SharedKlines) and
+    every worker maps them. The grid is cut into (symbol, block) tasks on one
+    shared queue: idle workers take the next task as soon as they finish, so
+    fast and slow blocks balance across cores without a fixed partition. Tasks
+    are queued symbol by symbol so each worker mostly reuses its indicator cache.
+
+    Results stream back as they complete (`iter_blocks`) and `run` assembles
+    them into one columnar DataFrame.
+
+    The strategy must be picklable (a module-level function).
+
+    Example:
+        sweep = ParallelSweep(Backtester.from_store(...), processes=64)
+        results = sweep.run(sma_crossover, {"fast": range(5, 200), "slow": range(200, 2000, 50)})
+    """
+
+    def __init__(self, backtester: Backtester, processes: int = None, mp_context: str = None):
+        self.backtester = backtester
+        self.processes = processes or os.cpu_count() or 1
+        self._ctx = mp.get_context(mp_context)
+
+    def iter_blocks(self, strategy, params: dict, chunk_size: int = 8, symbols: list = None):
+        """
+        Yield (symbol, block) as workers finish, where block maps column -> array
+        (parameters and metrics of `chunk_size` parameter sets). Order is not guaranteed.
+        """
+        grid = self.backtester.grid(params)
+        n_sets = len(next(iter(grid.values()))) if grid else 0
+        symbols = symbols or list(self.backtester.data)
+        todo = [(symbol, start) for symbol in symbols for start in range(0, n_sets, chunk_size)]
+        if not todo:
+            return
+
+        shared = SharedKlines({s: self.backtester.data[s] for s in symbols})
+        tasks, results = self._ctx.Queue(), self._ctx.Queue()
+        workers = []
+        try:
+            for task in todo:
+                tasks.put(task)
+            n_workers = min(self.processes, len(todo))
+            for _ in range(n_workers):
+                tasks.put(None)
+            for _ in range(n_workers):
+                worker = self._ctx.Process(
+                    target=_sweep_worker,
+                    args=(shared.name, shared.layout, strategy, grid, chunk_size,
+                          self.backtester.fee_rates, tasks, results),
+                    daemon=True,
+                )
+                worker.start()
+                workers.append(worker)
+
+            for _ in range(len(todo)):
+                while True:
+                    try:
+                        symbol, _, block = results.get(timeout=1.0)
+                        break
+                    except queue.Empty:
+                        if not any(w.is_alive() for w in workers):
+                            raise RuntimeError("Sweep workers exited before finishing every task.")
+                if symbol is None:
+                    raise RuntimeError(f"Sweep worker failed:\n{block}")
+                yield symbol, block
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+            shared.close()
+
+    def run(self, strategy, params: dict, chunk_size: int = 8, symbols: list = None, on_block=None) -> pd.DataFrame:
+        """
+        Sweep `params` on every symbol across the process pool.
+
+        Args:
+            strategy (callable): As for `Backtester.run`; must be picklable.
+            params (dict): Parameter grid, {"name": values}.
+            chunk_size (int): Parameter sets per task.
+            symbols (list, optional): Subset of symbols. Defaults to all loaded.
+            on_block (callable, optional): Called with (symbol, block) for each finished
+                block, e.g. to persist partial results.
+
+        Returns:
+            pd.DataFrame: Same columns as `Backtester.run` (row order may differ).
+        """
+        columns = {}
+        for symbol, block in self.iter_blocks(strategy, params, chunk_size, symbols):
+            if on_block is not None:
+                on_block(symbol, block)
+            append_columns(columns, symbol, block)
+        return columns_to_frame(columns)
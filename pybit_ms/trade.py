@@ -1,5 +1,11 @@
 from pybit_ms._http_manager import HTTPManager
+from pybit_ms._exceptions import FailedRequestError, InvalidRequestError
 from pybit_ms.data_layer.data_handler import DataHandler
+from pybit_ms.instruments import InstrumentCache
+from pybit_ms._state_cache import StateCache, POSITIONS
+from pybit_ms._rate_limit import TokenBucket
+from pybit_ms.analytics import executions_frame, closed_pnl_frame
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import pandas as pd
 
@@ -29,13 +35,204 @@ class Trade(str, Enum):
         return self.value
 
 
+# Maximum number of orders Bybit accepts in one batch request, per category.
+BATCH_ORDER_LIMITS = {
+    "linear": 20,
+    "inverse": 20,
+    "option": 20,
+    "spot": 10,
+}
+
+
 class Trade_client:
     
-    def __init__(self, http_manager: HTTPManager, data_handler: DataHandler):
+    def __init__(
+        self,
+        http_manager: HTTPManager,
+        data_handler: DataHandler,
+        validate_orders: bool = False,
+        round_orders: bool = False,
+        state_cache: StateCache = None,
+        batch_order_rate: float = 10.0,
+    ):
         self._http_manager = http_manager
         self._data_handler = data_handler
         self.endpoint = http_manager.endpoint
 
+        # Pre-trade checks against cached instrument rules (lot size, tick size, min notional).
+        # When enabled, orders breaking a rule raise InvalidRequestError before any request is sent;
+        # with round_orders, qty/price are snapped to the instrument's grid instead.
+        self.validate_orders = validate_orders
+        self.round_orders = round_orders
+        self.instruments = InstrumentCache(http_manager)
+
+        # Position cache, invalidated by our own order/position actions (see StateCache).
+        # Shared with Account_client when built through BybitAPI.
+        if state_cache is None:
+            state_cache = StateCache()
+            state_cache.attach(http_manager)
+        self.state_cache = state_cache
+
+        # Bybit budgets batch endpoints per order, not per request (10 orders/s per UID by
+        # default), so chunks of a large batch take one token per order before they are sent.
+        # At the default rate a 500-order grid takes about 50 s: accounts with a higher
+        # limit (VIP / market-maker tiers) should pass it, or None to send unpaced.
+        # Priority lanes, when configured on the HTTP manager, still apply per request.
+        self.batch_bucket = TokenBucket(
+            batch_order_rate, burst=max(batch_order_rate, *BATCH_ORDER_LIMITS.values())
+        ) if batch_order_rate else None
+
+
+    def validate_order(
+        self,
+        category: str,
+        symbol: str,
+        qty=None,
+        price=None,
+        side: str = None,
+        order_type: str = "Limit",
+        market_unit: str = "baseCoin",
+        round_values: bool = None,
+    ) -> dict:
+        """
+        Check an order against the cached instrument rules without sending it.
+
+        Args:
+            category (str): Product type, e.g. "spot", "linear".
+            symbol (str): Symbol name, e.g. "BTCUSDT".
+            qty (str | float, optional): Order quantity.
+            price (str | float, optional): Limit price.
+            side (str, optional): "Buy" or "Sell" (decides the rounding direction of the price).
+            order_type (str, optional): "Limit" or "Market". Defaults to "Limit".
+            market_unit (str, optional): "baseCoin" or "quoteCoin". Defaults to "baseCoin".
+            round_values (bool, optional): Snap qty/price to the grid instead of rejecting them.
+                Defaults to the client's `round_orders` setting.
+
+        Returns:
+            dict: {"qty": str, "price": str} as they would be sent.
+
+        Raises:
+            InvalidRequestError: If the order would be rejected for qty/price/notional reasons.
+        """
+        if round_values is None:
+            round_values = self.round_orders
+        rules = self.instruments.get(category, symbol)
+        return rules.check(
+            qty=qty,
+            price=price,
+            side=side,
+            order_type=order_type,
+            market_unit=market_unit,
+            round_values=round_values,
+        )
+
+
+    @staticmethod
+    def _default_market_unit(params: dict) -> str:
+        # Without marketUnit, Bybit reads the qty of a spot Market Buy in the quote coin
+        if params.get("category") == "spot" and params.get("side") == "Buy" and params.get("orderType") == "Market":
+            return "quoteCoin"
+        return "baseCoin"
+
+    def _pre_trade_check(self, params: dict) -> dict:
+        """
+        Apply `validate_order` to a request payload (camelCase keys) when validation
+        is enabled, writing back the possibly rounded qty/price. Returns `params`.
+        """
+        if not self.validate_orders:
+            return params
+        if params.get("qty") is None and params.get("price") is None:
+            return params
+
+        checked = self.validate_order(
+            category=params.get("category"),
+            symbol=params.get("symbol"),
+            qty=params.get("qty"),
+            price=params.get("price"),
+            side=params.get("side"),
+            order_type=params.get("orderType") or "Limit",
+            market_unit=params.get("marketUnit") or self._default_market_unit(params),
+        )
+        if params.get("qty") is not None:
+            params["qty"] = checked["qty"]
+        if params.get("price") is not None:
+            params["price"] = checked["price"]
+        return params
+
+
+    def _submit_batch(self, path: str, category: str, orders: list[dict], max_workers: int, **kwargs) -> dict:
+        """
+        Split `orders` into chunks of the category's batch limit, send the chunks
+        concurrently (at most `max_workers` in flight, paced by `batch_bucket` at
+        `batch_order_rate` orders per second) and merge the responses.
+
+        The merged response has the usual Bybit shape, with `result.list` and
+        `retExtInfo.list` holding one entry per input order, in input order.
+        If a whole chunk fails, each of its orders gets an error entry
+        (code/msg of the exception). If every chunk fails, the first error is raised.
+        """
+        limit = BATCH_ORDER_LIMITS.get(category, min(BATCH_ORDER_LIMITS.values()))
+        chunks = [orders[i:i + limit] for i in range(0, len(orders), limit)] or [[]]
+
+        def send(chunk):
+            if self.batch_bucket is not None:
+                self.batch_bucket.acquire(tokens=len(chunk))
+            query = dict(kwargs)
+            query["category"] = category
+            query["request"] = chunk
+            return self._http_manager._submit_request(
+                method="POST",
+                path=path,
+                query=query,
+                auth=True,
+            )
+
+        # A single chunk keeps the plain single-request behaviour (errors propagate)
+        if len(chunks) == 1:
+            return send(chunks[0])
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            futures = [executor.submit(send, chunk) for chunk in chunks]
+
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except (InvalidRequestError, FailedRequestError) as e:
+                outcomes.append(e)
+
+        if all(isinstance(outcome, Exception) for outcome in outcomes):
+            raise outcomes[0]
+
+        results, errors = [], []
+        last_time = None
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                for order in chunk:
+                    results.append({
+                        "category": category,
+                        "symbol": order.get("symbol", ""),
+                        "orderId": "",
+                        "orderLinkId": "",
+                    })
+                    errors.append({"code": outcome.status_code, "msg": outcome.message})
+                continue
+
+            last_time = outcome.get("time", last_time)
+            chunk_results = outcome.get("result", {}).get("list", [])
+            chunk_errors = outcome.get("retExtInfo", {}).get("list", [])
+            for idx in range(len(chunk)):
+                results.append(chunk_results[idx] if idx < len(chunk_results) else {})
+                errors.append(chunk_errors[idx] if idx < len(chunk_errors) else {"code": 0, "msg": "OK"})
+
+        return {
+            "retCode": 0,
+            "retMsg": "OK",
+            "result": {"list": results},
+            "retExtInfo": {"list": errors},
+            "time": last_time,
+        }
+
 
     def place_order(
         self,
@@ -46,7 +243,7 @@ class Trade_client:
         qty: str,
         price: str = None,
         time_in_force: str = None,
-        market_unit: str = "baseCoin",
+        market_unit: str = None,
         is_leverage: int = 0,
         trigger_price: str = None,
         trigger_by: str = None,
@@ -110,7 +307,8 @@ class Trade_client:
                 If None, defaults to "IOC" for Market and "GTC" for Limit orders.
             market_unit (str, optional): If placing a spot trade, 
                 "baseCoin" (quantity is in base asset units) or 
-                "quoteCoin" (quantity is in quote asset units). Defaults to "baseCoin".
+                "quoteCoin" (quantity is in quote asset units). Defaults to None, Bybit's
+                default: "quoteCoin" for spot Market Buy orders, "baseCoin" otherwise.
             is_leverage (int, optional): Leverage flag. 0 for off, 1 for on. Defaults to 0.
             trigger_price (str, optional): Price at which a conditional (stop) order should trigger.
             trigger_by (str, optional): Mechanism for triggering (e.g., "LastPrice", "MarkPrice").
@@ -176,6 +374,8 @@ class Trade_client:
         kwargs["tpslMode"] = tpsl_mode
         kwargs["reduceOnly"] = reduce_only
 
+        self._pre_trade_check(kwargs)
+
         # Send the request
         response = self._http_manager._submit_request(
             method="POST",
@@ -207,7 +407,7 @@ class Trade_client:
         price: str = None,
         category: str = "spot",
         time_in_force: str = None,
-        market_unit: str = "baseCoin",
+        market_unit: str = None,
         is_leverage: int = 0,
         order_link_id: str = None,
         take_profit: str = None,
@@ -236,7 +436,8 @@ class Trade_client:
                 - "IOC" if `order_type="Market"`
                 - "GTC" otherwise.
             market_unit (str, optional): If placing a spot trade, indicates the unit
-                of quantity ("baseCoin" or "quoteCoin"). Defaults to "baseCoin".
+                of quantity ("baseCoin" or "quoteCoin"). Defaults to None, Bybit's default:
+                "quoteCoin" for Market Buy orders, "baseCoin" otherwise.
             is_leverage (int, optional): Leverage flag (0 for off, 1 for on). Defaults to 0.
             order_link_id (str, optional): Custom client-defined order ID.
             take_profit (str, optional): If set, places a take profit (market or limit) order.
@@ -284,6 +485,8 @@ class Trade_client:
         kwargs["tpOrderType"] = tp_order_type
         kwargs["slOrderType"] = sl_order_type
 
+        self._pre_trade_check(kwargs)
+
         # Submit the order
         response = self._http_manager._submit_request(
             method="POST",
@@ -398,6 +601,8 @@ class Trade_client:
         kwargs["slOrderType"] = sl_order_type
         kwargs["tpslMode"] = tpsl_mode
 
+        self._pre_trade_check(kwargs)
+
         # Send the request
         response = self._http_manager._submit_request(
             method="POST",
@@ -523,6 +728,8 @@ class Trade_client:
         kwargs["slOrderType"] = sl_order_type
         kwargs["tpslMode"] = tpsl_mode
 
+        self._pre_trade_check(kwargs)
+
         # Send the request
         response = self._http_manager._submit_request(
             method="POST",
@@ -609,6 +816,8 @@ class Trade_client:
         kwargs["orderLinkId"] = order_link_id
         kwargs["reduceOnly"] = reduce_only
 
+        self._pre_trade_check(kwargs)
+
         response = self._http_manager._submit_request(
             method="POST",
             path=f"{self.endpoint}{Trade.PLACE_ORDER}",
@@ -702,6 +911,8 @@ class Trade_client:
         kwargs["slLimitPrice"] = sl_limit_price
         kwargs["tpslMode"] = tpsl_mode
 
+        self._pre_trade_check(kwargs)
+
         # Send the request
         response = self._http_manager._submit_request(
             method="POST",
@@ -1149,12 +1360,15 @@ class Trade_client:
         category: str,
         orders: list[dict],
         raw: bool = False,
+        max_workers: int = 5,
         **kwargs
     ) -> list | dict:
         """
-        Place multiple orders in a single request.
+        Place multiple orders in as few requests as possible.
 
         This endpoint supports creating several orders at once for a given product category.
+        Lists longer than Bybit's batch limit (see `BATCH_ORDER_LIMITS`) are split into
+        chunks that are sent concurrently; per-order results are merged back in input order.
 
         Args:
             category (str): Product type (e.g., "linear", "inverse", "spot", "option").
@@ -1170,28 +1384,40 @@ class Trade_client:
                   - reduceOnly (bool): Whether the order is reduce-only.
                   - closeOnTrigger (bool): Whether to close the position on trigger.
                   - orderLinkId (str): Custom client-defined order ID.
-            raw (bool, optional): If True, returns the raw Bybit API response (dict).
-                Otherwise, returns a list of order IDs or link IDs. Defaults to False.
+            raw (bool, optional): If True, returns the raw Bybit API response (dict), merged
+                across chunks. Otherwise, returns a list of order IDs or link IDs. Defaults to False.
+            max_workers (int, optional): Maximum number of chunks in flight at once. Defaults to 5.
             **kwargs: Additional parameters recognized by Bybit's API.
 
         Returns:
             list | dict:
-                - If `raw=True`, returns the raw API response (dict).
+                - If `raw=True`, returns the (merged) API response (dict); `retExtInfo.list`
+                  holds the per-order error code and message.
                 - Otherwise, returns a list of either `orderLinkId` or `orderId`
-                  for each successfully placed order.
+                  for each order, in input order ("" for orders that failed).
 
         Notes:
+            Chunks are paced at the client's `batch_order_rate` (10 orders/s by default,
+            Bybit's base per-UID limit), so large grids are slow: 500 orders take about
+            50 s. Set `batch_order_rate` to the account's actual limit to go faster.
             https://bybit-exchange.github.io/docs/v5/order/batch-place
         """
 
-        kwargs["category"] = category
-        kwargs["request"] = orders
-
-        response = self._http_manager._submit_request(
-            method="POST",
-            path=f"{self.endpoint}{Trade.BATCH_PLACE_ORDER}",
-            query=kwargs,
-            auth=True,
+        if self.validate_orders:
+            checked = []
+            for order in orders:
+                params = self._pre_trade_check({**order, "category": category})
+                if "category" not in order:
+                    params.pop("category")
+                checked.append(params)
+            orders = checked
+
+        response = self._submit_batch(
+            f"{self.endpoint}{Trade.BATCH_PLACE_ORDER}",
+            category,
+            orders,
+            max_workers,
+            **kwargs,
         )
 
         # Return raw response if requested
@@ -1214,10 +1440,13 @@ class Trade_client:
         category: str,
         orders: list[dict],
         raw: bool = False,
+        max_workers: int = 5,
         **kwargs
     ) -> list | dict:
         """
-        Batch amend (modify) multiple existing orders in a single request.
+        Batch amend (modify) multiple existing orders in as few requests as possible.
+        Lists longer than Bybit's batch limit are split into chunks that are sent
+        concurrently; per-order results are merged back in input order.
 
         This endpoint currently covers:
             - Options (Unified Accounts)
@@ -1232,28 +1461,27 @@ class Trade_client:
                     Either the system-generated orderId or the custom-defined orderLinkId. 
                     At least one is required to identify the order.
                 Optional fields can include other amendable parameters (e.g., "price", "qty", etc.).
-            raw (bool, optional): If True, returns the raw Bybit API response (dict). 
-                Otherwise, returns a list of IDs (either orderLinkId or orderId). Defaults to False.
+            raw (bool, optional): If True, returns the raw Bybit API response (dict), merged
+                across chunks. Otherwise, returns a list of IDs (either orderLinkId or orderId). Defaults to False.
+            max_workers (int, optional): Maximum number of chunks in flight at once. Defaults to 5.
             **kwargs: Additional parameters recognized by Bybit's API.
 
         Returns:
             list | dict:
-                - If `raw=True`, returns the raw API response (dict).
+                - If `raw=True`, returns the (merged) API response (dict).
                 - Otherwise, returns a list of identifiers (orderLinkId if present, 
-                  otherwise orderId) for each amended order.
+                  otherwise orderId) for each amended order, in input order.
 
         Nores:
             https://bybit-exchange.github.io/docs/v5/order/batch-amend
         """
 
-        kwargs["category"] = category
-        kwargs["request"] = orders
-
-        response = self._http_manager._submit_request(
-            method="POST",
-            path=f"{self.endpoint}{Trade.BATCH_AMEND_ORDER}",
-            query=kwargs,
-            auth=True,
+        response = self._submit_batch(
+            f"{self.endpoint}{Trade.BATCH_AMEND_ORDER}",
+            category,
+            orders,
+            max_workers,
+            **kwargs,
         )
 
         # Return raw response if requested
@@ -1276,10 +1504,13 @@ class Trade_client:
             category: str,
             orders: list[dict],
             raw: bool = False,
+            max_workers: int = 5,
             **kwargs
     ) -> list | dict:
 
         """This endpoint allows you to cancel more than one open order in a single request.
+        Lists longer than Bybit's batch limit are split into chunks that are sent
+        concurrently (at most `max_workers` at once) and merged back in input order.
 
         Required args:
             category (string): Product type. option
@@ -1289,14 +1520,12 @@ class Trade_client:
         https://bybit-exchange.github.io/docs/v5/order/batch-cancel
         """
 
-        kwargs["category"] = category
-        kwargs["request"] = orders
-
-        response = self._http_manager._submit_request(
-            method="POST",
-            path=f"{self.endpoint}{Trade.BATCH_AMEND_ORDER}",
-            query=kwargs,
-            auth=True,
+        response = self._submit_batch(
+            f"{self.endpoint}{Trade.BATCH_CANCEL_ORDER}",
+            category,
+            orders,
+            max_workers,
+            **kwargs,
         )
 
         # Return raw response if requested
@@ -1468,6 +1697,38 @@ class Trade_client:
         return None
 
 
+    def get_cached_positions(
+        self,
+        category: str,
+        symbol: str = None,
+        settle_coin: str = None,
+        max_age: float = 5.0,
+    ) -> list[dict]:
+        """
+        Return raw position records from the local cache, calling `get_positions`
+        only if the entry is missing, invalidated by one of our own order actions,
+        or older than `max_age` seconds.
+
+        Args:
+            category (str): Product type, e.g. "linear".
+            symbol (str, optional): Symbol name, e.g. "BTCUSDT".
+            settle_coin (str, optional): Settlement coin, e.g. "USDT" (needed for linear without symbol).
+            max_age (float, optional): Maximum accepted age in seconds. None accepts any age.
+
+        Returns:
+            list[dict]: Raw position records as returned by Bybit.
+        """
+        def load():
+            return self.get_positions(category, symbol=symbol, settle_coin=settle_coin, max_pages=20, raw=True)
+
+        return self.state_cache.get((POSITIONS, category, symbol, settle_coin), load, max_age)
+
+
+    def position_cache_age(self, category: str, symbol: str = None, settle_coin: str = None) -> float | None:
+        """Seconds since the cached positions for this scope were fetched (None if never)."""
+        return self.state_cache.age((POSITIONS, category, symbol, settle_coin))
+
+
     def set_leverage(self, category:str, symbol:str, buy_leverage:str, sell_leverage:str, **kwargs):
         """Set the leverage
 
@@ -1591,6 +1852,7 @@ class Trade_client:
         max_pages=None,
         raw=False,
         return_list=False,
+        frame=False,
         **kwargs
     ):
         """
@@ -1609,6 +1871,8 @@ class Trade_client:
             max_pages (int, optional): If provided, fetch multiple pages up to this limit.
             raw (bool, optional): If True, returns the raw JSON response (for either single or multiple pages).
             return_list (bool, optional): If True, returns a combined list of execution records.
+            frame (bool, optional): If True, returns a typed DataFrame of the raw records
+                (see `analytics.executions_frame`), for use with the analytics module.
             **kwargs: Additional query parameters (e.g., symbol, startTime, endTime, limit).
 
         Returns:
@@ -1618,6 +1882,7 @@ class Trade_client:
                 - If `max_pages=None` and `raw=False`, returns a dict if no records, or displays 
                   a styled HTML DataFrame of execution records.
                 - If `return_list=True` and there are multiple pages, returns a combined Python list.
+                - If `frame=True`, returns a typed DataFrame (possibly empty).
                 - Otherwise, displays the styled HTML DataFrame and returns None.
 
         Note:
@@ -1656,10 +1921,15 @@ class Trade_client:
                 return response
 
             data_list = response.get('result', {}).get('list', [])
+            if frame:
+                return executions_frame(data_list)
             if not data_list:
                 # If the list is empty, return an empty dictionary
                 return {}
 
+        if frame:
+            return executions_frame(data_list)
+
         # If raw is requested (and we had multiple pages), return the combined data_list
         if raw:
             return data_list
@@ -1706,6 +1976,7 @@ class Trade_client:
         max_pages: int = None,
         raw: bool = False,
         return_list: bool = False,
+        frame: bool = False,
         **kwargs
     ) -> dict | list | None:
         """
@@ -1729,6 +2000,8 @@ class Trade_client:
                 - If True, returns a processed list of PnL records (and does not display a styled DataFrame).
                 - If False, displays a styled DataFrame of the data in a Jupyter environment and returns None.
                 Defaults to False.
+            frame (bool, optional): If True, returns a typed DataFrame of the raw records
+                (see `analytics.closed_pnl_frame`), for use with the analytics module.
             **kwargs: Additional query parameters recognized by Bybit (e.g., limit).
 
         Returns:
@@ -1736,6 +2009,7 @@ class Trade_client:
                 - If `max_pages` is None and `raw=True`, returns a raw dict of the API response.
                 - If `max_pages` is set and `raw=True`, returns a combined list of raw records.
                 - If `return_list=True`, returns a processed list of dictionaries.
+                - If `frame=True`, returns a typed DataFrame (possibly empty).
                 - Otherwise, displays a styled HTML DataFrame of the results and returns None.
                 - Returns an empty dict if no data is found and neither `raw` nor `return_list` is requested.
 
@@ -1781,10 +2055,15 @@ class Trade_client:
                 return response
 
             data_list = response.get('result', {}).get('list', [])
+            if frame:
+                return closed_pnl_frame(data_list)
             if not data_list:
                 # Return an empty dict if no data
                 return {}
 
+        if frame:
+            return closed_pnl_frame(data_list)
+
         # If raw is requested (and multiple pages were fetched), return the raw combined data
         if raw:
             return data_list
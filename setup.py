@@ -23,5 +23,9 @@ setup(
         "pandas",
         "ipython",
     ],
+    extras_require={
+        "fast-json": ["orjson"],
+        "http2": ["httpx[http2]"],
+    },
     license="MIT", 
 )
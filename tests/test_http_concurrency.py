@@ -0,0 +1,106 @@
+"""
+Concurrency stress test for HTTPManager: many threads share one manager and send
+signed POSTs to a local stand-in for Bybit that verifies every signature and
+answers some first attempts with 10002 (recv_window), forcing retries.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pybit_ms._http_manager import HTTPManager
+
+
+API_KEY = "key"
+API_SECRET = "s3cret"
+RECV_WINDOW = 5000
+
+
+class _FakeBybit(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    calls = 0
+    bad_signatures = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        payload = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        ts, recv_window = self.headers["X-BAPI-TIMESTAMP"], self.headers["X-BAPI-RECV-WINDOW"]
+        expected = hmac.new(
+            API_SECRET.encode(), f"{ts}{API_KEY}{recv_window}{payload}".encode(), hashlib.sha256
+        ).hexdigest()
+        with self.lock:
+            type(self).calls += 1
+            inject = type(self).calls % 7 == 0
+        if expected != self.headers["X-BAPI-SIGN"]:
+            with self.lock:
+                type(self).bad_signatures += 1
+            return self._reply({"retCode": 10004, "retMsg": "error sign!"})
+        if inject and recv_window == str(RECV_WINDOW):
+            return self._reply({"retCode": 10002, "retMsg": "invalid request, please check your server timestamp or recv_window param"})
+        data = json.loads(payload)
+        self._reply({"retCode": 0, "retMsg": "OK", "result": {"orderLinkId": data["orderLinkId"], "recvWindow": recv_window}})
+
+
+class TestHTTPConcurrency(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        ThreadingHTTPServer.request_queue_size = 128
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeBybit)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/v5/order/create"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_signed_posts_from_many_threads(self):
+        manager = HTTPManager(
+            api_key=API_KEY,
+            api_secret=API_SECRET,
+            recv_window=RECV_WINDOW,
+            retry_delay=0,
+            pool_maxsize=32,
+            logging_level=logging.CRITICAL,
+        )
+        requests_sent = 2000
+
+        def work(i):
+            query = {"orderLinkId": f"id-{i}", "qty": 1.0, "price": 100}
+            before = dict(query)
+            response = manager._submit_request("POST", self.url, query=query, auth=True)
+            # The caller's dict is never mutated, and every reply matches its own request
+            self.assertEqual(query, before)
+            self.assertEqual(response["result"]["orderLinkId"], f"id-{i}")
+            return response["result"]["recvWindow"]
+
+        with ThreadPoolExecutor(32) as pool:
+            windows = list(pool.map(work, range(requests_sent)))
+
+        self.assertEqual(_FakeBybit.bad_signatures, 0)
+        # Some requests were retried with a widened window, only for that request
+        self.assertIn(str(RECV_WINDOW + 2500), windows)
+        self.assertEqual(manager.recv_window, RECV_WINDOW)
+        self.assertGreater(_FakeBybit.calls, requests_sent)
+
+
+if __name__ == "__main__":
+    unittest.main()